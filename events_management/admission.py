@@ -0,0 +1,147 @@
+"""
+Admission control for the registration and sales endpoints
+
+Every call passes through one Lua script on `frappe.cache()` that checks
+the sold-out flag of the event or ticket and takes a token from the
+caller's and the event's token buckets. Rejected calls never load a
+document or touch the database.
+"""
+
+import math
+
+import frappe
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+KEY_PREFIX = "event_management:admission"
+# scope -> (tokens added per second, bucket size)
+DEFAULT_RATE_LIMITS = {
+    "user": (2, 10),
+    "event": (200, 400),
+}
+# Sold-out flags expire on their own, so a flag set just before stock came
+# back is never trusted for long
+SOLD_OUT_TTL = 30
+
+ADMIT_SCRIPT = """
+redis.replicate_commands()
+local stats = KEYS[1]
+if KEYS[2] ~= "" and redis.call("EXISTS", KEYS[2]) == 1 then
+    redis.call("HINCRBY", stats, "sold_out", 1)
+    return {1, 0}
+end
+
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tokens = {}
+for i = 3, #KEYS do
+    local base = (i - 3) * 3
+    local rate, burst = tonumber(ARGV[base + 1]), tonumber(ARGV[base + 2])
+    local bucket = redis.call("HMGET", KEYS[i], "tokens", "at")
+    local available = tonumber(bucket[1]) or burst
+    local at = tonumber(bucket[2]) or now
+    available = math.min(burst, available + (now - at) * rate / 1000)
+    if available < 1 then
+        redis.call("HINCRBY", stats, ARGV[base + 3], 1)
+        return {2, math.ceil((1 - available) * 1000 / rate)}
+    end
+    tokens[i] = available
+end
+
+for i = 3, #KEYS do
+    local base = (i - 3) * 3
+    redis.call("HSET", KEYS[i], "tokens", tostring(tokens[i] - 1), "at", now)
+    redis.call("PEXPIRE", KEYS[i], math.ceil(tonumber(ARGV[base + 2]) * 1000 / tonumber(ARGV[base + 1])) + 1000)
+end
+redis.call("HINCRBY", stats, "admitted", 1)
+return {0, 0}
+"""
+
+ADMITTED, SOLD_OUT, RATE_LIMITED = 0, 1, 2
+
+
+def get_rate_limits():
+    limits = dict(DEFAULT_RATE_LIMITS)
+    limits.update(frappe.conf.get("event_management_rate_limits") or {})
+    return limits
+
+
+def _key(suffix):
+    return frappe.cache().make_key(f"{KEY_PREFIX}:{suffix}")
+
+
+def _sold_out_key(kind, name):
+    return _key(f"sold_out:{kind}:{name}")
+
+
+def _script():
+    script = getattr(frappe.local, "event_management_admit_script", None)
+    if script is None:
+        script = frappe.local.event_management_admit_script = frappe.cache().register_script(ADMIT_SCRIPT)
+    return script
+
+
+def admit(event_name, sold_out=None):
+    """Admit one call for an event, or raise TooManyRequestsError.
+
+    `sold_out` is a ("event" | "ticket", name) pair whose flag is checked
+    first; returns False without taking a token when it is set. When Redis
+    is unreachable every call is admitted.
+    """
+    limits = get_rate_limits()
+    buckets = [("user", frappe.session.user), ("event", event_name)]
+    keys = [_key("stats"), _sold_out_key(*sold_out) if sold_out else ""]
+    args = []
+    for scope, name in buckets:
+        rate, burst = limits[scope]
+        keys.append(_key(f"bucket:{scope}:{name}"))
+        args += [rate, burst, f"limited_{scope}"]
+
+    try:
+        status, retry_ms = _script()(keys=keys, args=args)
+    except RedisConnectionError:
+        return True
+
+    if status == SOLD_OUT:
+        return False
+    if status == RATE_LIMITED:
+        frappe.throw(
+            f"Too many requests, retry in {math.ceil(retry_ms / 1000)} seconds",
+            frappe.TooManyRequestsError
+        )
+    return True
+
+
+def mark_sold_out(kind, name):
+    """Flag an event or ticket as sold out; call only with committed stock figures"""
+    try:
+        frappe.cache().set(_sold_out_key(kind, name), 1, ex=SOLD_OUT_TTL)
+    except RedisConnectionError:
+        pass
+
+
+def clear_sold_out(kind, name):
+    """Drop a sold-out flag now and again after commit, once stock has come back"""
+    if not name:
+        return
+
+    def clear():
+        try:
+            frappe.cache().delete(_sold_out_key(kind, name))
+        except RedisConnectionError:
+            pass
+
+    clear()
+    frappe.db.after_commit.add(clear)
+
+
+def clear_for_doc(doc, method=None):
+    """doc_events handler: capacity or quantity edits may make stock available again"""
+    clear_sold_out(doc.doctype.lower(), doc.name)
+
+
+@frappe.whitelist()
+def get_admission_stats():
+    """Get counters of admitted, sold-out and rate limited calls"""
+    counters = ("admitted", "sold_out", "limited_user", "limited_event")
+    values = frappe.cache().hmget(_key("stats"), counters)
+    return {counter: int(value or 0) for counter, value in zip(counters, values)}
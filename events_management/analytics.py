@@ -0,0 +1,264 @@
+"""
+Columnar analytics exports for Event Management System
+
+Sales and attendance are written as Parquet or Arrow IPC files for BI
+tools, across all events at once. Rows are read in keyset batches ordered
+by `modified`, so an export can continue from the watermark returned by the
+previous one and only carries rows added or changed since. Files are
+partitioned by event month (`event_month=YYYY-MM`).
+
+pyarrow is optional; it is imported when an export runs.
+"""
+
+import os
+
+import frappe
+from frappe.utils import add_to_date, cint, get_datetime, now_datetime
+from event_management.event_management.archive import archive_table
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.jobs import enqueue_job
+from event_management.event_management.pagination import decode_cursor, encode_cursor
+from event_management.event_management.reports import SETTLE_SECONDS
+
+ANALYTICS_BATCH_SIZE = 10000
+ANALYTICS_FOLDER = "analytics"
+FILE_FORMATS = {"parquet": "parquet", "arrow": "arrow"}
+
+# dataset -> source doctype, extra joins and (column, SQL expression, arrow type)
+DATASETS = {
+    "sales": {
+        "doctype": "Ticket Sales",
+        "joins": "JOIN `tabTicket` t ON t.name = src.ticket",
+        "columns": [
+            ("sales_id", "src.name", "string"),
+            ("event", "src.event", "string"),
+            ("event_title", "e.event_title", "string"),
+            ("event_date", "e.event_date", "date"),
+            ("location", "e.location", "string"),
+            ("ticket", "src.ticket", "string"),
+            ("ticket_type", "t.ticket_type", "string"),
+            ("price", "t.price", "float"),
+            ("quantity", "src.quantity", "int"),
+            ("total_amount", "src.total_amount", "float"),
+            ("box_office", "src.box_office", "string"),
+            ("docstatus", "src.docstatus", "int"),
+            ("creation", "src.creation", "timestamp"),
+            ("modified", "src.modified", "timestamp"),
+        ],
+    },
+    "attendance": {
+        "doctype": "Attendee",
+        "joins": "",
+        "columns": [
+            ("attendee_id", "src.name", "string"),
+            ("event", "src.event", "string"),
+            ("event_title", "e.event_title", "string"),
+            ("event_date", "e.event_date", "date"),
+            ("location", "e.location", "string"),
+            ("checked_in", "src.checked_in", "int"),
+            ("checked_in_at", "src.checked_in_at", "timestamp"),
+            ("creation", "src.creation", "timestamp"),
+            ("modified", "src.modified", "timestamp"),
+        ],
+    },
+}
+
+
+@frappe.whitelist()
+@profiled()
+def export_analytics(dataset, file_format="parquet", from_date=None, to_date=None, since=None):
+    """Export sales or attendance of all events as columnar files in a background job
+
+    `from_date`/`to_date` filter on the event date. Pass the `watermark` of
+    the previous export as `since` to export only rows changed after it. The
+    job result, from `jobs.get_job_status`, lists the files written and the
+    next watermark.
+    """
+    frappe.only_for("System Manager")
+    validate_export(dataset, file_format)
+    return enqueue_job(
+        "analytics_export",
+        dataset=dataset,
+        file_format=file_format,
+        from_date=from_date,
+        to_date=to_date,
+        since=since
+    )
+
+
+def validate_export(dataset, file_format):
+    if dataset not in DATASETS:
+        frappe.throw(f"Dataset must be one of {', '.join(DATASETS)}")
+    if file_format not in FILE_FORMATS:
+        frappe.throw(f"Format must be one of {', '.join(FILE_FORMATS)}")
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        frappe.throw("Analytics exports need pyarrow; install it with `bench pip install pyarrow`")
+    return pyarrow
+
+
+def write_analytics_export(dataset, file_format="parquet", from_date=None, to_date=None,
+                           since=None, progress=None, batch_size=ANALYTICS_BATCH_SIZE):
+    """Stream a dataset into one file per event month and return the files and watermark"""
+    validate_export(dataset, file_format)
+    pa = import_pyarrow()
+    spec = DATASETS[dataset]
+    schema = pa.schema([(column, _arrow_type(pa, kind)) for column, _, kind in spec["columns"]])
+
+    stamp = f"{now_datetime():%Y%m%d%H%M%S}"
+    writers = {}
+    rows_written = 0
+    watermark = None
+    if since:
+        modified, name = decode_cursor(since)
+        watermark = (get_datetime(modified), name)
+    settled = add_to_date(now_datetime(), seconds=-SETTLE_SECONDS)
+    try:
+        for table in source_tables(spec["doctype"]):
+            for rows in iter_batches(spec, table, since, settled, from_date, to_date, batch_size):
+                for event_month, month_rows in group_by_month(rows).items():
+                    writer = writers.get(event_month)
+                    if not writer:
+                        writer = writers[event_month] = _open_writer(
+                            pa, file_format, schema, dataset, event_month, stamp
+                        )
+                    writer.write_table(pa.Table.from_arrays(
+                        [pa.array(values, type=field.type)
+                         for values, field in zip(zip(*month_rows), schema)],
+                        schema=schema
+                    ))
+                rows_written += len(rows)
+                # rows end with (modified, name, event_month)
+                last = (rows[-1][-3], rows[-1][-2])
+                if not watermark or last > watermark:
+                    watermark = last
+                if progress:
+                    progress(rows_written)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    files = [_save_file(writer.file_name) for writer in writers.values()]
+    return {
+        "dataset": dataset,
+        "format": file_format,
+        "rows": rows_written,
+        "files": files,
+        "watermark": encode_cursor(
+            {"modified": watermark[0], "name": watermark[1]}, "modified"
+        ) if watermark else None
+    }
+
+
+def source_tables(doctype):
+    """The hot table, preceded by its archive table once events have been archived"""
+    tables = [f"tab{doctype}"]
+    if frappe.db.table_exists(f"{doctype} Archive"):
+        tables.insert(0, archive_table(doctype))
+    return tables
+
+
+def iter_batches(spec, table, since, settled, from_date, to_date, batch_size):
+    """Yield rows of one source table in (modified, name) order, a batch at a time"""
+    conditions = ["src.modified <= %(settled)s"]
+    values = {"settled": settled, "month_format": "%Y-%m", "limit": cint(batch_size)}
+    if from_date:
+        conditions.append("e.event_date >= %(from_date)s")
+        values["from_date"] = from_date
+    if to_date:
+        conditions.append("e.event_date <= %(to_date)s")
+        values["to_date"] = to_date
+    if since:
+        values["after_modified"], values["after_name"] = decode_cursor(since)
+    keyset = (
+        "(src.modified > %(after_modified)s"
+        " OR (src.modified = %(after_modified)s AND src.name > %(after_name)s))"
+    )
+
+    select = ", ".join(f"{expression} as {column}" for column, expression, _ in spec["columns"])
+    while True:
+        where = conditions + ([keyset] if "after_modified" in values else [])
+        rows = frappe.db.sql(
+            f"""
+            SELECT {select}, src.modified, src.name, DATE_FORMAT(e.event_date, %(month_format)s)
+            FROM `{table}` src
+            JOIN `tabEvent` e ON e.name = src.event
+            {spec["joins"]}
+            WHERE {" AND ".join(where)}
+            ORDER BY src.modified ASC, src.name ASC
+            LIMIT %(limit)s
+            """,
+            values,
+            as_list=True
+        )
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        values["after_modified"], values["after_name"] = rows[-1][-3], rows[-1][-2]
+
+
+def group_by_month(rows):
+    """Split a batch by event month, dropping the keyset helper columns"""
+    months = {}
+    for row in rows:
+        months.setdefault(row[-1], []).append(row[:-3])
+    return months
+
+
+def _arrow_type(pa, kind):
+    return {
+        "string": pa.string(),
+        "date": pa.date32(),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "timestamp": pa.timestamp("us"),
+    }[kind]
+
+
+class _PartitionWriter:
+    """One open Parquet or Arrow IPC file for a dataset and event month"""
+
+    def __init__(self, pa, file_format, schema, path):
+        self.path = path
+        self.file_name = os.path.relpath(path, frappe.get_site_path("private", "files"))
+        if file_format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(path, schema, compression="zstd")
+        else:
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def write_table(self, table):
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+        if hasattr(self, "_sink"):
+            self._sink.close()
+
+
+def _open_writer(pa, file_format, schema, dataset, event_month, stamp):
+    folder = frappe.get_site_path(
+        "private", "files", ANALYTICS_FOLDER, dataset, f"event_month={event_month}"
+    )
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{dataset}-{stamp}.{FILE_FORMATS[file_format]}")
+    return _PartitionWriter(pa, file_format, schema, path)
+
+
+def _save_file(file_name):
+    file_doc = frappe.get_doc({
+        "doctype": "File",
+        "file_name": os.path.basename(file_name),
+        "file_url": f"/private/files/{file_name}",
+        "is_private": 1
+    })
+    file_doc.insert(ignore_permissions=True)
+    return file_doc.file_url
@@ -7,45 +7,88 @@ from frappe.utils import cint
 from event_management.event_management.utils import (
     get_event_summary,
     get_event_attendees,
-    export_attendees_csv,
-    get_ticket_sales_report,
     get_available_tickets,
-    get_event_revenue_by_ticket_type
+    get_event_revenue_by_ticket_type,
+    get_event_dashboard_data,
+    lazy_attribute
 )
+from event_management.event_management.admission import admit, mark_sold_out
+from event_management.event_management.checkout import checkout
+from event_management.event_management.doc_cache import get_request_value
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.doctype.attendee.attendee import EventSoldOutError
+from event_management.event_management.doctype.ticket_hold.ticket_hold import create_hold
+from event_management.event_management.doctype.waitlist_entry.waitlist_entry import join_waitlist
+from event_management.event_management.pagination import (
+    date_range_filters,
+    paginate,
+    select_fields
+)
+
+EVENT_LIST_FIELDS = (
+    "name", "event_title", "event_date", "location", "capacity", "tickets_available", "tickets_sold"
+)
+
+
+def __getattr__(name):
+    # export_attendees_csv, get_ticket_sales_report etc. load on first use
+    return lazy_attribute(__name__, name)
 
 
 @frappe.whitelist(allow_guest=False)
-def list_events():
-    """List all events with basic information"""
+@profiled()
+def list_events(page_length=None, cursor=None, fields=None, from_date=None, to_date=None, location=None):
+    """List all events with basic information
+
+    Pass `page_length` or `cursor` to get one page as
+    {"data": [...], "next_cursor": ...} instead of the full list.
+    """
+    fields = select_fields(fields, EVENT_LIST_FIELDS, default=EVENT_LIST_FIELDS[:6])
+    filters = date_range_filters("event_date", from_date, to_date)
+    if location:
+        filters.append(["location", "=", location])
+
+    if page_length or cursor:
+        return paginate(
+            "Event", filters, fields, "event_date",
+            page_length=page_length, cursor=cursor
+        )
+
     events = frappe.get_all(
         "Event",
-        fields=["name", "event_title", "event_date", "location", "capacity", "tickets_available"],
+        filters=filters,
+        fields=fields,
         order_by="event_date asc"
     )
     return events
 
 
 @frappe.whitelist(allow_guest=False)
+@profiled()
 def get_event(event_name):
     """Get detailed event information"""
-    try:
-        event = frappe.get_doc("Event", event_name)
-        return {
-            "name": event.name,
-            "event_title": event.event_title,
-            "description": event.description,
-            "event_date": event.event_date,
-            "location": event.location,
-            "capacity": event.capacity,
-            "tickets_sold": event.tickets_sold,
-            "tickets_available": event.tickets_available,
-            "summary": get_event_summary(event_name)
-        }
-    except frappe.DoesNotExistError:
+    dashboard = get_event_dashboard_data(event_name)
+    if not dashboard:
         frappe.throw(f"Event {event_name} does not exist")
 
+    dashboard.pop("revenue_breakdown")
+    return dashboard
+
 
 @frappe.whitelist(allow_guest=False)
+@profiled()
+def get_event_dashboard(event_name):
+    """Get event details, statistics and revenue breakdown with a single query"""
+    dashboard = get_event_dashboard_data(event_name)
+    if not dashboard:
+        frappe.throw(f"Event {event_name} does not exist")
+
+    dashboard["total_records"] = len(dashboard["revenue_breakdown"])
+    return dashboard
+
+
+@frappe.whitelist(allow_guest=False)
+@profiled()
 def create_event(event_title, description, event_date, location, capacity):
     """Create a new event"""
     try:
@@ -69,6 +112,7 @@ def create_event(event_title, description, event_date, location, capacity):
 
 
 @frappe.whitelist(allow_guest=False)
+@profiled()
 def update_event(event_name, **kwargs):
     """Update an existing event"""
     try:
@@ -87,6 +131,7 @@ def update_event(event_name, **kwargs):
 
 
 @frappe.whitelist(allow_guest=False)
+@profiled()
 def delete_event(event_name):
     """Delete an event"""
     try:
@@ -101,8 +146,16 @@ def delete_event(event_name):
 
 
 @frappe.whitelist(allow_guest=False)
+@profiled()
 def register_attendee(event_name, attendee_name, email, phone=None):
-    """Register an attendee for an event"""
+    """Register an attendee for an event
+
+    Registrations for a sold-out event join its waitlist instead of failing;
+    the waitlist entry runs the same email, duplicate and archive checks.
+    """
+    if not admit(event_name, sold_out=("event", event_name)) or is_sold_out(event_name):
+        return add_to_waitlist(event_name, attendee_name, email, phone)
+
     try:
         attendee = frappe.get_doc({
             "doctype": "Attendee",
@@ -118,19 +171,80 @@ def register_attendee(event_name, attendee_name, email, phone=None):
             "message": f"Attendee {attendee.name} registered successfully",
             "attendee_id": attendee.name
         }
+    except EventSoldOutError:
+        # the last tickets went while this registration was validated
+        frappe.db.rollback()
+        is_sold_out(event_name)
+        return add_to_waitlist(event_name, attendee_name, email, phone)
+    except frappe.ValidationError as e:
+        frappe.throw(f"Validation error: {str(e)}")
+
+
+def is_sold_out(event_name):
+    """Whether an event has no tickets left; also sets its sold-out flag.
+
+    Only called before this request writes anything or after a rollback, so
+    the figure read is a committed one.
+    """
+    event = get_request_value("Event", event_name, "tickets_available")
+    sold_out = bool(event) and cint(event.tickets_available) <= 0
+    if sold_out:
+        mark_sold_out("event", event_name)
+    return sold_out
+
+
+def is_ticket_sold_out(ticket_name):
+    """Ticket counterpart of `is_sold_out`"""
+    ticket = get_request_value("Ticket", ticket_name, "available_quantity")
+    sold_out = bool(ticket) and cint(ticket.available_quantity) <= 0
+    if sold_out:
+        mark_sold_out("ticket", ticket_name)
+    return sold_out
+
+
+def add_to_waitlist(event_name, attendee_name, email, phone=None):
+    entry = join_waitlist(event_name, attendee_name, email, phone)
+    frappe.db.commit()
+    return {
+        "status": "waitlisted",
+        "message": f"Event {event_name} is sold out; added to the waitlist at position {entry['position']}",
+        **entry
+    }
+
+
+@frappe.whitelist(allow_guest=False)
+@profiled()
+def reserve_tickets(ticket_name, quantity):
+    """Hold tickets for a few minutes while the buyer checks out"""
+    try:
+        hold = create_hold(ticket_name, cint(quantity))
+        frappe.db.commit()
+        return {
+            "status": "success",
+            "message": f"{hold.quantity} tickets held for {ticket_name}",
+            "hold_id": hold.name,
+            "expires_at": hold.expires_at
+        }
     except frappe.ValidationError as e:
         frappe.throw(f"Validation error: {str(e)}")
 
 
 @frappe.whitelist(allow_guest=False)
-def create_ticket_sale(ticket_name, event_name, quantity):
-    """Create a ticket sale"""
+@profiled()
+def create_ticket_sale(ticket_name, event_name, quantity, hold_id=None):
+    """Create a ticket sale, optionally completing a hold from reserve_tickets"""
+    # a hold already has its stock, so only sales without one can be turned
+    # away as sold out
+    if not admit(event_name, sold_out=None if hold_id else ("ticket", ticket_name)):
+        frappe.throw(f"Ticket {ticket_name} is sold out")
+
     try:
         sale = frappe.get_doc({
             "doctype": "Ticket Sales",
             "ticket": ticket_name,
             "event": event_name,
-            "quantity": cint(quantity)
+            "quantity": cint(quantity),
+            "ticket_hold": hold_id
         })
         sale.insert(ignore_permissions=True)
         frappe.db.commit()
@@ -141,17 +255,40 @@ def create_ticket_sale(ticket_name, event_name, quantity):
             "total_amount": sale.total_amount
         }
     except frappe.ValidationError as e:
+        if not hold_id:
+            frappe.db.rollback()
+            is_ticket_sold_out(ticket_name)
         frappe.throw(f"Validation error: {str(e)}")
 
 
 @frappe.whitelist(allow_guest=False)
+@profiled()
+def checkout_tickets(event_name, lines):
+    """Buy several ticket types in one call, e.g. lines=[{"ticket": ..., "quantity": 2}]"""
+    try:
+        order = checkout(event_name, lines)
+        frappe.db.commit()
+        return {
+            "status": "success",
+            "message": f"{len(order['sale_ids'])} ticket sales created successfully",
+            "sale_ids": order["sale_ids"],
+            "lines": order["lines"],
+            "total_amount": order["total_amount"]
+        }
+    except frappe.ValidationError as e:
+        frappe.throw(f"Validation error: {str(e)}")
+
+
+@frappe.whitelist(allow_guest=False)
+@profiled()
 def get_event_statistics(event_name):
     """Get comprehensive statistics for an event"""
-    summary = get_event_summary(event_name)
-    revenue_breakdown = get_event_revenue_by_ticket_type(event_name)
-    
+    dashboard = get_event_dashboard_data(event_name)
+    if not dashboard:
+        frappe.throw(f"Event {event_name} does not exist")
+
     return {
-        "summary": summary,
-        "revenue_breakdown": revenue_breakdown,
-        "total_records": len(revenue_breakdown)
+        "summary": dashboard["summary"],
+        "revenue_breakdown": dashboard["revenue_breakdown"],
+        "total_records": len(dashboard["revenue_breakdown"])
     }
@@ -0,0 +1,193 @@
+"""
+Archival of past events
+
+Attendees and sales of events that ended more than ARCHIVE_AFTER_DAYS ago
+are moved from the hot `tabAttendee` / `tabTicket Sales` tables into
+`tabAttendee Archive` / `tabTicket Sales Archive`, so the hot tables and
+their indexes only hold events that can still change. The event keeps its
+summary figures frozen on the Event row and reads for it are routed to the
+archive tables.
+"""
+
+import frappe
+from frappe.utils import add_days, cint, flt, getdate, now_datetime, today
+from event_management.event_management.cache import invalidate_event_cache
+from event_management.event_management.dedupe import EmailBloomFilter
+from event_management.event_management.doc_cache import get_request_value, invalidate_request_doc
+
+ARCHIVE_AFTER_DAYS = 30
+ARCHIVE_EVENTS_PER_RUN = 50
+ARCHIVED_DOCTYPES = ("Attendee", "Ticket Sales")
+
+
+def archive_table(doctype):
+    return f"tab{doctype} Archive"
+
+
+def is_archived(event_name):
+    """Whether an event's attendees and sales live in the archive tables"""
+    event = get_request_value("Event", event_name, "is_archived")
+    return bool(event and cint(event.is_archived))
+
+
+def table_for(doctype, event_name):
+    """Name of the table holding `doctype` rows of an event"""
+    return archive_table(doctype) if is_archived(event_name) else f"tab{doctype}"
+
+
+def ensure_archive_tables():
+    """Create the archive tables, and add columns the hot tables gained since"""
+    for doctype in ARCHIVED_DOCTYPES:
+        # LIKE copies the columns and indexes, including (event, creation)
+        frappe.db.sql_ddl(
+            f"CREATE TABLE IF NOT EXISTS `{archive_table(doctype)}` LIKE `tab{doctype}`"
+        )
+        archived = {column for column, _ in _get_columns(archive_table(doctype))}
+        for column, column_type in _get_columns(f"tab{doctype}"):
+            if column not in archived:
+                frappe.db.sql_ddl(
+                    f"ALTER TABLE `{archive_table(doctype)}` ADD COLUMN `{column}` {column_type} NULL"
+                )
+
+
+def _get_columns(table):
+    return frappe.db.sql(
+        """
+        SELECT column_name, column_type
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s
+        ORDER BY ordinal_position
+        """,
+        (table,)
+    )
+
+
+def archive_completed_events(days=ARCHIVE_AFTER_DAYS, limit=ARCHIVE_EVENTS_PER_RUN):
+    """Daily job: archive events that took place more than `days` days ago"""
+    events = frappe.get_all(
+        "Event",
+        filters=[["event_date", "<", add_days(today(), -cint(days))], ["is_archived", "=", 0]],
+        pluck="name",
+        order_by="event_date asc",
+        limit=limit
+    )
+    if not events:
+        return []
+
+    ensure_archive_tables()
+    archived = []
+    for event_name in events:
+        try:
+            archive_event(event_name)
+            frappe.db.commit()
+            archived.append(event_name)
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(title=f"Archiving event {event_name} failed")
+    return archived
+
+
+def archive_event(event_name):
+    """Freeze an event's figures and move its rows to the archive tables.
+
+    Runs inside the caller's transaction, so readers see the event either
+    fully hot or fully archived. The Event row is locked first so no
+    attendee or sale can be added while the rows are moved.
+    """
+    event = frappe.db.get_value("Event", event_name, ["name", "is_archived"], as_dict=True, for_update=True)
+    if not event or cint(event.is_archived):
+        return False
+
+    totals = frappe.db.sql(
+        """
+        SELECT IFNULL(SUM(quantity_sold), 0) as tickets_sold, IFNULL(SUM(revenue), 0) as revenue
+        FROM `tabTicket Sales Rollup`
+        WHERE event = %s
+        """,
+        (event_name,),
+        as_dict=True
+    )[0]
+    attendees = frappe.db.count("Attendee", filters={"event": event_name})
+
+    for doctype in ARCHIVED_DOCTYPES:
+        columns = ", ".join(f"`{column}`" for column, _ in _get_columns(f"tab{doctype}"))
+        frappe.db.sql(
+            f"""
+            INSERT INTO `{archive_table(doctype)}` ({columns})
+            SELECT {columns} FROM `tab{doctype}` WHERE event = %s
+            """,
+            (event_name,)
+        )
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE event = %s", (event_name,))
+
+    frappe.db.set_value(
+        "Event",
+        event_name,
+        {
+            "is_archived": 1,
+            "archived_on": now_datetime(),
+            "archived_attendees": attendees,
+            "archived_tickets_sold": cint(totals.tickets_sold),
+            "archived_revenue": flt(totals.revenue)
+        },
+        update_modified=False
+    )
+    invalidate_request_doc("Event", event_name, ["is_archived"])
+    invalidate_event_cache(event_name)
+    # registrations are closed, so the duplicate-email filter is no longer needed
+    email_filter = EmailBloomFilter(event_name)
+    frappe.db.after_commit.add(lambda: email_filter.backend.delete(email_filter.key))
+    return True
+
+
+def get_archived_rows(doctype, event_name, fields, after=None, limit=None, from_date=None, to_date=None):
+    """Archived rows of an event, newest first.
+
+    `after` is a (creation, name) pair to continue strictly after; `fields`
+    must already be validated by the caller.
+    """
+    conditions = ["event = %(event)s"]
+    values = {"event": event_name}
+    if from_date:
+        conditions.append("creation >= %(from_date)s")
+        values["from_date"] = from_date
+    if to_date:
+        conditions.append("creation < %(to_date)s")
+        values["to_date"] = add_days(getdate(to_date), 1)
+    if after:
+        values["after_creation"], values["after_name"] = after
+        conditions.append(
+            "(creation < %(after_creation)s"
+            " OR (creation = %(after_creation)s AND name < %(after_name)s))"
+        )
+
+    limit_clause = ""
+    if limit:
+        limit_clause = "LIMIT %(limit)s"
+        values["limit"] = cint(limit)
+
+    return frappe.db.sql(
+        f"""
+        SELECT {", ".join(f"`{field}`" for field in fields)}
+        FROM `{archive_table(doctype)}`
+        WHERE {" AND ".join(conditions)}
+        ORDER BY creation DESC, name DESC
+        {limit_clause}
+        """,
+        values,
+        as_dict=True
+    )
+
+
+def iter_archived_pages(doctype, event_name, fields, page_size):
+    """Archive counterpart of `pagination.iter_keyset_pages`, newest first"""
+    query_fields = list(dict.fromkeys(list(fields) + ["creation", "name"]))
+    after = None
+    while True:
+        rows = get_archived_rows(doctype, event_name, query_fields, after=after, limit=page_size)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        after = (rows[-1].creation, rows[-1].name)
@@ -0,0 +1,3 @@
+# Benchmarks for the Event Management app
+# Run against a test site, e.g.
+#   bench --site test_site execute event_management.event_management.benchmarks.<module>.run
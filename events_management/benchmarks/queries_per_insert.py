@@ -0,0 +1,81 @@
+"""
+Queries per Attendee and Ticket Sales insert, with and without the request document cache
+
+    bench --site test_site execute \
+        event_management.event_management.benchmarks.queries_per_insert.run \
+        --kwargs "{'inserts': 50}"
+
+Everything runs in one transaction that is rolled back at the end.
+"""
+
+from datetime import datetime, timedelta
+
+import frappe
+from event_management.event_management.doc_cache import request_doc_cache_disabled
+from event_management.event_management.instrumentation import count_queries
+
+
+def run(inserts=50):
+    """Report the average number of queries per insert for each mode"""
+    inserts = int(inserts)
+    report = {}
+    try:
+        event, ticket = _create_fixtures(inserts)
+        for mode in ("without_cache", "with_cache"):
+            if mode == "without_cache":
+                with request_doc_cache_disabled():
+                    report[mode] = _measure(event, ticket, inserts, mode)
+            else:
+                report[mode] = _measure(event, ticket, inserts, mode)
+    finally:
+        frappe.db.rollback()
+
+    return report
+
+
+def _measure(event, ticket, inserts, prefix):
+    """Insert attendees and sales one by one, counting the queries of each"""
+    attendee_queries = sales_queries = 0
+    for i in range(inserts):
+        with count_queries() as counter:
+            frappe.get_doc({
+                "doctype": "Attendee",
+                "attendee_name": f"Benchmark {i}",
+                "email": f"{prefix}-{i}@example.com",
+                "event": event
+            }).insert(ignore_permissions=True)
+        attendee_queries += counter.count
+
+        with count_queries() as counter:
+            frappe.get_doc({
+                "doctype": "Ticket Sales",
+                "ticket": ticket,
+                "event": event,
+                "quantity": 1
+            }).insert(ignore_permissions=True)
+        sales_queries += counter.count
+
+    return {
+        "attendee_queries_per_insert": round(attendee_queries / inserts, 2),
+        "ticket_sales_queries_per_insert": round(sales_queries / inserts, 2)
+    }
+
+
+def _create_fixtures(inserts):
+    """Create an event and ticket large enough for both modes"""
+    event = frappe.get_doc({
+        "doctype": "Event",
+        "event_title": f"Query Benchmark {frappe.generate_hash(length=8)}",
+        "description": "Queries per insert benchmark",
+        "event_date": (datetime.now() + timedelta(days=30)).date(),
+        "location": "Benchmark",
+        "capacity": inserts * 2
+    }).insert(ignore_permissions=True)
+    ticket = frappe.get_doc({
+        "doctype": "Ticket",
+        "event": event.name,
+        "ticket_type": "General",
+        "price": 10,
+        "quantity": inserts * 2
+    }).insert(ignore_permissions=True)
+    return event.name, ticket.name
@@ -0,0 +1,129 @@
+"""
+Multi-process oversell stress test for Ticket Sales
+
+Several worker processes race to buy the same ticket type through the normal
+Ticket Sales insert path. The run fails if more tickets are sold than the
+ticket's quantity or if available_quantity disagrees with the sales rows.
+
+    bench --site test_site execute \
+        event_management.event_management.benchmarks.reservation_stress.run \
+        --kwargs "{'processes': 8, 'stock': 1000, 'attempts': 500}"
+"""
+
+import multiprocessing
+import time
+from datetime import datetime, timedelta
+
+import frappe
+
+
+def run(processes=8, stock=1000, attempts=500, quantity=1):
+    """Run the stress test and return its report"""
+    processes, stock, attempts, quantity = int(processes), int(stock), int(attempts), int(quantity)
+    event, ticket = _create_fixtures(stock)
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    start = context.Event()
+    workers = [
+        context.Process(
+            target=_worker,
+            args=(frappe.local.site, frappe.local.sites_path, event, ticket, attempts, quantity, start, results)
+        )
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    started = time.perf_counter()
+    start.set()
+    totals = {"sold": 0, "rejected": 0, "errors": 0}
+    for _ in workers:
+        for key, value in results.get().items():
+            totals[key] += value
+    elapsed = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    sold_quantity = frappe.db.sum("Ticket Sales", "quantity", {"ticket": ticket}) or 0
+    available_quantity = frappe.db.get_value("Ticket", ticket, "available_quantity")
+    report = {
+        "processes": processes,
+        "stock": stock,
+        "attempts": processes * attempts,
+        "sold": totals["sold"],
+        "rejected": totals["rejected"],
+        "errors": totals["errors"],
+        "sold_quantity": sold_quantity,
+        "available_quantity": available_quantity,
+        "oversold": max(sold_quantity - stock, 0),
+        "seconds": round(elapsed, 3),
+        "sales_per_second": round(totals["sold"] / elapsed, 1) if elapsed else 0
+    }
+
+    _delete_fixtures(event)
+
+    if report["oversold"] or sold_quantity + available_quantity != stock:
+        frappe.throw(f"Ticket stock is inconsistent after stress run: {report}")
+
+    return report
+
+
+def _worker(site, sites_path, event, ticket, attempts, quantity, start, results):
+    """Buy tickets in a loop from a separate process and connection"""
+    frappe.init(site=site, sites_path=sites_path)
+    frappe.connect()
+    frappe.set_user("Administrator")
+
+    totals = {"sold": 0, "rejected": 0, "errors": 0}
+    start.wait()
+    try:
+        for _ in range(attempts):
+            try:
+                frappe.get_doc({
+                    "doctype": "Ticket Sales",
+                    "ticket": ticket,
+                    "event": event,
+                    "quantity": quantity
+                }).insert(ignore_permissions=True)
+                frappe.db.commit()
+                totals["sold"] += 1
+            except frappe.ValidationError:
+                frappe.db.rollback()
+                totals["rejected"] += 1
+            except Exception:
+                frappe.db.rollback()
+                totals["errors"] += 1
+    finally:
+        results.put(totals)
+        frappe.destroy()
+
+
+def _create_fixtures(stock):
+    """Create a throwaway event and ticket with the given stock"""
+    event = frappe.get_doc({
+        "doctype": "Event",
+        "event_title": f"Reservation Stress {frappe.generate_hash(length=8)}",
+        "description": "Reservation stress benchmark",
+        "event_date": (datetime.now() + timedelta(days=30)).date(),
+        "location": "Benchmark",
+        "capacity": stock
+    }).insert(ignore_permissions=True)
+    ticket = frappe.get_doc({
+        "doctype": "Ticket",
+        "event": event.name,
+        "ticket_type": "General",
+        "price": 10,
+        "quantity": stock
+    }).insert(ignore_permissions=True)
+    frappe.db.commit()
+    return event.name, ticket.name
+
+
+def _delete_fixtures(event):
+    """Remove everything created for a stress run"""
+    frappe.db.delete("Ticket Sales", filters={"event": event})
+    frappe.db.delete("Ticket Hold", filters={"event": event})
+    frappe.db.delete("Ticket", filters={"event": event})
+    frappe.db.delete("Event", filters={"name": event})
+    frappe.db.commit()
@@ -0,0 +1,265 @@
+"""
+Load and benchmark suite for registration, sales and reporting paths
+
+Generates a synthetic event, drives the public endpoints against it and
+reports ops/s, p50/p95/p99 latency and queries per operation. Results can be
+saved as a baseline and later runs compared against it.
+
+    bench --site test_site execute \
+        event_management.event_management.benchmarks.suite.run \
+        --kwargs "{'size': '10k', 'save_baseline': 'baseline.json'}"
+
+    bench --site test_site execute \
+        event_management.event_management.benchmarks.suite.run \
+        --kwargs "{'size': '10k', 'compare_to': 'baseline.json'}"
+
+Only runs on sites with `allow_tests` enabled, since it writes and commits data.
+"""
+
+import json
+import math
+import os
+import time
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import flt, now
+from event_management.event_management import api, bulk, exports
+from event_management.event_management.checkout import reserve_lines
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import (
+    apply_sales
+)
+from event_management.event_management.instrumentation import count_queries
+from event_management.event_management.utils import get_default_naming_series, reserve_names
+
+DATASET_SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+TICKET_TYPES = (("VIP", 250), ("General", 50), ("Student", 20))
+REGRESSION_TOLERANCE = 0.2
+# attendees registered by each create_bulk_attendees operation
+BULK_SIZE = 1000
+# One user drives every operation, far above any real per-user rate; the
+# suite measures the endpoints rather than the rate limiter
+UNLIMITED_RATES = {"user": (10 ** 6, 10 ** 6), "event": (10 ** 6, 10 ** 6)}
+
+
+def run(size="1k", operations=200, save_baseline=None, compare_to=None, keep_data=False,
+        sales_per_attendee=1):
+    """Generate a dataset, run every scenario and return the report"""
+    if not frappe.conf.get("allow_tests"):
+        frappe.throw("The benchmark suite only runs on sites with allow_tests enabled")
+
+    rows = DATASET_SIZES.get(size) or int(size)
+    operations = int(operations)
+    event, tickets = generate_dataset(rows, operations, flt(sales_per_attendee))
+    rate_limits = frappe.conf.get("event_management_rate_limits")
+    frappe.conf.event_management_rate_limits = UNLIMITED_RATES
+    try:
+        report = {
+            "size": rows,
+            "operations": operations,
+            "scenarios": {
+                name: measure(scenario, operations)
+                for name, scenario in scenarios(event, tickets, operations).items()
+            }
+        }
+    finally:
+        frappe.conf.event_management_rate_limits = rate_limits
+        if not keep_data:
+            delete_dataset(event)
+
+    if save_baseline:
+        with open(_resolve_path(save_baseline), "w") as baseline:
+            json.dump(report, baseline, indent=1)
+    if compare_to:
+        report["regressions"] = compare(report, _resolve_path(compare_to))
+
+    return report
+
+
+def generate_dataset(attendees, operations, sales_per_attendee=1):
+    """Create one event with `attendees` attendees and `sales_per_attendee` sales for each"""
+    sales = int(attendees * sales_per_attendee)
+    event = frappe.get_doc({
+        "doctype": "Event",
+        "event_title": f"Benchmark {attendees} {frappe.generate_hash(length=8)}",
+        "description": "Synthetic benchmark event",
+        "event_date": (datetime.now() + timedelta(days=30)).date(),
+        "location": "Benchmark Hall",
+        # leave room for one registration and one bulk import per operation
+        "capacity": attendees + operations * (BULK_SIZE + 1)
+    }).insert(ignore_permissions=True)
+
+    tickets = []
+    for ticket_type, price in TICKET_TYPES:
+        tickets.append(frappe.get_doc({
+            "doctype": "Ticket",
+            "event": event.name,
+            "ticket_type": ticket_type,
+            "price": price,
+            "quantity": sales + operations * 10
+        }).insert(ignore_permissions=True).name)
+    frappe.db.commit()
+
+    batch = 5000
+    for start in range(0, attendees, batch):
+        bulk.bulk_import_attendees(
+            event.name,
+            [
+                {"name": f"Guest {i}", "email": f"guest{i}@benchmark.example.com"}
+                for i in range(start, min(start + batch, attendees))
+            ],
+            chunk_size=1000
+        )
+        frappe.db.commit()
+
+    for start in range(0, sales, batch):
+        generate_sales(event.name, tickets, start, min(start + batch, sales))
+        frappe.db.commit()
+
+    return event.name, tickets
+
+
+def generate_sales(event, tickets, start, end):
+    """Insert single-ticket sales `start` to `end`, spread over the tickets in turn"""
+    prices = dict(frappe.get_all(
+        "Ticket", filters={"name": ("in", tickets)}, fields=["name", "price"], as_list=True
+    ))
+    lines = [tickets[i % len(tickets)] for i in range(start, end)]
+    quantities = {ticket: lines.count(ticket) for ticket in tickets if ticket in lines}
+    if not reserve_lines(quantities):
+        frappe.throw("Benchmark tickets ran out of stock while generating sales")
+
+    naming_series = get_default_naming_series("Ticket Sales")
+    timestamp = now()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "Ticket Sales",
+        [
+            "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+            "naming_series", "ticket", "event", "quantity", "total_amount"
+        ],
+        [
+            (name, timestamp, timestamp, user, user, 0, 0,
+             naming_series, ticket, event, 1, flt(prices[ticket]))
+            for name, ticket in zip(reserve_names(naming_series, len(lines)), lines)
+        ],
+        chunk_size=1000
+    )
+    apply_sales([
+        (ticket, event, quantity, flt(prices[ticket]) * quantity)
+        for ticket, quantity in quantities.items()
+    ])
+
+
+def scenarios(event, tickets, operations):
+    """Callables keyed by scenario name; each call is one operation"""
+    sequence = iter(range(10 ** 9))
+
+    def register():
+        i = next(sequence)
+        result = api.register_attendee(event, f"Registrant {i}", f"registrant{i}@benchmark.example.com")
+        if result["status"] != "success":
+            frappe.throw(f"Registration {i} was {result['status']} instead of registered")
+
+    def sell():
+        api.create_ticket_sale(tickets[next(sequence) % len(tickets)], event, 1)
+
+    def bulk_import():
+        i = next(sequence)
+        result = bulk.create_bulk_attendees(
+            event,
+            [
+                {"name": f"Bulk {i}-{j}", "email": f"bulk{i}-{j}@benchmark.example.com"}
+                for j in range(BULK_SIZE)
+            ],
+            bulk_mode=1
+        )
+        # a short import would time rejected rows instead of inserts
+        if result["total"] != BULK_SIZE:
+            frappe.throw(f"Bulk import created {result['total']} of {BULK_SIZE} attendees: {result['errors'][:3]}")
+        frappe.db.commit()
+
+    def statistics():
+        api.get_event_statistics(event)
+
+    def export():
+        exports.export_attendees_csv(event)
+
+    return {
+        "register_attendee": register,
+        "create_ticket_sale": sell,
+        "create_bulk_attendees": bulk_import,
+        "get_event_statistics": statistics,
+        "export_attendees_csv": export,
+    }
+
+
+def measure(operation, count):
+    """Run an operation `count` times and summarise latency and query counts"""
+    latencies = []
+    queries = 0
+    started = time.perf_counter()
+    for _ in range(count):
+        with count_queries() as counter:
+            op_started = time.perf_counter()
+            operation()
+            latencies.append(time.perf_counter() - op_started)
+        queries += counter.count
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops_per_second": round(count / elapsed, 2) if elapsed else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "queries_per_op": round(queries / count, 2)
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def compare(report, baseline_path, tolerance=REGRESSION_TOLERANCE):
+    """List scenarios whose p95 latency or queries per op regressed against a baseline"""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressions = []
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append({
+                "scenario": name, "metric": "p95_ms",
+                "baseline": previous["p95_ms"], "current": current["p95_ms"]
+            })
+        if current["queries_per_op"] > previous["queries_per_op"]:
+            regressions.append({
+                "scenario": name, "metric": "queries_per_op",
+                "baseline": previous["queries_per_op"], "current": current["queries_per_op"]
+            })
+    return regressions
+
+
+def delete_dataset(event):
+    """Remove everything created for a benchmark run"""
+    for doctype in ("Attendee", "Ticket Sales", "Ticket Sales Rollup", "Ticket Hold", "Ticket"):
+        frappe.db.delete(doctype, filters={"event": event})
+    frappe.db.delete("Event", filters={"name": event})
+    frappe.db.commit()
+
+
+def _resolve_path(path):
+    """Relative paths are kept under the site's benchmarks folder"""
+    if os.path.isabs(path):
+        return path
+    folder = frappe.get_site_path("benchmarks")
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, path)
@@ -0,0 +1,264 @@
+"""
+Import of ticket sales reported by external box offices
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import time
+
+import frappe
+from frappe.utils import cint, flt, now
+from event_management.event_management.archive import is_archived
+from event_management.event_management.cache import INVALIDATES, invalidate_event_cache
+from event_management.event_management.checkout import reserve_lines, throw_unavailable
+from event_management.event_management.doctype.seat_map_section.seat_map_section import seated_tickets
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import (
+    apply_sales
+)
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.jobs import enqueue_job
+from event_management.event_management.bulk import BULK_INSERT_CHUNK_SIZE
+from event_management.event_management.utils import get_default_naming_series, reserve_names, stamp_rows
+
+READ_SIZE = 64 * 1024
+JSON_SEPARATORS = re.compile(r"[\s,\[\]]*")
+SALES_FIELDS = [
+    "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+    "naming_series", "ticket", "event", "quantity", "total_amount",
+    "box_office", "external_reference"
+]
+
+
+@frappe.whitelist()
+@profiled()
+def import_box_office_sales(file_url, box_office, chunk_size=None, as_job=False):
+    """Import the sales listed in an uploaded box-office CSV or JSON file
+
+    Pass `as_job=1` to run the import in a background job; the response is
+    then {"job_id": ...} for `jobs.get_job_status`.
+    """
+    frappe.has_permission("Ticket Sales", "create", throw=True)
+    if cint(as_job):
+        return enqueue_job(
+            "box_office_import", file_url=file_url, box_office=box_office, chunk_size=chunk_size
+        )
+    return import_sales_file(file_url, box_office, chunk_size=chunk_size)
+
+
+def import_sales_file(file_url, box_office, chunk_size=None, progress=None):
+    """Stream a box-office file into Ticket Sales.
+
+    Records need `reference`, `ticket` and `quantity`; `price` (the unit
+    price) and `event` are checked against the ticket when present. Tickets
+    are loaded once, rows are validated in memory and written in multi-row
+    INSERTs, and every ticket's stock is taken with one UPDATE at the end.
+    Rejected records are listed with their line number and reason.
+    """
+    file_doc = frappe.get_doc("File", {"file_url": file_url})
+    path = file_doc.get_full_path()
+    with open(path, "rb") as raw:
+        return import_sales(
+            iter_sales_records(raw, os.path.splitext(path)[1].lower()),
+            box_office,
+            chunk_size=cint(chunk_size) or BULK_INSERT_CHUNK_SIZE,
+            progress=progress
+        )
+
+
+def iter_sales_records(raw, extension):
+    """Yield (line, record) pairs from a CSV, JSON array or JSON Lines file"""
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    if extension == ".csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        yield from enumerate(iter_json_values(text), 1)
+
+
+def iter_json_values(text):
+    """Yield the values of a JSON array or of whitespace separated JSON values
+    without reading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    while True:
+        position = JSON_SEPARATORS.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                return
+            buffer, position = text.read(READ_SIZE), 0
+            eof = not buffer
+            continue
+        try:
+            value, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = "" if eof else text.read(READ_SIZE)
+            if not chunk:
+                frappe.throw("The sales file is not valid JSON")
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield value
+
+
+def import_sales(records, box_office, chunk_size=BULK_INSERT_CHUNK_SIZE, progress=None):
+    """Validate and insert (line, record) pairs, see `import_sales_file`"""
+    tickets = {}
+    consumed = {}
+    totals = {}
+    seen = set()
+    rejects = []
+    chunks = []
+    imported = []
+    processed = 0
+
+    frappe.db.savepoint("event_management_box_office")
+    naming_series = get_default_naming_series("Ticket Sales")
+
+    for batch in _batches(records, chunk_size):
+        chunk_started = time.perf_counter()
+        processed += len(batch)
+        for line, record in batch:
+            if not isinstance(record, dict):
+                rejects.append({"line": line, "reason": "Record is not an object"})
+        batch = [(line, record) for line, record in batch if isinstance(record, dict)]
+
+        references = {str(record.get("reference") or "").strip() for _, record in batch}
+        already_imported = set(frappe.get_all(
+            "Ticket Sales",
+            filters={"box_office": box_office, "external_reference": ("in", list(references))},
+            pluck="external_reference"
+        ))
+        _load_tickets(tickets, {record.get("ticket") for _, record in batch})
+
+        accepted = []
+        for line, record in batch:
+            reason = _validate_record(record, tickets, consumed, seen, already_imported)
+            if reason:
+                rejects.append({
+                    "line": line,
+                    "reference": record.get("reference"),
+                    "ticket": record.get("ticket"),
+                    "reason": reason
+                })
+                continue
+            accepted.append(record)
+
+        if accepted:
+            imported += _insert_sales(accepted, tickets, box_office, naming_series, totals)
+        chunks.append({
+            "chunk": len(chunks) + 1,
+            "rows": len(accepted),
+            "seconds": round(time.perf_counter() - chunk_started, 6)
+        })
+        if progress:
+            progress(processed)
+
+    if consumed:
+        # One conditional UPDATE for every ticket; if online sales took the
+        # stock meanwhile nothing from this file is kept
+        if not reserve_lines(consumed):
+            frappe.db.rollback(save_point="event_management_box_office")
+            throw_unavailable(consumed)
+        apply_sales([
+            (ticket_name, tickets[ticket_name].event, total.quantity, total.amount)
+            for ticket_name, total in totals.items()
+        ])
+        for event_name in {tickets[ticket_name].event for ticket_name in consumed}:
+            invalidate_event_cache(event_name, INVALIDATES["Ticket Sales"])
+        stamp_rows("Ticket Sales", imported, chunk_size)
+
+    return {
+        "imported": len(imported),
+        "rejected": len(rejects),
+        "rejects": rejects,
+        "totals": totals,
+        "chunks": chunks
+    }
+
+
+def _batches(records, size):
+    batch = []
+    for item in records:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _load_tickets(tickets, names):
+    missing = [name for name in names if name and name not in tickets]
+    if not missing:
+        return
+    seated = seated_tickets(missing)
+    for ticket in frappe.get_all(
+        "Ticket",
+        filters={"name": ("in", missing)},
+        fields=["name", "event", "price", "available_quantity"]
+    ):
+        ticket.seated = ticket.name in seated
+        tickets[ticket.name] = ticket
+
+
+def _validate_record(record, tickets, consumed, seen, already_imported):
+    """Return why a record is rejected, or None; accepted records are counted
+    against the ticket's stock and the seen references"""
+    reference = str(record.get("reference") or "").strip()
+    ticket = tickets.get(record.get("ticket"))
+    try:
+        quantity = int(record.get("quantity") or 0)
+    except (TypeError, ValueError):
+        quantity = 0
+
+    if not reference:
+        return "Reference is required"
+    if reference in seen:
+        return "Duplicate reference in file"
+    if reference in already_imported:
+        return "Already imported"
+    if not ticket:
+        return f"Ticket {record.get('ticket')} does not exist"
+    if record.get("event") and record.get("event") != ticket.event:
+        return f"Ticket {ticket.name} does not belong to event {record.get('event')}"
+    if is_archived(ticket.event):
+        return f"Event {ticket.event} is archived"
+    if ticket.seated:
+        return f"Ticket {ticket.name} is sold by seat"
+    if quantity <= 0:
+        return "Ticket quantity must be greater than 0"
+    if record.get("price") not in (None, "") and abs(flt(record.get("price")) - flt(ticket.price)) > 0.005:
+        return f"Price {record.get('price')} does not match ticket price {ticket.price}"
+
+    remaining = cint(ticket.available_quantity) - consumed.get(ticket.name, 0)
+    if quantity > remaining:
+        return f"Only {remaining} tickets available for {ticket.name}"
+
+    seen.add(reference)
+    consumed[ticket.name] = consumed.get(ticket.name, 0) + quantity
+    record["reference"] = reference
+    record["quantity"] = quantity
+    return None
+
+
+def _insert_sales(records, tickets, box_office, naming_series, totals):
+    names = reserve_names(naming_series, len(records))
+    timestamp = now()
+    user = frappe.session.user
+    rows = []
+    for name, record in zip(names, records):
+        ticket = tickets[record["ticket"]]
+        amount = flt(ticket.price) * record["quantity"]
+        total = totals.setdefault(ticket.name, frappe._dict(quantity=0, amount=0))
+        total.quantity += record["quantity"]
+        total.amount += amount
+        rows.append((
+            name, timestamp, timestamp, user, user, 0, 0,
+            naming_series, ticket.name, ticket.event, record["quantity"], amount,
+            box_office, record["reference"]
+        ))
+    frappe.db.bulk_insert("Ticket Sales", SALES_FIELDS, rows)
+    return names
@@ -0,0 +1,189 @@
+"""
+Bulk attendee registration for Event Management System
+"""
+
+import time
+
+import frappe
+from frappe.utils import cint, now, validate_email_address
+from event_management.event_management.cache import INVALIDATES, invalidate_event_cache
+from event_management.event_management.checkin import add_to_index, generate_checkin_token
+from event_management.event_management.dedupe import (
+    add_to_filter,
+    find_registered_emails,
+    normalize_email
+)
+from event_management.event_management.doc_cache import clear_request_doc_cache
+from event_management.event_management.doctype.event.event import adjust_ticket_counters
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.jobs import enqueue_job
+from event_management.event_management.utils import get_default_naming_series, reserve_names, stamp_rows
+
+BULK_INSERT_CHUNK_SIZE = 500
+
+
+@frappe.whitelist()
+@profiled()
+def create_bulk_attendees(event_name, attendees_list, bulk_mode=False, chunk_size=None, as_job=False):
+    """Create multiple attendees at once
+
+    Pass `as_job=1` to run the import in a background job; the response is
+    then {"job_id": ...} for `jobs.get_job_status`.
+    """
+    if isinstance(attendees_list, str):
+        attendees_list = frappe.parse_json(attendees_list)
+
+    if cint(as_job):
+        return enqueue_job(
+            "create_bulk_attendees",
+            event_name=event_name,
+            attendees_list=attendees_list,
+            bulk_mode=bulk_mode,
+            chunk_size=chunk_size
+        )
+    return import_attendees(event_name, attendees_list, bulk_mode=bulk_mode, chunk_size=chunk_size)
+
+
+def import_attendees(event_name, attendees_list, bulk_mode=False, chunk_size=None, progress=None):
+    """Run a bulk registration; also the background job behind `create_bulk_attendees`"""
+    if cint(bulk_mode):
+        return bulk_import_attendees(
+            event_name,
+            attendees_list,
+            chunk_size=cint(chunk_size) or BULK_INSERT_CHUNK_SIZE,
+            progress=progress
+        )
+    
+    created_attendees = []
+    errors = []
+    
+    for row, attendee_data in enumerate(attendees_list, 1):
+        if progress and row % 100 == 0:
+            progress(row, len(attendees_list))
+        # a row that fails after claiming its ticket must give the ticket back
+        frappe.db.savepoint("bulk_attendee")
+        try:
+            attendee = frappe.get_doc({
+                "doctype": "Attendee",
+                "attendee_name": attendee_data.get("name"),
+                "email": attendee_data.get("email"),
+                "phone": attendee_data.get("phone"),
+                "event": event_name
+            })
+            attendee.insert(ignore_permissions=True)
+            created_attendees.append(attendee.name)
+        except frappe.ValidationError as e:
+            frappe.db.rollback(save_point="bulk_attendee")
+            clear_request_doc_cache()
+            errors.append({
+                "name": attendee_data.get("name"),
+                "error": str(e)
+            })
+    
+    return {
+        "created": created_attendees,
+        "errors": errors,
+        "total": len(created_attendees),
+        "failed": len(errors)
+    }
+
+
+def bulk_import_attendees(event_name, attendees_list, chunk_size=BULK_INSERT_CHUNK_SIZE, progress=None):
+    """Set-based attendee import.
+
+    Validates every row in memory against the event's registered emails and a
+    single capacity read, writes the accepted rows with multi-row INSERTs and
+    updates the event's ticket counters once at the end. Emails are compared
+    normalized, see `dedupe.find_registered_emails`.
+    """
+    event = frappe.db.get_value(
+        "Event", event_name, ["name", "tickets_sold", "tickets_available", "is_archived"], as_dict=True
+    )
+    if not event:
+        frappe.throw(f"Event {event_name} does not exist")
+    if cint(event.is_archived):
+        frappe.throw(f"Event {event_name} is archived")
+
+    registered = find_registered_emails(
+        event_name,
+        [normalize_email(row.get("email")) for row in attendees_list],
+        cint(event.tickets_sold)
+    )
+    remaining = cint(event.tickets_available)
+
+    accepted = []
+    errors = []
+
+    for attendee_data in attendees_list:
+        attendee_name = attendee_data.get("name")
+        email = (attendee_data.get("email") or "").strip()
+
+        if not attendee_name or not email:
+            error = "Attendee Name and Email are required"
+        elif not validate_email_address(email):
+            error = f"{email} is not a valid Email Address"
+        elif normalize_email(email) in registered:
+            error = f"Attendee with email {email} is already registered for this event"
+        elif remaining <= 0:
+            error = f"No tickets available for event {event_name}"
+        else:
+            error = None
+
+        if error:
+            errors.append({"name": attendee_name, "email": email, "error": error})
+            continue
+
+        registered.add(normalize_email(email))
+        remaining -= 1
+        accepted.append((attendee_name, email, attendee_data.get("phone")))
+
+    created_attendees = []
+    chunks = []
+
+    if accepted:
+        naming_series = get_default_naming_series("Attendee")
+        names = reserve_names(naming_series, len(accepted))
+        timestamp = now()
+        user = frappe.session.user
+        fields = [
+            "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+            "naming_series", "attendee_name", "email", "email_normalized", "phone", "event",
+            "checkin_token"
+        ]
+
+        for start in range(0, len(accepted), chunk_size):
+            chunk_started = time.perf_counter()
+            rows = [
+                (name, timestamp, timestamp, user, user, 0, 0,
+                 naming_series, attendee_name, email, normalize_email(email), phone, event_name,
+                 generate_checkin_token())
+                for name, (attendee_name, email, phone) in zip(
+                    names[start:start + chunk_size], accepted[start:start + chunk_size]
+                )
+            ]
+            frappe.db.bulk_insert("Attendee", fields, rows, chunk_size=chunk_size)
+            created_attendees.extend(row[0] for row in rows)
+            add_to_index(event_name, {row[-1]: row[0] for row in rows})
+            add_to_filter(event_name, [row[10] for row in rows])
+            chunks.append({
+                "chunk": len(chunks) + 1,
+                "rows": len(rows),
+                "seconds": round(time.perf_counter() - chunk_started, 6)
+            })
+            if progress:
+                progress(len(created_attendees), len(accepted))
+
+        if not adjust_ticket_counters(event_name, len(created_attendees)):
+            # sold out meanwhile, or archived after the read above
+            frappe.throw(f"No tickets available for event {event_name}")
+        invalidate_event_cache(event_name, INVALIDATES["Attendee"])
+        if len(chunks) > 1:
+            stamp_rows("Attendee", created_attendees, chunk_size)
+
+    return {
+        "created": created_attendees,
+        "errors": errors,
+        "total": len(created_attendees),
+        "failed": len(errors),
+        "chunks": chunks
+    }
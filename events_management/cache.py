@@ -0,0 +1,160 @@
+"""
+Read-through cache for per-event summaries
+"""
+
+import functools
+import time
+
+import frappe
+
+KEY_PREFIX = "event_management:event_cache"
+DEFAULT_TTL = 300
+DEFAULT_MAX_EVENTS = 1000
+
+# Which cached reads each DocType can change
+INVALIDATES = {
+    "Event": ("summary", "available_tickets", "revenue_by_ticket_type"),
+    "Attendee": ("summary",),
+    "Ticket": ("available_tickets", "revenue_by_ticket_type"),
+    "Ticket Hold": ("available_tickets",),
+    "Ticket Sales": ("summary", "available_tickets", "revenue_by_ticket_type"),
+}
+KINDS = INVALIDATES["Event"]
+
+
+class EventCache:
+    """Per-event read-through cache on top of `frappe.cache()`.
+
+    Entries expire after `ttl` seconds. Recently read events are tracked in a
+    sorted set, and the least recently used events are evicted once more than
+    `max_events` events are cached. Any object with the RedisWrapper methods
+    used below can be passed as `backend`.
+    """
+
+    def __init__(self, backend=None, ttl=None, max_events=None):
+        self._backend = backend
+        self._ttl = ttl
+        self._max_events = max_events
+
+    @property
+    def backend(self):
+        return self._backend or frappe.cache()
+
+    @property
+    def ttl(self):
+        return self._ttl or frappe.conf.get("event_management_cache_ttl") or DEFAULT_TTL
+
+    @property
+    def max_events(self):
+        return (
+            self._max_events
+            or frappe.conf.get("event_management_cache_max_events")
+            or DEFAULT_MAX_EVENTS
+        )
+
+    def get(self, event_name, kind, loader):
+        """Return the cached value, loading and storing it on a miss"""
+        key = self._key(event_name, kind)
+        value = self.backend.get_value(key)
+        if value is not None:
+            self._incr("hits")
+            self._touch(event_name)
+            return value
+
+        self._incr("misses")
+        value = loader()
+        self.backend.set_value(key, value, expires_in_sec=self.ttl)
+        self._touch(event_name)
+        self._evict()
+        return value
+
+    def invalidate(self, event_name, kinds=KINDS):
+        """Drop cached reads for an event"""
+        self.backend.delete_value([self._key(event_name, kind) for kind in kinds])
+
+    def stats(self):
+        """Return hit/miss/eviction counters"""
+        backend = self.backend
+        return {
+            counter: int(backend.get(backend.make_key(f"{KEY_PREFIX}:stats:{counter}")) or 0)
+            for counter in ("hits", "misses", "evictions")
+        }
+
+    def reset_stats(self):
+        backend = self.backend
+        backend.delete(*[
+            backend.make_key(f"{KEY_PREFIX}:stats:{counter}")
+            for counter in ("hits", "misses", "evictions")
+        ])
+
+    def _key(self, event_name, kind):
+        return f"{KEY_PREFIX}:{kind}:{event_name}"
+
+    def _incr(self, counter):
+        backend = self.backend
+        backend.incrby(backend.make_key(f"{KEY_PREFIX}:stats:{counter}"), 1)
+
+    def _touch(self, event_name):
+        backend = self.backend
+        backend.zadd(backend.make_key(f"{KEY_PREFIX}:lru"), {event_name: time.time()})
+
+    def _evict(self):
+        backend = self.backend
+        lru_key = backend.make_key(f"{KEY_PREFIX}:lru")
+        overflow = backend.zcard(lru_key) - self.max_events
+        if overflow <= 0:
+            return
+
+        for event_name in backend.zrange(lru_key, 0, overflow - 1):
+            if isinstance(event_name, bytes):
+                event_name = event_name.decode()
+            self.invalidate(event_name)
+            backend.zrem(lru_key, event_name)
+            backend.incrby(backend.make_key(f"{KEY_PREFIX}:stats:evictions"), 1)
+
+
+event_cache = EventCache()
+
+
+def cached_event_read(kind):
+    """Serve a single-argument `fn(event_name)` read through the event cache"""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(event_name, *args, **kwargs):
+            if args or kwargs:
+                return fn(event_name, *args, **kwargs)
+            return event_cache.get(event_name, kind, lambda: fn(event_name))
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_event_cache(event_name, kinds=KINDS):
+    """Invalidate now and again after commit, so readers that loaded the old
+    rows before this transaction committed cannot leave stale entries behind"""
+    if not event_name:
+        return
+    event_cache.invalidate(event_name, kinds)
+    frappe.db.after_commit.add(lambda: event_cache.invalidate(event_name, kinds))
+
+
+def invalidate_for_doc(doc, method=None):
+    """doc_events handler: invalidate the cached reads a document write affects"""
+    kinds = INVALIDATES.get(doc.doctype)
+    if not kinds:
+        return
+
+    event_name = doc.name if doc.doctype == "Event" else doc.get("event")
+    invalidate_event_cache(event_name, kinds)
+
+    previous = doc.get_doc_before_save()
+    if previous and doc.doctype != "Event" and previous.get("event") != event_name:
+        invalidate_event_cache(previous.get("event"), kinds)
+
+
+@frappe.whitelist()
+def get_cache_stats():
+    """Get event cache hit/miss/eviction counters"""
+    return event_cache.stats()
@@ -0,0 +1,253 @@
+"""
+Door check-in for attendees, validated against a per-event Redis index
+"""
+
+import frappe
+from frappe.utils import get_datetime, now, now_datetime
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.pagination import iter_keyset_pages
+
+KEY_PREFIX = "event_management:checkin"
+INDEX_TTL = 2 * 24 * 60 * 60
+WARM_PAGE_SIZE = 1000
+MAX_SCANS_PER_BATCH = 1000
+# Tokens the database did not know are remembered this long, so a forged
+# code or a bad scan repeated at the door does not query the database again
+MISS_TTL = 30
+
+
+def generate_checkin_token():
+    """A random token for the attendee's QR code"""
+    return frappe.generate_hash(length=20)
+
+
+def _keys(event_name):
+    backend = frappe.cache()
+    return (
+        backend.make_key(f"{KEY_PREFIX}:tokens:{event_name}"),
+        backend.make_key(f"{KEY_PREFIX}:checked:{event_name}"),
+        backend.make_key(f"{KEY_PREFIX}:ready:{event_name}"),
+    )
+
+
+def _miss_key(event_name, token):
+    return frappe.cache().make_key(f"{KEY_PREFIX}:miss:{event_name}:{token}")
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def is_index_warm(event_name):
+    backend = frappe.cache()
+    return bool(backend.exists(_keys(event_name)[2]))
+
+
+@frappe.whitelist()
+@profiled()
+def warm_checkin_index(event_name):
+    """Load every attendee token of an event into Redis.
+
+    Entries are only ever added, so warming while scanners are running does
+    not forget check-ins made in the meantime.
+    """
+    frappe.has_permission("Attendee", "read", throw=True)
+    backend = frappe.cache()
+    tokens_key, checked_key, ready_key = _keys(event_name)
+
+    loaded = 0
+    for rows in iter_keyset_pages(
+        "Attendee",
+        [["event", "=", event_name]],
+        ["name", "creation", "checkin_token", "checked_in"],
+        WARM_PAGE_SIZE
+    ):
+        rows = [row for row in rows if row.checkin_token]
+        if not rows:
+            continue
+        pipeline = backend.pipeline()
+        pipeline.hset(tokens_key, mapping={row.checkin_token: row.name for row in rows})
+        checked = [row.checkin_token for row in rows if row.checked_in]
+        if checked:
+            pipeline.sadd(checked_key, *checked)
+        pipeline.execute()
+        loaded += len(rows)
+
+    pipeline = backend.pipeline()
+    pipeline.set(ready_key, 1, ex=INDEX_TTL)
+    pipeline.expire(tokens_key, INDEX_TTL)
+    pipeline.expire(checked_key, INDEX_TTL)
+    pipeline.execute()
+    return {"event": event_name, "attendees": loaded}
+
+
+def lookup_tokens(event_name, tokens):
+    """Map tokens to attendee names, falling back to the database for misses"""
+    if not is_index_warm(event_name):
+        warm_checkin_index(event_name)
+
+    backend = frappe.cache()
+    tokens_key = _keys(event_name)[0]
+    found = {
+        token: _decode(attendee)
+        for token, attendee in zip(tokens, backend.hmget(tokens_key, tokens))
+        if attendee
+    }
+
+    # Attendees registered while the index was being warmed may be missing;
+    # tokens already looked up and not found are skipped
+    missing = [token for token in set(tokens) if token not in found]
+    if missing:
+        pipeline = backend.pipeline()
+        for token in missing:
+            pipeline.exists(_miss_key(event_name, token))
+        missing = [token for token, known in zip(missing, pipeline.execute()) if not known]
+    if missing:
+        late = dict(frappe.get_all(
+            "Attendee",
+            filters={"event": event_name, "checkin_token": ("in", missing)},
+            fields=["checkin_token", "name"],
+            as_list=True
+        ))
+        pipeline = backend.pipeline()
+        if late:
+            pipeline.hset(tokens_key, mapping=late)
+            found.update(late)
+        for token in missing:
+            if token not in late:
+                pipeline.set(_miss_key(event_name, token), 1, ex=MISS_TTL)
+        pipeline.execute()
+    return found
+
+
+@frappe.whitelist()
+@profiled()
+def validate_checkin_token(event_name, token):
+    """Look up a token without checking the attendee in"""
+    frappe.has_permission("Attendee", "read", throw=True)
+    attendee = lookup_tokens(event_name, [token]).get(token)
+    if not attendee:
+        return {"token": token, "status": "invalid"}
+
+    checked = frappe.cache().sismember(_keys(event_name)[1], token)
+    return {
+        "token": token,
+        "status": "checked_in" if checked else "valid",
+        "attendee": attendee
+    }
+
+
+@frappe.whitelist()
+@profiled()
+def checkin_scans(event_name, scans):
+    """Check in a batch of scans queued by a door scanner.
+
+    `scans` is a list of tokens or of `{"token": ..., "scanned_at": ...}`
+    entries. Tokens are resolved through the Redis index and marked in the
+    event's checked set, so repeated scans, including repeats within the
+    batch, are reported as duplicates without touching the database. The new
+    check-ins are then written with a single UPDATE.
+    """
+    frappe.has_permission("Attendee", "write", throw=True)
+    scans = frappe.parse_json(scans) if isinstance(scans, str) else scans
+    if len(scans) > MAX_SCANS_PER_BATCH:
+        frappe.throw(f"At most {MAX_SCANS_PER_BATCH} scans can be sent in one batch")
+
+    scans = [scan if isinstance(scan, dict) else {"token": scan} for scan in scans]
+    tokens = [scan.get("token") or "" for scan in scans]
+    attendees = lookup_tokens(event_name, [token for token in tokens if token])
+
+    backend = frappe.cache()
+    checked_key = _keys(event_name)[1]
+    valid = [scan for scan in scans if scan.get("token") in attendees]
+    pipeline = backend.pipeline()
+    for scan in valid:
+        pipeline.sadd(checked_key, scan["token"])
+    pipeline.expire(checked_key, INDEX_TTL)
+    added = pipeline.execute()[:-1]
+
+    first_scans = {}
+    for scan, is_new in zip(valid, added):
+        if is_new:
+            first_scans[scan["token"]] = scan
+
+    results = []
+    for scan in scans:
+        token = scan.get("token")
+        if token not in attendees:
+            status = "invalid"
+        elif first_scans.get(token) is scan:
+            status = "checked_in"
+        else:
+            status = "duplicate"
+        results.append({"token": token, "status": status, "attendee": attendees.get(token)})
+
+    if first_scans:
+        # Forget the marks if the transaction fails, so the scans can be retried
+        frappe.db.after_rollback.add(
+            lambda: frappe.cache().srem(checked_key, *first_scans)
+        )
+        mark_checked_in({
+            attendees[token]: get_datetime(scan.get("scanned_at")) if scan.get("scanned_at") else now_datetime()
+            for token, scan in first_scans.items()
+        })
+
+    return {
+        "results": results,
+        "checked_in": len(first_scans),
+        "duplicates": sum(result["status"] == "duplicate" for result in results),
+        "invalid": sum(result["status"] == "invalid" for result in results)
+    }
+
+
+def mark_checked_in(checked_in_at):
+    """Set the check-in flag and time of many attendees in one UPDATE"""
+    cases = " ".join(["WHEN %s THEN %s"] * len(checked_in_at))
+    case_values = [value for item in checked_in_at.items() for value in item]
+    frappe.db.sql(
+        f"""
+        UPDATE `tabAttendee`
+        SET checked_in = 1, checked_in_at = (CASE name {cases} END), modified = %s
+        WHERE name IN ({", ".join(["%s"] * len(checked_in_at))})
+            AND checked_in = 0
+        """,
+        case_values + [now()] + list(checked_in_at)
+    )
+
+
+def add_to_index(event_name, tokens):
+    """Add {token: attendee} entries to a warm index once the transaction commits"""
+    if not event_name or not tokens:
+        return
+
+    def add():
+        pipeline = frappe.cache().pipeline()
+        if is_index_warm(event_name):
+            pipeline.hset(_keys(event_name)[0], mapping=tokens)
+        pipeline.delete(*(_miss_key(event_name, token) for token in tokens))
+        pipeline.execute()
+
+    frappe.db.after_commit.add(add)
+
+
+def remove_from_index(event_name, token):
+    """Drop a token from an event's index and checked set"""
+    if not event_name or not token:
+        return
+    tokens_key, checked_key, _ = _keys(event_name)
+    pipeline = frappe.cache().pipeline()
+    pipeline.hdel(tokens_key, token)
+    pipeline.srem(checked_key, token)
+    pipeline.execute()
+
+
+def update_index_for_doc(doc, method=None):
+    """doc_events handler keeping the check-in index in step with Attendee writes"""
+    if method == "on_trash":
+        remove_from_index(doc.event, doc.checkin_token)
+        return
+
+    previous = doc.get_doc_before_save()
+    if previous and previous.event != doc.event:
+        remove_from_index(previous.event, previous.checkin_token)
+    add_to_index(doc.event, {doc.checkin_token: doc.name})
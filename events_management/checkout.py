@@ -0,0 +1,136 @@
+"""
+Multi-line ticket checkout for Event Management System
+"""
+
+import frappe
+from frappe.utils import cint, flt, now
+from event_management.event_management.archive import is_archived
+from event_management.event_management.cache import INVALIDATES, invalidate_event_cache
+from event_management.event_management.doc_cache import invalidate_request_doc
+from event_management.event_management.doctype.seat_map_section.seat_map_section import seated_tickets
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import (
+    apply_sales
+)
+from event_management.event_management.utils import get_default_naming_series, reserve_names
+
+
+def checkout(event_name, lines):
+    """Sell every line of a basket in one transaction or none of them.
+
+    `lines` is a list of {"ticket": ..., "quantity": ...}. All tickets are
+    loaded with one query and reserved with one conditional UPDATE, so the
+    number of queries does not grow with the number of lines.
+    """
+    if isinstance(lines, str):
+        lines = frappe.parse_json(lines)
+
+    quantities = {}
+    for line in lines or []:
+        quantity = cint(line.get("quantity"))
+        if quantity <= 0:
+            frappe.throw("Ticket quantity must be greater than 0")
+        quantities[line.get("ticket")] = quantities.get(line.get("ticket"), 0) + quantity
+    if not quantities:
+        frappe.throw("Checkout needs at least one ticket line")
+
+    tickets = {
+        ticket.name: ticket
+        for ticket in frappe.get_all(
+            "Ticket",
+            filters={"name": ("in", list(quantities))},
+            fields=["name", "event", "ticket_type", "price"]
+        )
+    }
+    for ticket_name in quantities:
+        if ticket_name not in tickets:
+            frappe.throw(f"Ticket {ticket_name} does not exist")
+        if tickets[ticket_name].event != event_name:
+            frappe.throw(f"Ticket {ticket_name} does not belong to event {event_name}")
+    if is_archived(event_name):
+        frappe.throw(f"Event {event_name} is archived")
+    for ticket_name in seated_tickets(quantities):
+        frappe.throw(f"Ticket {ticket_name} is sold by seat; hold seats with hold_seats first")
+
+    frappe.db.savepoint("event_management_checkout")
+    if not reserve_lines(quantities):
+        frappe.db.rollback(save_point="event_management_checkout")
+        throw_unavailable(quantities)
+
+    naming_series = get_default_naming_series("Ticket Sales")
+    sale_names = reserve_names(naming_series, len(quantities))
+    timestamp = now()
+    user = frappe.session.user
+
+    sales = []
+    for sale_name, (ticket_name, quantity) in zip(sale_names, quantities.items()):
+        ticket = tickets[ticket_name]
+        sales.append(frappe._dict(
+            sale_id=sale_name,
+            ticket=ticket_name,
+            ticket_type=ticket.ticket_type,
+            price=ticket.price,
+            quantity=quantity,
+            total_amount=flt(ticket.price) * quantity
+        ))
+
+    frappe.db.bulk_insert(
+        "Ticket Sales",
+        [
+            "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+            "naming_series", "ticket", "event", "quantity", "total_amount"
+        ],
+        [
+            (sale.sale_id, timestamp, timestamp, user, user, 0, 0,
+             naming_series, sale.ticket, event_name, sale.quantity, sale.total_amount)
+            for sale in sales
+        ]
+    )
+    apply_sales([(sale.ticket, event_name, sale.quantity, sale.total_amount) for sale in sales])
+    invalidate_event_cache(event_name, INVALIDATES["Ticket Sales"])
+
+    return {
+        "lines": sales,
+        "sale_ids": [sale.sale_id for sale in sales],
+        "total_amount": sum(sale.total_amount for sale in sales)
+    }
+
+
+def reserve_lines(quantities):
+    """Decrement every ticket's stock in one UPDATE, only if all lines fit.
+
+    Returns False if any line lacks stock or belongs to an archived event;
+    the caller must roll back, since the lines that did fit have already been
+    decremented.
+    """
+    cases = " ".join(["WHEN %s THEN %s"] * len(quantities))
+    case_values = [value for item in quantities.items() for value in item]
+    frappe.db.sql(
+        f"""
+        UPDATE `tabTicket` t
+        JOIN `tabEvent` e ON e.name = t.event
+        SET t.available_quantity = t.available_quantity - (CASE t.name {cases} END)
+        WHERE t.name IN ({", ".join(["%s"] * len(quantities))})
+            AND t.available_quantity >= (CASE t.name {cases} END)
+            AND IFNULL(e.is_archived, 0) = 0
+        """,
+        case_values + list(quantities) + case_values
+    )
+    for ticket_name in quantities:
+        invalidate_request_doc("Ticket", ticket_name, ["available_quantity"])
+    return frappe.db._cursor.rowcount == len(quantities)
+
+
+def throw_unavailable(quantities):
+    """Report the lines a failed checkout could not reserve"""
+    available = dict(frappe.get_all(
+        "Ticket",
+        filters={"name": ("in", list(quantities))},
+        fields=["name", "available_quantity"],
+        as_list=True
+    ))
+    short = [
+        f"Only {available.get(ticket_name, 0)} tickets available for {ticket_name}"
+        for ticket_name, quantity in quantities.items()
+        if (available.get(ticket_name) or 0) < quantity
+    ]
+    frappe.throw("<br>".join(short) or "Tickets are no longer available")
@@ -0,0 +1,141 @@
+"""
+Duplicate registration checks on normalized attendee emails
+"""
+
+import hashlib
+
+import frappe
+from event_management.event_management.pagination import iter_keyset_pages
+
+KEY_PREFIX = "event_management:email_filter"
+# Events with more attendees than this are checked through a Bloom filter
+# instead of loading every registered email
+BLOOM_THRESHOLD = 50000
+# 2^24 bits (2 MiB) and 7 hashes keep false positives near 1% up to ~1.7M emails
+BLOOM_BITS = 2 ** 24
+BLOOM_HASHES = 7
+BUILD_PAGE_SIZE = 5000
+CONFIRM_BATCH_SIZE = 1000
+
+
+def normalize_email(email):
+    """The form duplicate checks compare emails in"""
+    return (email or "").strip().lower()
+
+
+class EmailBloomFilter:
+    """Per-event Bloom filter of normalized emails, stored as a Redis bitmap.
+
+    A negative answer means the email is certainly not registered; a positive
+    one has to be confirmed against the database. Emails are never removed,
+    so deleted attendees only add false positives.
+    """
+
+    def __init__(self, event_name, backend=None):
+        self.event_name = event_name
+        self._backend = backend
+
+    @property
+    def backend(self):
+        return self._backend or frappe.cache()
+
+    @property
+    def key(self):
+        return self.backend.make_key(f"{KEY_PREFIX}:{self.event_name}")
+
+    def exists(self):
+        return bool(self.backend.exists(self.key))
+
+    def build(self):
+        """Load every registered email of the event into the filter"""
+        # Create the key first so writes committed while the pages are read
+        # are added to the filter by `add_for_doc` rather than skipped
+        self.backend.setbit(self.key, 0, 0)
+        for rows in iter_keyset_pages(
+            "Attendee",
+            [["event", "=", self.event_name]],
+            ["name", "creation", "email_normalized"],
+            BUILD_PAGE_SIZE
+        ):
+            self.add([row.email_normalized for row in rows if row.email_normalized])
+
+    def add(self, emails):
+        pipeline = self.backend.pipeline()
+        for email in emails:
+            for position in self._positions(email):
+                pipeline.setbit(self.key, position, 1)
+        pipeline.execute()
+
+    def might_contain(self, emails):
+        """Return, per email, whether it may already be registered"""
+        pipeline = self.backend.pipeline()
+        for email in emails:
+            for position in self._positions(email):
+                pipeline.getbit(self.key, position)
+        bits = pipeline.execute()
+        return [
+            all(bits[i * BLOOM_HASHES:(i + 1) * BLOOM_HASHES])
+            for i in range(len(emails))
+        ]
+
+    def _positions(self, email):
+        # Kirsch-Mitzenmacher: derive all positions from two halves of one digest
+        digest = hashlib.blake2b(email.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
+        return [(first + i * second) % BLOOM_BITS for i in range(BLOOM_HASHES)]
+
+
+def find_registered_emails(event_name, emails, attendee_count):
+    """Return which of the normalized `emails` are already registered for an event.
+
+    Smaller events load their whole email set with one query. Large events
+    pass the candidates through the event's Bloom filter and confirm only the
+    possible matches with batched IN queries.
+    """
+    emails = list(set(emails))
+    if not emails:
+        return set()
+
+    if attendee_count <= BLOOM_THRESHOLD:
+        return set(frappe.get_all(
+            "Attendee",
+            filters={"event": event_name},
+            pluck="email_normalized"
+        ))
+
+    bloom = EmailBloomFilter(event_name)
+    if not bloom.exists():
+        bloom.build()
+    candidates = [
+        email for email, maybe in zip(emails, bloom.might_contain(emails)) if maybe
+    ]
+
+    registered = set()
+    for start in range(0, len(candidates), CONFIRM_BATCH_SIZE):
+        registered.update(frappe.get_all(
+            "Attendee",
+            filters={
+                "event": event_name,
+                "email_normalized": ("in", candidates[start:start + CONFIRM_BATCH_SIZE])
+            },
+            pluck="email_normalized"
+        ))
+    return registered
+
+
+def add_to_filter(event_name, emails):
+    """Add emails to an event's Bloom filter, if it has one, once the transaction commits"""
+    if not event_name or not emails:
+        return
+
+    def add():
+        bloom = EmailBloomFilter(event_name)
+        if bloom.exists():
+            bloom.add(emails)
+
+    frappe.db.after_commit.add(add)
+
+
+def add_for_doc(doc, method=None):
+    """doc_events handler adding a saved attendee's email to the event's filter"""
+    add_to_filter(doc.event, [doc.email_normalized])
@@ -0,0 +1,96 @@
+"""
+Request-scoped identity map for Event and Ticket documents
+"""
+
+from contextlib import contextmanager
+
+import frappe
+
+CACHED_DOCTYPES = ("Event", "Ticket")
+
+
+def _get_store():
+    """Cache dict for the current request and transaction.
+
+    Entries are dropped on commit and rollback so a long-lived process (a
+    worker, a console, a benchmark loop) never reads values another
+    transaction has since changed.
+    """
+    store = getattr(frappe.local, "event_management_doc_cache", None)
+    if store is None:
+        store = frappe.local.event_management_doc_cache = {}
+        frappe.db.after_commit.add(clear_request_doc_cache)
+        frappe.db.after_rollback.add(clear_request_doc_cache)
+    return store
+
+
+def _is_enabled(doctype):
+    return doctype in CACHED_DOCTYPES and not getattr(frappe.local, "event_management_doc_cache_disabled", False)
+
+
+def get_request_doc(doctype, name):
+    """Load a document once per request; treat the result as read-only"""
+    if not _is_enabled(doctype):
+        return frappe.get_doc(doctype, name)
+
+    store = _get_store()
+    entry = store.get((doctype, name))
+    if not entry or "doc" not in entry:
+        entry = store[(doctype, name)] = {"doc": frappe.get_doc(doctype, name)}
+    return entry["doc"]
+
+
+def get_request_value(doctype, name, fields):
+    """Read a few fields of a document, loading each field at most once per request"""
+    if isinstance(fields, str):
+        fields = [fields]
+    if not _is_enabled(doctype):
+        return frappe.db.get_value(doctype, name, fields, as_dict=True)
+
+    store = _get_store()
+    entry = store.setdefault((doctype, name), {"values": {}})
+    if "doc" in entry:
+        return frappe._dict({field: entry["doc"].get(field) for field in fields})
+
+    values = entry.setdefault("values", {})
+    missing = [field for field in fields if field not in values]
+    if missing:
+        loaded = frappe.db.get_value(doctype, name, missing, as_dict=True)
+        if not loaded:
+            store.pop((doctype, name), None)
+            return None
+        values.update(loaded)
+    return frappe._dict({field: values[field] for field in fields})
+
+
+def invalidate_request_doc(doctype, name, fields=None):
+    """Forget a cached document, or just the given fields, after a write"""
+    store = getattr(frappe.local, "event_management_doc_cache", None)
+    if not store or (doctype, name) not in store:
+        return
+
+    entry = store[(doctype, name)]
+    if fields and "doc" not in entry:
+        for field in fields:
+            entry["values"].pop(field, None)
+    else:
+        store.pop((doctype, name), None)
+
+
+def invalidate_for_doc(doc, method=None):
+    """doc_events handler: forget the saved or deleted document"""
+    invalidate_request_doc(doc.doctype, doc.name)
+
+
+def clear_request_doc_cache():
+    frappe.local.event_management_doc_cache = None
+
+
+@contextmanager
+def request_doc_cache_disabled():
+    """Bypass the cache, e.g. to measure queries without it"""
+    frappe.local.event_management_doc_cache_disabled = True
+    try:
+        yield
+    finally:
+        frappe.local.event_management_doc_cache_disabled = False
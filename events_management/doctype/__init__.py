@@ -10,4 +10,19 @@ from event_management.events_management.doctype.ticket.ticket import Ticket
 # Ticket Sales
 from event_management.events_management.doctype.ticket_sales.ticket_sales import TicketSales
 
-__all__ = ["Event", "Attendee", "Ticket", "TicketSales"]
+# Ticket Hold
+from event_management.event_management.doctype.ticket_hold.ticket_hold import TicketHold
+
+# Ticket Sales Rollup
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import TicketSalesRollup
+
+# Waitlist Entry
+from event_management.event_management.doctype.waitlist_entry.waitlist_entry import WaitlistEntry
+
+# Seat Map Section
+from event_management.event_management.doctype.seat_map_section.seat_map_section import SeatMapSection
+
+__all__ = [
+    "Event", "Attendee", "Ticket", "TicketSales", "TicketHold", "TicketSalesRollup", "WaitlistEntry",
+    "SeatMapSection"
+]
@@ -1,24 +1,39 @@
 import frappe
 from frappe.model.document import Document
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.checkin import generate_checkin_token
+from event_management.event_management.dedupe import normalize_email
+from event_management.event_management.doc_cache import get_request_value
+from event_management.event_management.doctype.event.event import adjust_ticket_counters
+from event_management.event_management.doctype.waitlist_entry.waitlist_entry import enqueue_promotion
+
+
+class EventSoldOutError(frappe.ValidationError):
+    pass
 
 
 class Attendee(Document):
+    @profiled()
     def validate(self):
         """Validate attendee data"""
+        self.email = (self.email or "").strip()
+        self.email_normalized = normalize_email(self.email)
         self.validate_duplicate_registration()
         self.validate_event_capacity()
+        if not self.checkin_token:
+            self.checkin_token = generate_checkin_token()
 
-    def on_insert(self):
-        """Update event ticket availability when attendee is added"""
-        self.update_event_tickets()
-
-    def on_update(self):
-        """Update event ticket availability when attendee is modified"""
+    @profiled()
+    def before_save(self):
+        """Claim the event ticket before the row is written"""
         self.update_event_tickets()
 
-    def before_delete(self):
+    @profiled()
+    def on_trash(self):
         """Update event ticket availability when attendee is deleted"""
-        self.update_event_tickets()
+        if self.event:
+            adjust_ticket_counters(self.event, -1)
+            enqueue_promotion(self.event)
 
     def validate_duplicate_registration(self):
         """Prevent duplicate attendee registration for the same event"""
@@ -26,7 +41,7 @@ class Attendee(Document):
             "Attendee",
             {
                 "event": self.event,
-                "email": self.email,
+                "email_normalized": self.email_normalized,
                 "name": ("!=", self.name)
             }
         )
@@ -37,13 +52,36 @@ class Attendee(Document):
 
     def validate_event_capacity(self):
         """Ensure event has available capacity"""
-        event = frappe.get_doc("Event", self.event)
-        if event.tickets_available <= 0:
-            frappe.throw(f"No tickets available for event {self.event}")
+        event = get_request_value("Event", self.event, ["tickets_available", "is_archived"])
+        if event and event.is_archived:
+            frappe.throw(f"Event {self.event} is archived")
+        if event and event.tickets_available <= 0:
+            frappe.throw(f"No tickets available for event {self.event}", EventSoldOutError)
 
     def update_event_tickets(self):
         """Update the event's ticket availability"""
-        if self.event:
-            event = frappe.get_doc("Event", self.event)
-            event.update_ticket_availability()
-            event.save(ignore_permissions=True)
+        if self.is_new():
+            self.claim_event_ticket(self.event)
+            return
+
+        previous = self.get_doc_before_save()
+        if previous and previous.event != self.event:
+            if previous.event:
+                adjust_ticket_counters(previous.event, -1)
+                enqueue_promotion(previous.event)
+            self.claim_event_ticket(self.event)
+
+    def claim_event_ticket(self, event_name):
+        """Take one ticket from the event, failing if it sold out meanwhile"""
+        if event_name and not adjust_ticket_counters(event_name, 1):
+            if frappe.db.get_value("Event", event_name, "is_archived"):
+                frappe.throw(f"Event {event_name} is archived")
+            frappe.throw(f"No tickets available for event {event_name}", EventSoldOutError)
+
+
+def on_doctype_update():
+    """Add composite indexes for the event filters used by registrations and reports"""
+    frappe.db.add_unique(
+        "Attendee", ["event", "email_normalized"], constraint_name="unique_event_email_normalized"
+    )
+    frappe.db.add_index("Attendee", ["event", "creation"])
@@ -67,6 +67,78 @@ class TestAttendee(FrappeTestCase):
         with self.assertRaises(frappe.ValidationError):
             excess_attendee.insert()
 
+    def test_delete_frees_ticket(self):
+        """Test that deleting an attendee gives its ticket back"""
+        attendee = frappe.get_doc(self.test_attendee_data)
+        attendee.insert()
+        self.event.reload()
+        self.assertEqual(self.event.tickets_sold, 1)
+
+        frappe.delete_doc("Attendee", attendee.name)
+        self.event.reload()
+        self.assertEqual(self.event.tickets_sold, 0)
+        self.assertEqual(self.event.tickets_available, 2)
+
+    def test_failed_row_keeps_no_ticket(self):
+        """Test that a row rejected after claiming its ticket does not keep it"""
+        from event_management.event_management.bulk import create_bulk_attendees
+
+        result = create_bulk_attendees(
+            self.event.name,
+            [
+                {"name": "Row One", "email": "row1@example.com"},
+                {"name": "Row One Again", "email": "ROW1@example.com"},
+                {"name": "", "email": "row2@example.com"}
+            ]
+        )
+        self.assertEqual(result["total"], 1)
+        self.assertEqual(result["failed"], 2)
+
+        self.event.reload()
+        self.assertEqual(self.event.tickets_sold, 1)
+
+    def test_bulk_import_attendees(self):
+        """Test that bulk mode skips duplicates and respects capacity"""
+        from event_management.event_management.bulk import create_bulk_attendees
+
+        result = create_bulk_attendees(
+            self.event.name,
+            [
+                {"name": "Bulk One", "email": "bulk1@example.com"},
+                {"name": "Bulk One Again", "email": "bulk1@example.com"},
+                {"name": "Bulk Two", "email": "bulk2@example.com"},
+                {"name": "Bulk Three", "email": "bulk3@example.com"}
+            ],
+            bulk_mode=1,
+            chunk_size=1
+        )
+        self.assertEqual(result["total"], 2)
+        self.assertEqual(result["failed"], 2)
+        self.assertEqual(len(result["chunks"]), 2)
+
+        self.event.reload()
+        self.assertEqual(self.event.tickets_sold, 2)
+        self.assertEqual(self.event.tickets_available, 0)
+
+    def test_streaming_csv_export(self):
+        """Test that the paged CSV export yields every attendee once"""
+        from event_management.event_management.exports import iter_attendees_csv
+
+        for i in range(2):
+            frappe.get_doc({
+                "doctype": "Attendee",
+                "attendee_name": f"Export {i}",
+                "email": f"export{i}@example.com",
+                "event": self.event.name
+            }).insert()
+
+        chunks = list(iter_attendees_csv(self.event.name, page_size=1))
+        self.assertEqual(len(chunks), 2)
+
+        lines = "".join(chunks).splitlines()
+        self.assertEqual(lines[0], "Name,Email,Phone")
+        self.assertEqual(sorted(lines[1:]), ["Export 0,export0@example.com,", "Export 1,export1@example.com,"])
+
     def tearDown(self):
         """Clean up test data"""
         frappe.db.delete("Attendee", filters={"event": self.event.name})
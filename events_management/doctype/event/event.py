@@ -1,18 +1,41 @@
 import frappe
 from frappe.model.document import Document
+from frappe.utils import cint
 from datetime import datetime
+from event_management.event_management.admission import clear_sold_out
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.cache import INVALIDATES, invalidate_event_cache
+from event_management.event_management.doc_cache import invalidate_request_doc
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import (
+    delete_rollup
+)
+from event_management.event_management.search import add_search_index, build_search_text
 
 
 class Event(Document):
+    @profiled()
     def validate(self):
         """Validate event data"""
         self.validate_event_date()
         self.validate_capacity()
         self.update_ticket_availability()
+        self.search_text = build_search_text(self)
 
+    @profiled()
     def on_update(self):
-        """Update ticket availability on update"""
-        self.update_ticket_availability()
+        """Promote waitlisted registrations when capacity is raised"""
+        previous = self.get_doc_before_save()
+        if previous and cint(self.capacity) > cint(previous.capacity):
+            # imported here because the waitlist module depends on this one
+            from event_management.event_management.doctype.waitlist_entry.waitlist_entry import (
+                enqueue_promotion
+            )
+            enqueue_promotion(self.name)
+
+    @profiled()
+    def on_trash(self):
+        """Remove the event's sales rollup rows"""
+        delete_rollup({"event": self.name})
 
     def validate_event_date(self):
         """Ensure event date is not in the past"""
@@ -26,10 +49,112 @@ class Event(Document):
 
     def update_ticket_availability(self):
         """Update available tickets based on capacity and sold tickets"""
-        self.tickets_sold = frappe.db.count(
-            "Attendee",
-            filters={"event": self.name}
-        )
+        if self.is_new():
+            self.tickets_sold = 0
+        else:
+            # tickets_sold is maintained by adjust_ticket_counters, so re-read it
+            # under a row lock instead of trusting the value loaded with the form
+            self.tickets_sold = cint(frappe.db.get_value(
+                "Event", self.name, "tickets_sold", for_update=True
+            ))
         self.tickets_available = self.capacity - (self.tickets_sold or 0)
         if self.tickets_available < 0:
             self.tickets_available = 0
+
+
+def adjust_ticket_counters(event_name, delta):
+    """Apply a delta to an event's tickets_sold/tickets_available in one UPDATE.
+
+    Runs inside the caller's transaction. Positive deltas only apply while the
+    event is not archived and still has that many tickets available; returns
+    False when they don't.
+    """
+    delta = cint(delta)
+    if not delta:
+        return True
+
+    # MariaDB evaluates SET assignments left to right, so tickets_available is
+    # derived from the already incremented tickets_sold
+    frappe.db.sql(
+        """
+        UPDATE `tabEvent`
+        SET tickets_sold = GREATEST(IFNULL(tickets_sold, 0) + %(delta)s, 0),
+            tickets_available = GREATEST(capacity - tickets_sold, 0)
+        WHERE name = %(event)s
+            AND (%(delta)s < 0 OR (
+                IFNULL(tickets_available, 0) >= %(delta)s AND IFNULL(is_archived, 0) = 0
+            ))
+        """,
+        {"event": event_name, "delta": delta}
+    )
+    invalidate_request_doc("Event", event_name, ["tickets_sold", "tickets_available"])
+    if delta < 0:
+        clear_sold_out("event", event_name)
+    return frappe.db._cursor.rowcount > 0
+
+
+def reconcile_ticket_counters(event_name=None, fix=True):
+    """Re-derive ticket counters from Attendee rows and report any drift"""
+    # archived events have no hot Attendee rows left and their counters are frozen
+    conditions = "WHERE IFNULL(e.is_archived, 0) = 0"
+    if event_name:
+        conditions += " AND e.name = %(event)s"
+    events = frappe.db.sql(
+        f"""
+        SELECT
+            e.name,
+            e.capacity,
+            IFNULL(e.tickets_sold, 0) as tickets_sold,
+            IFNULL(e.tickets_available, 0) as tickets_available,
+            COUNT(a.name) as attendees
+        FROM `tabEvent` e
+        LEFT JOIN `tabAttendee` a ON a.event = e.name
+        {conditions}
+        GROUP BY e.name, e.capacity, e.tickets_sold, e.tickets_available
+        """,
+        {"event": event_name},
+        as_dict=True
+    )
+
+    drift = []
+    for event in events:
+        expected_available = max(cint(event.capacity) - event.attendees, 0)
+        if event.tickets_sold == event.attendees and event.tickets_available == expected_available:
+            continue
+
+        drift.append({
+            "event": event.name,
+            "tickets_sold": event.tickets_sold,
+            "expected_tickets_sold": event.attendees,
+            "tickets_available": event.tickets_available,
+            "expected_tickets_available": expected_available
+        })
+        if fix:
+            # recount inside the UPDATE: the subquery is a locking read, so a
+            # registration committed after the snapshot above is still counted
+            frappe.db.sql(
+                """
+                UPDATE `tabEvent` e
+                SET e.tickets_sold = (SELECT COUNT(*) FROM `tabAttendee` a WHERE a.event = e.name),
+                    e.tickets_available = GREATEST(e.capacity - e.tickets_sold, 0)
+                WHERE e.name = %(event)s AND IFNULL(e.is_archived, 0) = 0
+                """,
+                {"event": event.name}
+            )
+            invalidate_request_doc("Event", event.name, ["tickets_sold", "tickets_available"])
+            invalidate_event_cache(event.name, INVALIDATES["Attendee"])
+            clear_sold_out("event", event.name)
+
+    if drift:
+        frappe.log_error(
+            title="Event ticket counter drift",
+            message=frappe.as_json(drift)
+        )
+
+    return drift
+
+
+def on_doctype_update():
+    """Add the FULLTEXT index used by event search and an index for location facets"""
+    add_search_index()
+    frappe.db.add_index("Event", ["location", "event_date"])
@@ -60,6 +60,27 @@ class TestEvent(FrappeTestCase):
         with self.assertRaises(frappe.DuplicateEntryError):
             duplicate_event.insert()
 
+    def test_reconcile_ticket_counters(self):
+        """Test that counter drift is reported and repaired"""
+        from event_management.event_management.doctype.event.event import (
+            reconcile_ticket_counters
+        )
+
+        event = frappe.get_doc(self.test_event_data)
+        event.insert(ignore_if_duplicate=True)
+        frappe.db.set_value(
+            "Event", event.name, {"tickets_sold": 7, "tickets_available": 93}
+        )
+
+        drift = reconcile_ticket_counters(event.name)
+        self.assertEqual(len(drift), 1)
+        self.assertEqual(drift[0]["expected_tickets_sold"], 0)
+
+        event.reload()
+        self.assertEqual(event.tickets_sold, 0)
+        self.assertEqual(event.tickets_available, 100)
+        self.assertEqual(reconcile_ticket_counters(event.name), [])
+
     def tearDown(self):
         """Clean up test data"""
         frappe.db.delete("Event", filters={"event_title": "Test Event"})
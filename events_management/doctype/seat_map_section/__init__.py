@@ -0,0 +1,3 @@
+from event_management.event_management.doctype.seat_map_section.seat_map_section import SeatMapSection
+
+__all__ = ["SeatMapSection"]
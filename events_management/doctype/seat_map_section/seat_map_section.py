@@ -0,0 +1,223 @@
+import base64
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint, now
+from event_management.event_management.instrumentation import profiled
+
+
+class SeatMapSection(Document):
+    """A block of numbered seats sold through one Ticket.
+
+    Seat state is kept as two bitmaps, held and sold, with seat `i` at bit
+    `i` in row-major order (row `i // seats_per_row`). The seat counters are
+    recomputed from the bitmaps on every write, so availability is read from
+    the row itself.
+    """
+
+    @profiled()
+    def validate(self):
+        """Validate seat map section data"""
+        if cint(self.row_count) <= 0 or cint(self.seats_per_row) <= 0:
+            frappe.throw("Row count and seats per row must be greater than 0")
+
+        seat_count = cint(self.row_count) * cint(self.seats_per_row)
+        held, sold = decode_bitmap(self.held_bitmap), decode_bitmap(self.sold_bitmap)
+        if not self.is_new() and seat_count != self.seat_count and (held | sold):
+            frappe.throw("The layout of a section with held or sold seats cannot be changed")
+
+        self.seat_count = seat_count
+        self.validate_ticket()
+        self.update(seat_state(held, sold, seat_count))
+
+    def validate_ticket(self):
+        """Ensure the section is the only one selling its ticket, with one ticket per seat"""
+        other = frappe.db.exists("Seat Map Section", {"ticket": self.ticket, "name": ("!=", self.name)})
+        if other:
+            frappe.throw(f"Ticket {self.ticket} is already sold through Seat Map Section {other}")
+        quantity = cint(frappe.db.get_value("Ticket", self.ticket, "quantity"))
+        if quantity != self.seat_count:
+            frappe.throw(
+                f"Ticket {self.ticket} has a quantity of {quantity} but the section has {self.seat_count} seats"
+            )
+
+
+def seated_tickets(ticket_names):
+    """The tickets among `ticket_names` that are sold through a Seat Map Section"""
+    if not ticket_names:
+        return set()
+    return set(frappe.get_all(
+        "Seat Map Section", filters={"ticket": ("in", list(ticket_names))}, pluck="ticket"
+    ))
+
+
+def validate_unseated(ticket_name):
+    """Seated tickets are only sold through seat holds, so the seat map and stock agree"""
+    if seated_tickets([ticket_name]):
+        frappe.throw(f"Ticket {ticket_name} is sold by seat; hold seats with hold_seats first")
+
+
+def decode_bitmap(value):
+    """Bitmap field value -> int with one bit per seat"""
+    return int.from_bytes(base64.b64decode(value), "little") if value else 0
+
+
+def encode_bitmap(bits, seat_count):
+    """int with one bit per seat -> base64 field value"""
+    return base64.b64encode(bits.to_bytes((seat_count + 7) // 8, "little")).decode()
+
+
+def seat_state(held, sold, seat_count):
+    """Field values for a section's bitmaps and the counters derived from them"""
+    held_seats, sold_seats = held.bit_count(), sold.bit_count()
+    return {
+        "held_bitmap": encode_bitmap(held, seat_count),
+        "sold_bitmap": encode_bitmap(sold, seat_count),
+        "held_seats": held_seats,
+        "sold_seats": sold_seats,
+        "available_seats": seat_count - held_seats - sold_seats
+    }
+
+
+def seat_label(index, seats_per_row):
+    """Seat index -> "row-seat", both counted from 1"""
+    return f"{index // seats_per_row + 1}-{index % seats_per_row + 1}"
+
+
+def seat_index(label, row_count, seats_per_row):
+    """"row-seat" -> seat index"""
+    try:
+        row, seat = (int(part) for part in str(label).split("-"))
+    except ValueError:
+        frappe.throw(f"Invalid seat {label}, expected row-seat")
+    if not (1 <= row <= row_count and 1 <= seat <= seats_per_row):
+        frappe.throw(f"Seat {label} is not in this section")
+    return (row - 1) * seats_per_row + seat - 1
+
+
+def parse_seats(seats):
+    """Seats as a list or comma separated string of labels"""
+    if isinstance(seats, str):
+        seats = frappe.parse_json(seats) if seats.startswith("[") else seats.split(",")
+    return [str(seat).strip() for seat in seats or [] if str(seat).strip()]
+
+
+def seat_mask(section, labels):
+    mask = 0
+    for label in labels:
+        mask |= 1 << seat_index(label, section.row_count, section.seats_per_row)
+    return mask
+
+
+def lock_section(section_name):
+    """Load a section's layout and bitmaps under a row lock"""
+    section = frappe.db.sql(
+        """
+        SELECT name, event, ticket, row_count, seats_per_row, seat_count, held_bitmap, sold_bitmap
+        FROM `tabSeat Map Section`
+        WHERE name = %s
+        FOR UPDATE
+        """,
+        (section_name,),
+        as_dict=True
+    )
+    if not section:
+        frappe.throw(f"Seat Map Section {section_name} does not exist")
+    section = section[0]
+    section.held = decode_bitmap(section.held_bitmap)
+    section.sold = decode_bitmap(section.sold_bitmap)
+    return section
+
+
+def save_section_state(section):
+    """Write a locked section's bitmaps and seat counters in one UPDATE"""
+    state = seat_state(section.held, section.sold, section.seat_count)
+    frappe.db.sql(
+        """
+        UPDATE `tabSeat Map Section`
+        SET held_bitmap = %(held_bitmap)s, sold_bitmap = %(sold_bitmap)s,
+            held_seats = %(held_seats)s, sold_seats = %(sold_seats)s,
+            available_seats = %(available_seats)s, modified = %(modified)s
+        WHERE name = %(name)s
+        """,
+        dict(state, name=section.name, modified=now())
+    )
+    return state
+
+
+def hold_section_seats(section_name, labels):
+    """Mark free seats as held; throws if any of them is taken or listed twice"""
+    section = lock_section(section_name)
+    mask = seat_mask(section, labels)
+    if mask.bit_count() != len(labels):
+        frappe.throw("Each seat can only be listed once")
+    taken = (section.held | section.sold) & mask
+    if taken:
+        frappe.throw(f"Seats {', '.join(mask_labels(taken, section.seats_per_row))} are not available")
+    section.held |= mask
+    save_section_state(section)
+    return section
+
+
+def release_held_seats(section_name, labels):
+    """Free seats of an expired or cancelled hold"""
+    section = lock_section(section_name)
+    section.held &= ~seat_mask(section, labels)
+    save_section_state(section)
+
+
+def sell_held_seats(section_name, labels):
+    """Turn held seats into sold ones when their hold becomes a sale"""
+    section = lock_section(section_name)
+    mask = seat_mask(section, labels)
+    section.held &= ~mask
+    section.sold |= mask
+    save_section_state(section)
+
+
+def release_sold_seats(section_name, labels):
+    """Free the seats of a cancelled or deleted sale"""
+    section = lock_section(section_name)
+    section.sold &= ~seat_mask(section, labels)
+    save_section_state(section)
+
+
+def mask_labels(mask, seats_per_row):
+    labels = []
+    index = 0
+    while mask:
+        if mask & 1:
+            labels.append(seat_label(index, seats_per_row))
+        mask >>= 1
+        index += 1
+    return labels
+
+
+def find_best_block(section, count):
+    """Return the best free block of `count` adjacent seats in one row, or None.
+
+    Rows nearer the front win; within a row, the block closest to the centre.
+    Full rows are skipped with a single comparison.
+    """
+    seats_per_row = cint(section.seats_per_row)
+    if count <= 0 or count > seats_per_row:
+        return None
+
+    row_mask = (1 << seats_per_row) - 1
+    block_mask = (1 << count) - 1
+    taken = section.held | section.sold
+    centre = (seats_per_row - count) / 2
+
+    for row in range(cint(section.row_count)):
+        row_taken = (taken >> (row * seats_per_row)) & row_mask
+        if row_taken == row_mask:
+            continue
+        starts = [
+            start for start in range(seats_per_row - count + 1)
+            if not (row_taken >> start) & block_mask
+        ]
+        if starts:
+            start = min(starts, key=lambda start: abs(start - centre))
+            first = row * seats_per_row + start
+            return [seat_label(index, seats_per_row) for index in range(first, first + count)]
+    return None
@@ -0,0 +1,132 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+from datetime import datetime, timedelta
+from event_management.event_management.doctype.seat_map_section.seat_map_section import (
+    decode_bitmap,
+    encode_bitmap
+)
+from event_management.event_management.doctype.ticket_hold.ticket_hold import release_expired_holds
+from event_management.event_management.seating import get_seat_summary, hold_seats
+
+
+class TestSeatMapSection(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Seating",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        self.ticket = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "Stalls",
+            "price": 50.00,
+            "quantity": 15
+        })
+        self.ticket.insert(ignore_if_duplicate=True)
+
+        self.section = frappe.get_doc({
+            "doctype": "Seat Map Section",
+            "event": self.event.name,
+            "ticket": self.ticket.name,
+            "section_name": "Stalls",
+            "row_count": 3,
+            "seats_per_row": 5
+        })
+        self.section.insert()
+
+    def test_bitmap_round_trip(self):
+        """Test that bitmaps survive encoding"""
+        bits = (1 << 0) | (1 << 9) | (1 << 14)
+        self.assertEqual(decode_bitmap(encode_bitmap(bits, 15)), bits)
+        self.assertEqual(self.section.available_seats, 15)
+
+    def test_best_available_block(self):
+        """Test that blocks go to the front row centre and never overlap"""
+        first = hold_seats(self.section.name, count=3)
+        self.assertEqual(first["seats"], ["1-2", "1-3", "1-4"])
+
+        second = hold_seats(self.section.name, count=3)
+        self.assertEqual(second["seats"], ["2-2", "2-3", "2-4"])
+
+        with self.assertRaises(frappe.ValidationError):
+            hold_seats(self.section.name, seats="1-4,1-5")
+
+        summary = get_seat_summary(self.event.name)
+        self.assertEqual(summary["sections"][0].held_seats, 6)
+        self.assertEqual(summary["available_seats"], 9)
+
+    def test_repeated_seat_is_rejected(self):
+        """Test that a seat listed twice is refused instead of holding extra stock"""
+        with self.assertRaises(frappe.ValidationError):
+            hold_seats(self.section.name, seats="1-1,1-1")
+
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 15)
+
+    def test_seated_ticket_needs_seats(self):
+        """Test that a seated ticket is only sold through seat holds and keeps its quantity"""
+        from event_management.event_management.checkout import checkout
+        from event_management.event_management.doctype.ticket_hold.ticket_hold import create_hold
+
+        with self.assertRaises(frappe.ValidationError):
+            frappe.get_doc({
+                "doctype": "Ticket Sales",
+                "ticket": self.ticket.name,
+                "event": self.event.name,
+                "quantity": 1
+            }).insert()
+        with self.assertRaises(frappe.ValidationError):
+            create_hold(self.ticket.name, 1)
+        with self.assertRaises(frappe.ValidationError):
+            checkout(self.event.name, [{"ticket": self.ticket.name, "quantity": 1}])
+
+        self.ticket.reload()
+        self.ticket.quantity = 20
+        with self.assertRaises(frappe.ValidationError):
+            self.ticket.save()
+
+        self.section.reload()
+        self.section.row_count = 4
+        with self.assertRaises(frappe.ValidationError):
+            self.section.save()
+
+    def test_sale_and_expiry(self):
+        """Test that a sale keeps its seats and an expired hold frees them"""
+        sold = hold_seats(self.section.name, seats=["3-1", "3-2"])
+        frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": self.ticket.name,
+            "event": self.event.name,
+            "quantity": 2,
+            "ticket_hold": sold["hold_id"]
+        }).insert()
+
+        expired = hold_seats(self.section.name, seats=["3-3"])
+        frappe.db.set_value(
+            "Ticket Hold", expired["hold_id"], "expires_at", add_to_date(now_datetime(), seconds=-1)
+        )
+        release_expired_holds()
+
+        self.section.reload()
+        self.assertEqual((self.section.sold_seats, self.section.held_seats), (2, 0))
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 13)
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Sales Rollup", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Hold", filters={"event": self.event.name})
+        frappe.db.delete("Seat Map Section", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Seating"})
+        frappe.db.commit()
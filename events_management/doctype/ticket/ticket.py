@@ -1,22 +1,34 @@
 import frappe
 from frappe.model.document import Document
+from frappe.utils import cint
+from event_management.event_management.admission import clear_sold_out
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.doc_cache import invalidate_request_doc
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import (
+    delete_rollup
+)
 
 
 class Ticket(Document):
+    @profiled()
     def validate(self):
         """Validate ticket data"""
         self.validate_price()
         self.validate_quantity()
+        self.validate_seat_map_quantity()
         self.update_available_quantity()
 
-    def on_update(self):
-        """Update available quantity on update"""
-        self.update_available_quantity()
+    @profiled()
+    def on_trash(self):
+        """Remove the ticket's sales rollup row"""
+        delete_rollup({"ticket": self.name})
 
+    @profiled()
     def on_submit(self):
         """Handle stock deduction on submit"""
         self.deduct_stock()
 
+    @profiled()
     def before_cancel(self):
         """Revert stock on cancel"""
         self.revert_stock()
@@ -31,16 +43,36 @@ class Ticket(Document):
         if self.quantity <= 0:
             frappe.throw("Ticket quantity must be greater than 0")
 
+    def validate_seat_map_quantity(self):
+        """Keep the quantity of a seated ticket equal to its section's seat count"""
+        if self.is_new():
+            return
+        section = frappe.db.get_value(
+            "Seat Map Section", {"ticket": self.name}, ["name", "seat_count"], as_dict=True
+        )
+        if section and cint(section.seat_count) != cint(self.quantity):
+            frappe.throw(
+                f"Ticket {self.name} is sold through Seat Map Section {section.name}; "
+                f"its quantity must stay {section.seat_count}"
+            )
+
     def update_available_quantity(self):
-        """Update available quantity based on ticket sales"""
-        sold_quantity = frappe.db.sum(
-            "Ticket Sales",
-            "quantity",
-            {"ticket": self.name}
-        ) or 0
-        self.available_quantity = self.quantity - sold_quantity
-        if self.available_quantity < 0:
-            self.available_quantity = 0
+        """Start available quantity at the full quantity and shift it by quantity edits.
+
+        Sales and holds move available_quantity with conditional UPDATEs, so a
+        saved ticket re-reads it under a row lock and applies only the change
+        in quantity on top.
+        """
+        if self.is_new():
+            self.available_quantity = self.quantity
+            return
+
+        stored = frappe.db.get_value(
+            "Ticket", self.name, ["quantity", "available_quantity"], as_dict=True, for_update=True
+        )
+        self.available_quantity = max(
+            cint(stored.available_quantity) + cint(self.quantity) - cint(stored.quantity), 0
+        )
 
     def deduct_stock(self):
         """Deduct stock from ticket sales"""
@@ -49,3 +81,46 @@ class Ticket(Document):
     def revert_stock(self):
         """Revert stock when ticket is cancelled"""
         frappe.msgprint(f"Stock reverted for ticket {self.name}")
+
+
+def on_doctype_update():
+    """Add composite indexes for the event filters used by ticket listings"""
+    frappe.db.add_index("Ticket", ["event", "creation"])
+
+
+def reserve_stock(ticket_name, quantity):
+    """Take quantity from a ticket's stock with a single conditional decrement.
+
+    Runs inside the caller's transaction, so concurrent sales serialize on the
+    Ticket row and can never push available_quantity below zero. The join
+    share-locks the Event row, so no stock is taken once the event is being
+    archived. Returns False when not enough stock is left or the event is
+    archived.
+    """
+    frappe.db.sql(
+        """
+        UPDATE `tabTicket` t
+        JOIN `tabEvent` e ON e.name = t.event
+        SET t.available_quantity = t.available_quantity - %(quantity)s
+        WHERE t.name = %(ticket)s
+            AND t.available_quantity >= %(quantity)s
+            AND IFNULL(e.is_archived, 0) = 0
+        """,
+        {"ticket": ticket_name, "quantity": quantity}
+    )
+    invalidate_request_doc("Ticket", ticket_name, ["available_quantity"])
+    return frappe.db._cursor.rowcount > 0
+
+
+def release_stock(ticket_name, quantity):
+    """Return quantity to a ticket's stock, never exceeding the ticket quantity"""
+    frappe.db.sql(
+        """
+        UPDATE `tabTicket`
+        SET available_quantity = LEAST(available_quantity + %(quantity)s, quantity)
+        WHERE name = %(ticket)s
+        """,
+        {"ticket": ticket_name, "quantity": quantity}
+    )
+    invalidate_request_doc("Ticket", ticket_name, ["available_quantity"])
+    clear_sold_out("ticket", ticket_name)
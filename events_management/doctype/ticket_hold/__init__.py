@@ -0,0 +1,3 @@
+from event_management.event_management.doctype.ticket_hold.ticket_hold import TicketHold
+
+__all__ = ["TicketHold"]
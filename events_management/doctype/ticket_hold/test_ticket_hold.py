@@ -0,0 +1,120 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+from datetime import datetime, timedelta
+from event_management.event_management.doctype.ticket_hold.ticket_hold import (
+    create_hold,
+    release_expired_holds
+)
+
+
+class TestTicketHold(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        # Create test event
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Holds",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        # Create test ticket
+        self.ticket = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "General",
+            "price": 20.00,
+            "quantity": 10
+        })
+        self.ticket.insert(ignore_if_duplicate=True)
+
+    def test_hold_reserves_stock(self):
+        """Test that a hold takes stock and blocks overselling"""
+        create_hold(self.ticket.name, 8)
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 2)
+
+        with self.assertRaises(frappe.ValidationError):
+            create_hold(self.ticket.name, 3)
+
+    def test_sale_consumes_hold(self):
+        """Test that a sale against a hold does not deduct stock twice"""
+        hold = create_hold(self.ticket.name, 4)
+        sale = frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": self.ticket.name,
+            "event": self.event.name,
+            "quantity": 4,
+            "ticket_hold": hold.name
+        })
+        sale.insert()
+
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 6)
+        self.assertFalse(frappe.db.exists("Ticket Hold", hold.name))
+
+    def test_sale_from_hold_can_be_saved_again(self):
+        """Test that a sale still saves after its hold has been consumed"""
+        hold = create_hold(self.ticket.name, 2)
+        sale = frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": self.ticket.name,
+            "event": self.event.name,
+            "quantity": 2,
+            "ticket_hold": hold.name
+        })
+        sale.insert()
+
+        sale.reload()
+        sale.quantity = 3
+        sale.save()
+
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 7)
+
+    def test_expired_hold_is_released(self):
+        """Test that expired holds return their stock"""
+        hold = create_hold(self.ticket.name, 5)
+        frappe.db.set_value(
+            "Ticket Hold", hold.name, "expires_at", add_to_date(now_datetime(), seconds=-1)
+        )
+
+        self.assertEqual(release_expired_holds(), 1)
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 10)
+
+        expired_sale = frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": self.ticket.name,
+            "event": self.event.name,
+            "quantity": 5,
+            "ticket_hold": hold.name
+        })
+        with self.assertRaises(frappe.ValidationError):
+            expired_sale.insert()
+
+    def test_deleted_hold_is_released(self):
+        """Test that deleting a hold returns its stock and a ticket save keeps other holds"""
+        hold = create_hold(self.ticket.name, 3)
+        create_hold(self.ticket.name, 2)
+
+        self.ticket.reload()
+        self.ticket.quantity = 12
+        self.ticket.save()
+        self.assertEqual(self.ticket.available_quantity, 7)
+
+        frappe.delete_doc("Ticket Hold", hold.name)
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 10)
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Hold", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Holds"})
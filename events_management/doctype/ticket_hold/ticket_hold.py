@@ -0,0 +1,114 @@
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_to_date, now_datetime
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.cache import INVALIDATES, invalidate_event_cache
+from event_management.event_management.doctype.seat_map_section.seat_map_section import (
+    parse_seats,
+    release_held_seats,
+    validate_unseated
+)
+from event_management.event_management.doctype.ticket.ticket import (
+    reserve_stock,
+    release_stock
+)
+
+HOLD_TTL_SECONDS = 600
+
+
+class TicketHold(Document):
+    @profiled()
+    def validate(self):
+        """Validate ticket hold data"""
+        self.validate_quantity()
+        if self.is_new():
+            if not self.seat_map_section:
+                validate_unseated(self.ticket)
+            self.reserve_held_stock()
+
+    @profiled()
+    def on_trash(self):
+        """Return the held seats and stock when a hold is deleted as a document"""
+        if self.seat_map_section:
+            release_held_seats(self.seat_map_section, parse_seats(self.seats))
+        release_stock(self.ticket, self.quantity)
+        invalidate_event_cache(self.event, INVALIDATES["Ticket Hold"])
+
+    def validate_quantity(self):
+        """Ensure quantity is positive"""
+        if self.quantity <= 0:
+            frappe.throw("Ticket quantity must be greater than 0")
+
+    def reserve_held_stock(self):
+        """Take the held quantity out of the ticket's stock and stamp the expiry"""
+        if not reserve_stock(self.ticket, self.quantity):
+            available_quantity = frappe.db.get_value("Ticket", self.ticket, "available_quantity")
+            frappe.throw(
+                f"Only {available_quantity} tickets available for {self.ticket}"
+            )
+        if not self.expires_at:
+            self.expires_at = add_to_date(now_datetime(), seconds=HOLD_TTL_SECONDS)
+
+
+def create_hold(ticket_name, quantity, ttl=HOLD_TTL_SECONDS, seat_map_section=None, seats=None):
+    """Hold tickets for a short time while the buyer completes checkout"""
+    hold = frappe.get_doc({
+        "doctype": "Ticket Hold",
+        "ticket": ticket_name,
+        "event": frappe.db.get_value("Ticket", ticket_name, "event"),
+        "quantity": quantity,
+        "expires_at": add_to_date(now_datetime(), seconds=ttl),
+        "seat_map_section": seat_map_section,
+        "seats": seats
+    })
+    hold.insert(ignore_permissions=True)
+    return hold
+
+
+def consume_hold(hold_name, ticket_name, quantity):
+    """Turn an unexpired hold into a sale without touching the ticket's stock again.
+
+    The hold row is deleted with a single conditional DELETE, so a hold can be
+    consumed or expired exactly once. Returns False if the hold is gone,
+    expired or does not match the sale.
+    """
+    frappe.db.sql(
+        """
+        DELETE FROM `tabTicket Hold`
+        WHERE name = %(hold)s
+            AND ticket = %(ticket)s
+            AND quantity = %(quantity)s
+            AND expires_at > %(now)s
+        """,
+        {"hold": hold_name, "ticket": ticket_name, "quantity": quantity, "now": now_datetime()}
+    )
+    return frappe.db._cursor.rowcount > 0
+
+
+def release_expired_holds(limit=1000):
+    """Return the stock of expired holds to their tickets"""
+    now = now_datetime()
+    expired = frappe.get_all(
+        "Ticket Hold",
+        filters={"expires_at": ("<=", now)},
+        fields=["name", "ticket", "event", "quantity", "seat_map_section", "seats"],
+        order_by="expires_at asc",
+        limit=limit
+    )
+
+    released = 0
+    for hold in expired:
+        frappe.db.sql(
+            "DELETE FROM `tabTicket Hold` WHERE name = %s AND expires_at <= %s",
+            (hold.name, now)
+        )
+        # a concurrent checkout may have consumed the hold in the meantime
+        if frappe.db._cursor.rowcount:
+            if hold.seat_map_section:
+                release_held_seats(hold.seat_map_section, parse_seats(hold.seats))
+            release_stock(hold.ticket, hold.quantity)
+            released += 1
+            invalidate_event_cache(hold.event, INVALIDATES["Ticket Hold"])
+
+    frappe.db.commit()
+    return released
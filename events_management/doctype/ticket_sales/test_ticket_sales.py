@@ -86,6 +86,76 @@ class TestTicketSales(FrappeTestCase):
         sales.insert(ignore_if_duplicate=True)
         self.assertEqual(sales.total_amount, 500.00)  # 5 * 100
 
+    def test_checkout_basket(self):
+        """Test that a multi-line checkout sells every line with one total"""
+        from event_management.event_management.checkout import checkout
+
+        general = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "General",
+            "price": 20.00,
+            "quantity": 10
+        })
+        general.insert()
+
+        order = checkout(self.event.name, [
+            {"ticket": self.ticket.name, "quantity": 2},
+            {"ticket": general.name, "quantity": 3}
+        ])
+        self.assertEqual(len(order["sale_ids"]), 2)
+        self.assertEqual(order["total_amount"], 260.00)  # 2 * 100 + 3 * 20
+
+        general.reload()
+        self.assertEqual(general.available_quantity, 7)
+
+    def test_checkout_is_all_or_nothing(self):
+        """Test that one short line leaves every ticket's stock untouched"""
+        from event_management.event_management.checkout import checkout
+
+        general = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "General",
+            "price": 20.00,
+            "quantity": 1
+        })
+        general.insert()
+
+        with self.assertRaises(frappe.ValidationError):
+            checkout(self.event.name, [
+                {"ticket": self.ticket.name, "quantity": 2},
+                {"ticket": general.name, "quantity": 3}
+            ])
+
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 50)
+        self.assertFalse(frappe.db.exists("Ticket Sales", {"event": self.event.name}))
+
+    def test_box_office_import(self):
+        """Test that a box-office file is imported once, with rejects reported"""
+        import io
+        from event_management.event_management.box_office import import_sales, iter_sales_records
+
+        content = (
+            "reference,ticket,quantity,price\n"
+            f"BO-1,{self.ticket.name},2,100\n"
+            f"BO-1,{self.ticket.name},1,100\n"
+            f"BO-2,{self.ticket.name},1,80\n"
+            f"BO-3,{self.ticket.name},3,\n"
+        ).encode()
+
+        result = import_sales(iter_sales_records(io.BytesIO(content), ".csv"), "Test Box Office")
+        self.assertEqual(result["imported"], 2)
+        self.assertEqual([reject["line"] for reject in result["rejects"]], [3, 4])
+
+        self.ticket.reload()
+        self.assertEqual(self.ticket.available_quantity, 45)
+
+        again = import_sales(iter_sales_records(io.BytesIO(content), ".csv"), "Test Box Office")
+        self.assertEqual(again["imported"], 0)
+        self.assertEqual(again["rejected"], 4)
+
     def tearDown(self):
         """Clean up test data"""
         frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
@@ -1,48 +1,155 @@
 import frappe
 from frappe.model.document import Document
+from event_management.event_management.archive import is_archived
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.doc_cache import get_request_value
+from event_management.event_management.doctype.seat_map_section.seat_map_section import (
+    parse_seats,
+    release_sold_seats,
+    sell_held_seats,
+    validate_unseated
+)
+from event_management.event_management.doctype.ticket.ticket import (
+    reserve_stock,
+    release_stock
+)
+from event_management.event_management.doctype.ticket_hold.ticket_hold import consume_hold
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import (
+    apply_sale,
+    apply_sales
+)
 
 
 class TicketSales(Document):
+    @profiled()
     def validate(self):
         """Validate ticket sales data"""
         self.validate_quantity()
+        self.validate_event_not_archived()
         self.validate_ticket_availability()
         self.calculate_total_amount()
 
-    def on_submit(self):
-        """Handle stock deduction on submit"""
-        self.deduct_stock()
+    @profiled()
+    def on_update(self):
+        """Add the sale to its ticket's sales rollup"""
+        self.update_sales_rollup()
 
+    @profiled()
     def before_cancel(self):
         """Revert stock on cancel"""
+        self.release_seats()
         self.revert_stock()
+        apply_sale(self.ticket, self.event, -self.quantity, -(self.total_amount or 0))
+
+    @profiled()
+    def on_trash(self):
+        """Return stock when a draft sale is deleted"""
+        if self.docstatus == 0:
+            self.release_seats()
+            self.revert_stock()
+            apply_sale(self.ticket, self.event, -self.quantity, -(self.total_amount or 0))
 
     def validate_quantity(self):
         """Ensure quantity is positive"""
         if self.quantity <= 0:
             frappe.throw("Ticket quantity must be greater than 0")
 
+    def validate_event_not_archived(self):
+        """Sales of archived events would land outside the archive tables"""
+        if is_archived(self.event):
+            frappe.throw(f"Event {self.event} is archived")
+
     def validate_ticket_availability(self):
-        """Ensure ticket has available quantity"""
-        ticket = frappe.get_doc("Ticket", self.ticket)
-        if ticket.available_quantity < self.quantity:
+        """Reserve the requested quantity from the ticket's stock"""
+        if self.is_new():
+            if self.flags.stock_reserved:
+                return
+            if self.ticket_hold:
+                self.consume_ticket_hold()
+            else:
+                validate_unseated(self.ticket)
+                if not reserve_stock(self.ticket, self.quantity):
+                    self.throw_unavailable()
+            self.flags.stock_reserved = True
+            return
+
+        previous = self.get_doc_before_save()
+        if not previous:
+            return
+        if self.seat_map_section and (previous.ticket, previous.quantity) != (self.ticket, self.quantity):
+            frappe.throw("The ticket and quantity of a sale with seats cannot be changed")
+        if previous.ticket != self.ticket:
+            validate_unseated(self.ticket)
+            release_stock(previous.ticket, previous.quantity)
+            if not reserve_stock(self.ticket, self.quantity):
+                self.throw_unavailable()
+        elif self.quantity > previous.quantity:
+            if not reserve_stock(self.ticket, self.quantity - previous.quantity):
+                self.throw_unavailable()
+        elif self.quantity < previous.quantity:
+            release_stock(self.ticket, previous.quantity - self.quantity)
+
+    def consume_ticket_hold(self):
+        """Complete the sale from a hold, taking over any seats it held"""
+        seating = frappe.db.get_value(
+            "Ticket Hold", self.ticket_hold, ["seat_map_section", "seats"], as_dict=True
+        )
+        if not consume_hold(self.ticket_hold, self.ticket, self.quantity):
             frappe.throw(
-                f"Only {ticket.available_quantity} tickets available for {self.ticket}"
+                f"Ticket hold {self.ticket_hold} has expired or does not match this sale"
             )
+        if seating and seating.seat_map_section:
+            sell_held_seats(seating.seat_map_section, parse_seats(seating.seats))
+            self.seat_map_section = seating.seat_map_section
+            self.seats = seating.seats
+
+    def release_seats(self):
+        """Free the seats of a cancelled or deleted sale"""
+        if self.seat_map_section:
+            release_sold_seats(self.seat_map_section, parse_seats(self.seats))
+
+    def throw_unavailable(self):
+        """Report how many tickets are left after a failed reservation"""
+        available_quantity = frappe.db.get_value("Ticket", self.ticket, "available_quantity")
+        frappe.throw(
+            f"Only {available_quantity} tickets available for {self.ticket}"
+        )
 
     def calculate_total_amount(self):
         """Calculate total amount based on ticket price and quantity"""
-        ticket = frappe.get_doc("Ticket", self.ticket)
+        ticket = get_request_value("Ticket", self.ticket, "price")
         self.total_amount = ticket.price * self.quantity
 
-    def deduct_stock(self):
-        """Deduct stock from ticket availability"""
-        ticket = frappe.get_doc("Ticket", self.ticket)
-        ticket.update_available_quantity()
-        ticket.save(ignore_permissions=True)
+    def update_sales_rollup(self):
+        """Apply the change in quantity and amount since the last save to the rollup"""
+        previous = self.get_doc_before_save()
+        if not previous:
+            apply_sale(self.ticket, self.event, self.quantity, self.total_amount)
+            return
+
+        if (previous.ticket, previous.event) != (self.ticket, self.event):
+            apply_sales([
+                (previous.ticket, previous.event, -previous.quantity, -(previous.total_amount or 0)),
+                (self.ticket, self.event, self.quantity, self.total_amount)
+            ])
+        elif (previous.quantity, previous.total_amount) != (self.quantity, self.total_amount):
+            apply_sale(
+                self.ticket,
+                self.event,
+                self.quantity - previous.quantity,
+                (self.total_amount or 0) - (previous.total_amount or 0)
+            )
 
     def revert_stock(self):
         """Revert stock when ticket sales is cancelled"""
-        ticket = frappe.get_doc("Ticket", self.ticket)
-        ticket.update_available_quantity()
-        ticket.save(ignore_permissions=True)
+        release_stock(self.ticket, self.quantity)
+
+
+def on_doctype_update():
+    """Add composite indexes for the event filters used by reports, and keep
+    box-office sales from being imported twice"""
+    frappe.db.add_index("Ticket Sales", ["event", "creation"])
+    frappe.db.add_unique(
+        "Ticket Sales", ["box_office", "external_reference"],
+        constraint_name="unique_box_office_reference"
+    )
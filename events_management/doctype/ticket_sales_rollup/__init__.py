@@ -0,0 +1,3 @@
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import TicketSalesRollup
+
+__all__ = ["TicketSalesRollup"]
@@ -0,0 +1,88 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import (
+    rebuild_rollup
+)
+
+
+class TestTicketSalesRollup(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        # Create test event
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Rollup",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        # Create test ticket
+        self.ticket = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "VIP",
+            "price": 100.00,
+            "quantity": 50
+        })
+        self.ticket.insert(ignore_if_duplicate=True)
+
+    def make_sale(self, quantity):
+        sale = frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": self.ticket.name,
+            "event": self.event.name,
+            "quantity": quantity
+        })
+        sale.insert()
+        return sale
+
+    def get_rollup(self):
+        return frappe.db.get_value(
+            "Ticket Sales Rollup", self.ticket.name, ["quantity_sold", "revenue"], as_dict=True
+        )
+
+    def test_rollup_follows_sales(self):
+        """Test that inserts, edits and deletes keep the rollup in step"""
+        sale = self.make_sale(3)
+        self.make_sale(2)
+        self.assertEqual(self.get_rollup(), {"quantity_sold": 5, "revenue": 500.00})
+
+        sale.quantity = 1
+        sale.save()
+        self.assertEqual(self.get_rollup(), {"quantity_sold": 3, "revenue": 300.00})
+
+        frappe.delete_doc("Ticket Sales", sale.name)
+        self.assertEqual(self.get_rollup(), {"quantity_sold": 2, "revenue": 200.00})
+
+    def test_emptied_rollup_allows_ticket_delete(self):
+        """Test that a rollup row is removed once its sales are gone"""
+        sale = self.make_sale(2)
+        frappe.delete_doc("Ticket Sales", sale.name)
+        self.assertIsNone(self.get_rollup())
+
+        self.make_sale(1)
+        frappe.db.delete("Ticket Sales", filters={"ticket": self.ticket.name})
+        frappe.delete_doc("Ticket", self.ticket.name)
+        self.assertIsNone(self.get_rollup())
+
+    def test_rebuild_rollup(self):
+        """Test that a rebuild restores drifted rollup rows"""
+        self.make_sale(4)
+        frappe.db.set_value(
+            "Ticket Sales Rollup", self.ticket.name, {"quantity_sold": 0, "revenue": 0}
+        )
+
+        rebuild_rollup(self.event.name)
+        self.assertEqual(self.get_rollup(), {"quantity_sold": 4, "revenue": 400.00})
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Ticket Sales Rollup", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Rollup"})
@@ -0,0 +1,87 @@
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now
+
+
+class TicketSalesRollup(Document):
+    pass
+
+
+def apply_sale(ticket_name, event_name, quantity, revenue):
+    """Add a sale's quantity and revenue (negative to remove it) to its ticket's rollup row"""
+    apply_sales([(ticket_name, event_name, quantity, revenue)])
+
+
+def apply_sales(deltas):
+    """Upsert (ticket, event, quantity, revenue) deltas with one multi-row statement"""
+    if not deltas:
+        return
+
+    timestamp = now()
+    user = frappe.session.user
+    rows = []
+    values = []
+    for ticket_name, event_name, quantity, revenue in deltas:
+        rows.append("(%s, %s, %s, %s, %s, %s, %s, %s, %s, 0, 0)")
+        values.extend([
+            ticket_name, ticket_name, event_name, quantity, revenue or 0,
+            timestamp, timestamp, user, user
+        ])
+
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabTicket Sales Rollup`
+            (name, ticket, event, quantity_sold, revenue,
+             creation, modified, owner, modified_by, docstatus, idx)
+        VALUES {", ".join(rows)}
+        ON DUPLICATE KEY UPDATE
+            quantity_sold = quantity_sold + VALUES(quantity_sold),
+            revenue = revenue + VALUES(revenue),
+            modified = VALUES(modified)
+        """,
+        values
+    )
+
+    # rows that drop back to nothing are removed, so their Link fields don't
+    # keep the ticket and event from being deleted
+    emptied = [ticket_name for ticket_name, _, quantity, _ in deltas if quantity < 0]
+    if emptied:
+        frappe.db.sql(
+            """
+            DELETE FROM `tabTicket Sales Rollup`
+            WHERE name IN %(names)s AND quantity_sold <= 0 AND revenue = 0
+            """,
+            {"names": emptied}
+        )
+
+
+def delete_rollup(filters):
+    """on_trash helper: drop rollup rows before Frappe checks the links to a ticket or event"""
+    frappe.db.delete("Ticket Sales Rollup", filters)
+
+
+def rebuild_rollup(event_name=None):
+    """Recompute rollup rows from Ticket Sales, for one event or all of them"""
+    # rollups of archived events are kept as they were; their sales have left
+    # the hot table
+    conditions = "AND event NOT IN (SELECT name FROM `tabEvent` WHERE is_archived = 1)"
+    if event_name:
+        conditions += " AND event = %(event)s"
+    frappe.db.sql(
+        f"DELETE FROM `tabTicket Sales Rollup` WHERE 1 = 1 {conditions}",
+        {"event": event_name}
+    )
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabTicket Sales Rollup`
+            (name, ticket, event, quantity_sold, revenue,
+             creation, modified, owner, modified_by, docstatus, idx)
+        SELECT
+            ticket, ticket, event, SUM(quantity), IFNULL(SUM(total_amount), 0),
+            %(now)s, %(now)s, %(user)s, %(user)s, 0, 0
+        FROM `tabTicket Sales`
+        WHERE docstatus < 2 {conditions}
+        GROUP BY ticket, event
+        """,
+        {"event": event_name, "now": now(), "user": frappe.session.user}
+    )
@@ -0,0 +1,3 @@
+from event_management.event_management.doctype.waitlist_entry.waitlist_entry import WaitlistEntry
+
+__all__ = ["WaitlistEntry"]
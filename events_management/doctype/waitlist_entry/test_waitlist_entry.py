@@ -0,0 +1,76 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management.doctype.waitlist_entry.waitlist_entry import (
+    join_waitlist,
+    promote_waitlist
+)
+
+
+class TestWaitlistEntry(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        # Create a sold-out event
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Waitlist",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 1
+        })
+        self.event.insert(ignore_if_duplicate=True)
+        frappe.get_doc({
+            "doctype": "Attendee",
+            "attendee_name": "First Guest",
+            "email": "first@example.com",
+            "event": self.event.name
+        }).insert()
+
+    def test_join_is_idempotent(self):
+        """Test that retrying a sold-out registration keeps one place in the queue"""
+        first = join_waitlist(self.event.name, "Waiting Guest", "wait@example.com")
+        retry = join_waitlist(self.event.name, "Waiting Guest", "wait@example.com")
+        second = join_waitlist(self.event.name, "Later Guest", "later@example.com")
+
+        self.assertEqual(first, retry)
+        self.assertEqual(first["position"], 1)
+        self.assertEqual(second["position"], 2)
+
+    def test_join_matches_normalized_email(self):
+        """Test that case variants of an email share one waitlist entry"""
+        first = join_waitlist(self.event.name, "Waiting Guest", "wait@example.com")
+        variant = join_waitlist(self.event.name, "Waiting Guest", " Wait@Example.com")
+        self.assertEqual(first, variant)
+
+    def test_registered_email_is_not_waitlisted(self):
+        """Test that an email already registered for the event cannot join the waitlist"""
+        with self.assertRaises(frappe.ValidationError):
+            join_waitlist(self.event.name, "First Guest", "FIRST@example.com")
+
+    def test_promotion_in_fifo_order(self):
+        """Test that freed capacity goes to the longest waiting entries"""
+        first = join_waitlist(self.event.name, "Waiting Guest", "wait@example.com")
+        second = join_waitlist(self.event.name, "Later Guest", "later@example.com")
+
+        self.event.reload()
+        self.event.capacity = 2
+        self.event.save()
+        self.assertEqual(promote_waitlist(self.event.name), 1)
+
+        self.assertEqual(
+            frappe.db.get_value("Waitlist Entry", first["waitlist_id"], "status"), "Promoted"
+        )
+        self.assertEqual(
+            frappe.db.get_value("Waitlist Entry", second["waitlist_id"], "status"), "Waiting"
+        )
+        self.assertTrue(frappe.db.exists(
+            "Attendee", {"event": self.event.name, "email": "wait@example.com"}
+        ))
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Waitlist Entry", filters={"event": self.event.name})
+        frappe.db.delete("Attendee", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Waitlist"})
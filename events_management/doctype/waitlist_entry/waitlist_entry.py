@@ -0,0 +1,189 @@
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint, now_datetime, validate_email_address
+from event_management.event_management.dedupe import normalize_email
+from event_management.event_management.doc_cache import get_request_value
+from event_management.event_management.instrumentation import profiled
+
+PROMOTION_BATCH_SIZE = 100
+
+
+class WaitlistEntry(Document):
+    @profiled()
+    def validate(self):
+        """Validate waitlist entry data"""
+        self.email = (self.email or "").strip()
+        self.email_normalized = normalize_email(self.email)
+        if self.is_new():
+            self.validate_registration()
+        self.validate_duplicate_entry()
+
+    def validate_registration(self):
+        """Only queue registrations that would be accepted once a ticket frees up"""
+        validate_email_address(self.email, throw=True)
+        event = get_request_value("Event", self.event, "is_archived")
+        if not event:
+            frappe.throw(f"Event {self.event} does not exist")
+        if event.is_archived:
+            frappe.throw(f"Event {self.event} is archived")
+        if frappe.db.exists("Attendee", {"event": self.event, "email_normalized": self.email_normalized}):
+            frappe.throw(f"Attendee with email {self.email} is already registered for this event")
+
+    def validate_duplicate_entry(self):
+        """Keep a single waiting entry per email and event"""
+        existing = frappe.db.exists(
+            "Waitlist Entry",
+            {
+                "event": self.event,
+                "email_normalized": self.email_normalized,
+                "status": "Waiting",
+                "name": ("!=", self.name)
+            }
+        )
+        if existing and self.status == "Waiting":
+            frappe.throw(f"{self.email} is already on the waitlist for this event")
+
+
+def join_waitlist(event_name, attendee_name, email, phone=None):
+    """Queue a registration for a sold-out event.
+
+    Idempotent per email, so clients retrying a sold-out registration keep
+    their place instead of piling up entries. Returns the entry and its
+    1-based position in the queue.
+    """
+    email = (email or "").strip()
+    entry = frappe.db.get_value(
+        "Waitlist Entry",
+        {"event": event_name, "email_normalized": normalize_email(email), "status": "Waiting"},
+        ["name", "creation"],
+        as_dict=True
+    )
+    if not entry:
+        entry = frappe.get_doc({
+            "doctype": "Waitlist Entry",
+            "event": event_name,
+            "attendee_name": attendee_name,
+            "email": email,
+            "phone": phone
+        }).insert(ignore_permissions=True)
+
+    position = frappe.db.count(
+        "Waitlist Entry",
+        {"event": event_name, "status": "Waiting", "creation": ("<=", entry.creation)}
+    )
+    return {"waitlist_id": entry.name, "position": position}
+
+
+def enqueue_promotion(event_name):
+    """Promote waiting entries in the background once the current transaction commits"""
+    if not event_name or not frappe.db.exists(
+        "Waitlist Entry", {"event": event_name, "status": "Waiting"}
+    ):
+        return
+
+    frappe.enqueue(
+        "event_management.event_management.doctype.waitlist_entry.waitlist_entry.promote_waitlist",
+        queue="short",
+        enqueue_after_commit=True,
+        job_id=f"promote_waitlist::{event_name}",
+        deduplicate=True,
+        event_name=event_name
+    )
+
+
+def promote_waitlist(event_name, batch_size=PROMOTION_BATCH_SIZE):
+    """Register waiting entries in FIFO order while the event has tickets left.
+
+    Each batch is imported with `bulk_import_attendees` and committed on its
+    own, so a large release of capacity is promoted in a few set-based writes.
+    """
+    from event_management.event_management.bulk import bulk_import_attendees
+
+    promoted = 0
+    no_tickets = f"No tickets available for event {event_name}"
+
+    while True:
+        available = cint(frappe.db.get_value("Event", event_name, "tickets_available"))
+        if available <= 0:
+            break
+
+        limit = min(available, batch_size)
+        entries = frappe.get_all(
+            "Waitlist Entry",
+            filters={"event": event_name, "status": "Waiting"},
+            fields=["name", "attendee_name", "email", "phone"],
+            order_by="creation asc, name asc",
+            limit=limit
+        )
+        if not entries:
+            break
+
+        result = bulk_import_attendees(event_name, [
+            {"name": entry.attendee_name, "email": entry.email, "phone": entry.phone}
+            for entry in entries
+        ])
+        errors = {error["email"]: error["error"] for error in result["errors"]}
+        attendees = dict(frappe.get_all(
+            "Attendee",
+            filters={"event": event_name, "email": ("in", [entry.email for entry in entries])},
+            fields=["email", "name"],
+            as_list=True
+        ))
+
+        sold_out = False
+        promoted_entries = {}
+        for entry in entries:
+            error = errors.get(entry.email)
+            if error == no_tickets:
+                # capacity was taken meanwhile; keep the entry's place in the queue
+                sold_out = True
+            elif error:
+                frappe.db.set_value(
+                    "Waitlist Entry", entry.name, {"status": "Failed", "error": error}
+                )
+            else:
+                promoted_entries[entry.name] = attendees.get(entry.email)
+
+        if promoted_entries:
+            mark_promoted(promoted_entries)
+        frappe.db.commit()
+        promoted += len(promoted_entries)
+
+        if sold_out or len(entries) < limit:
+            break
+
+    return promoted
+
+
+def mark_promoted(attendees):
+    """Set many {entry: attendee} entries to Promoted in one UPDATE"""
+    cases = " ".join(["WHEN %s THEN %s"] * len(attendees))
+    case_values = [value for item in attendees.items() for value in item]
+    frappe.db.sql(
+        f"""
+        UPDATE `tabWaitlist Entry`
+        SET status = 'Promoted', attendee = (CASE name {cases} END), promoted_at = %s
+        WHERE name IN ({", ".join(["%s"] * len(attendees))})
+        """,
+        case_values + [now_datetime()] + list(attendees)
+    )
+
+
+def promote_all_waitlists():
+    """Scheduled safety net for promotions a deduplicated job may have missed"""
+    events = frappe.db.sql(
+        """
+        SELECT DISTINCT w.event
+        FROM `tabWaitlist Entry` w
+        JOIN `tabEvent` e ON e.name = w.event
+        WHERE w.status = 'Waiting' AND e.tickets_available > 0
+        """,
+        pluck=True
+    )
+    for event_name in events:
+        promote_waitlist(event_name)
+
+
+def on_doctype_update():
+    """Add the composite index that keeps each event's queue in FIFO order"""
+    frappe.db.add_index("Waitlist Entry", ["event", "status", "creation"])
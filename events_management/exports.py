@@ -0,0 +1,116 @@
+"""
+Attendee CSV exports for Event Management System
+"""
+
+import csv
+import gzip
+from io import StringIO
+
+import frappe
+from frappe.utils import cint, now_datetime
+from event_management.event_management.archive import is_archived, iter_archived_pages
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.jobs import enqueue_job
+from event_management.event_management.pagination import iter_keyset_pages
+
+EXPORT_PAGE_SIZE = 1000
+
+
+@frappe.whitelist()
+@profiled()
+def export_attendees_csv(event_name, as_job=False):
+    """Export attendees for an event as CSV
+
+    Pass `as_job=1` to build a gzipped file attachment in a background job
+    instead; the response is then {"job_id": ...} for `jobs.get_job_status`.
+    """
+    if cint(as_job):
+        return enqueue_job("export_attendees_csv", event_name=event_name)
+    return "".join(iter_attendees_csv(event_name))
+
+
+@frappe.whitelist()
+@profiled()
+def download_attendees_csv(event_name):
+    """Return the attendee CSV as a file download
+
+    The pages are read while the request still holds its database
+    connection; use `enqueue_attendees_export` for very large events.
+    """
+    from werkzeug.wrappers import Response
+
+    return Response(
+        "".join(iter_attendees_csv(event_name)).encode(),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="attendees-{event_name}.csv"'}
+    )
+
+
+@frappe.whitelist()
+@profiled()
+def enqueue_attendees_export(event_name):
+    """Build a gzipped attendee CSV in the background and attach it to the event"""
+    return enqueue_job("export_attendees_csv", event_name=event_name)
+
+
+def write_attendees_export_file(event_name, progress=None):
+    """Write the attendee CSV to a gzipped private file without holding it in memory"""
+    page_progress = None
+    if progress:
+        if is_archived(event_name):
+            total = frappe.db.get_value("Event", event_name, "archived_attendees")
+        else:
+            total = frappe.db.count("Attendee", filters={"event": event_name})
+
+        def page_progress(done):
+            progress(done, total)
+
+    file_name = f"attendees-{event_name}-{now_datetime():%Y%m%d%H%M%S}.csv.gz"
+    with gzip.open(frappe.get_site_path("private", "files", file_name), "wt", newline="") as output:
+        for chunk in iter_attendees_csv(event_name, progress=page_progress):
+            output.write(chunk)
+
+    file_doc = frappe.get_doc({
+        "doctype": "File",
+        "file_name": file_name,
+        "file_url": f"/private/files/{file_name}",
+        "is_private": 1,
+        "attached_to_doctype": "Event",
+        "attached_to_name": event_name
+    })
+    file_doc.insert(ignore_permissions=True)
+    return file_doc.file_url
+
+
+def iter_attendees_csv(event_name, page_size=EXPORT_PAGE_SIZE, progress=None):
+    """Yield the attendee CSV in chunks, one page of attendees at a time"""
+    done = 0
+    output = StringIO()
+    writer = csv.DictWriter(output, fieldnames=["Name", "Email", "Phone"])
+    writer.writeheader()
+
+    fields = ["name", "creation", "attendee_name", "email", "phone"]
+    if is_archived(event_name):
+        pages = iter_archived_pages("Attendee", event_name, fields, page_size)
+    else:
+        pages = iter_keyset_pages(
+            "Attendee", filters=[["event", "=", event_name]], fields=fields, page_size=page_size
+        )
+
+    for attendees in pages:
+        for attendee in attendees:
+            writer.writerow({
+                "Name": attendee.get("attendee_name"),
+                "Email": attendee.get("email"),
+                "Phone": attendee.get("phone")
+            })
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+        done += len(attendees)
+        if progress:
+            progress(done)
+
+    # header only, when the event has no attendees
+    if output.tell():
+        yield output.getvalue()
@@ -0,0 +1,208 @@
+"""
+Query and hook instrumentation for Event Management System
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+
+import frappe
+
+METRICS_KEY = "event_management:metrics"
+METRIC_FIELDS = ("calls", "seconds", "sql_queries", "sql_seconds", "rows")
+DEFAULT_SLOW_CALL_MS = 500
+
+
+class QueryCounter:
+    """Count the SQL statements sent through `frappe.db.sql` while installed"""
+
+    def __init__(self, timed=False):
+        self.queries = []
+        self.statements = []
+        self.timed = timed
+        self.sql_seconds = 0.0
+        self.rows = 0
+        self._db = None
+        self._previous_sql = None
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def install(self):
+        # Patch the connection object rather than the class so only the current
+        # request/site is counted; Database methods call self.sql internally.
+        # Counters nest: an inner counter wraps whatever the outer one installed.
+        self._db = frappe.db
+        self._previous_sql = self._db.__dict__.get("sql")
+        original_sql = self._db.sql
+
+        def sql(query, *args, **kwargs):
+            self.queries.append(query)
+            self.statements.append((query, args[0] if args else kwargs.get("values", ())))
+            if not self.timed:
+                return original_sql(query, *args, **kwargs)
+
+            started = time.perf_counter()
+            result = original_sql(query, *args, **kwargs)
+            self.sql_seconds += time.perf_counter() - started
+            if isinstance(result, (list, tuple)):
+                self.rows += len(result)
+            return result
+
+        self._db.sql = sql
+        return self
+
+    def uninstall(self):
+        if self._db is None:
+            return
+        if self._previous_sql is not None:
+            self._db.sql = self._previous_sql
+        else:
+            self._db.__dict__.pop("sql", None)
+        self._db = None
+
+
+@contextmanager
+def count_queries():
+    """Count queries run inside the block.
+
+    with count_queries() as counter:
+        get_event_dashboard(event_name)
+    assert counter.count == 1
+    """
+    counter = QueryCounter().install()
+    try:
+        yield counter
+    finally:
+        counter.uninstall()
+
+
+def start_request_query_counter():
+    """before_request hook: count queries for the whole request when enabled"""
+    if frappe.conf.get("event_management_query_counter") and frappe.db:
+        frappe.local.event_management_query_counter = QueryCounter().install()
+
+
+def stop_request_query_counter(response=None, request=None):
+    """after_request hook: expose the request's query count as a response header"""
+    counter = getattr(frappe.local, "event_management_query_counter", None)
+    if not counter:
+        return
+    counter.uninstall()
+    frappe.local.event_management_query_counter = None
+    if response is not None:
+        response.headers["X-Event-Management-Queries"] = str(counter.count)
+
+
+def find_full_scans(statements):
+    """EXPLAIN captured SELECT statements and return the ones that scan a whole table"""
+    full_scans = []
+    for query, values in statements:
+        if not str(query).lstrip().upper().startswith("SELECT"):
+            continue
+        for row in frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True):
+            # derived tables and subquery results show up as <derivedN>/<subqueryN>
+            if row.get("type") == "ALL" and not str(row.get("table")).startswith("<"):
+                full_scans.append({"query": query, "table": row.get("table"), "plan": row})
+    return full_scans
+
+
+def profiled(name=None):
+    """Record wall time, SQL queries, SQL time and rows for each call.
+
+    Only active when `event_management_profiling` is set in site config;
+    otherwise the wrapper adds a single config lookup.
+    """
+
+    def decorator(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not frappe.conf.get("event_management_profiling"):
+                return fn(*args, **kwargs)
+
+            counter = QueryCounter(timed=True).install()
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                counter.uninstall()
+                record_call(label, elapsed, counter)
+
+        return wrapper
+
+    return decorator
+
+
+def record_call(label, elapsed, counter):
+    """Add one call to the metrics hash and log it if it was slow"""
+    cache = frappe.cache()
+    key = cache.make_key(METRICS_KEY)
+    pipeline = cache.pipeline()
+    pipeline.hincrby(key, f"{label}|calls", 1)
+    pipeline.hincrbyfloat(key, f"{label}|seconds", elapsed)
+    pipeline.hincrby(key, f"{label}|sql_queries", counter.count)
+    pipeline.hincrbyfloat(key, f"{label}|sql_seconds", counter.sql_seconds)
+    pipeline.hincrby(key, f"{label}|rows", counter.rows)
+    pipeline.execute()
+
+    threshold = frappe.conf.get("event_management_slow_call_ms") or DEFAULT_SLOW_CALL_MS
+    if elapsed * 1000 >= threshold:
+        frappe.logger("event_management").warning(
+            f"Slow call {label}: {elapsed * 1000:.1f} ms, "
+            f"{counter.count} queries, {counter.sql_seconds * 1000:.1f} ms in SQL, {counter.rows} rows"
+        )
+
+
+def get_metrics_snapshot():
+    """Return recorded metrics as {label: {field: value}}"""
+    cache = frappe.cache()
+    metrics = {}
+    for field, value in (cache.hgetall(cache.make_key(METRICS_KEY)) or {}).items():
+        if isinstance(field, bytes):
+            field, value = field.decode(), value.decode()
+        label, metric = field.rsplit("|", 1)
+        metrics.setdefault(label, {})[metric] = float(value)
+    return metrics
+
+
+def render_prometheus(metrics):
+    """Render a metrics snapshot in the Prometheus text exposition format"""
+    descriptions = {
+        "calls": "Number of profiled calls",
+        "seconds": "Wall time spent in profiled calls",
+        "sql_queries": "SQL queries issued by profiled calls",
+        "sql_seconds": "Time spent in SQL by profiled calls",
+        "rows": "Rows returned to profiled calls",
+    }
+    lines = []
+    for metric in METRIC_FIELDS:
+        name = f"event_management_{metric}_total"
+        lines.append(f"# HELP {name} {descriptions[metric]}")
+        lines.append(f"# TYPE {name} counter")
+        for label in sorted(metrics):
+            value = metrics[label].get(metric, 0)
+            lines.append(f'{name}{{name="{label}"}} {value:g}')
+    return "\n".join(lines) + "\n"
+
+
+@frappe.whitelist()
+def get_metrics():
+    """Expose profiling metrics in Prometheus text format"""
+    from werkzeug.wrappers import Response
+
+    frappe.only_for("System Manager")
+    return Response(
+        render_prometheus(get_metrics_snapshot()),
+        mimetype="text/plain; version=0.0.4"
+    )
+
+
+@frappe.whitelist()
+def reset_metrics():
+    """Clear recorded profiling metrics"""
+    frappe.only_for("System Manager")
+    frappe.cache().delete(frappe.cache().make_key(METRICS_KEY))
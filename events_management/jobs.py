@@ -0,0 +1,98 @@
+"""
+Background job mode for heavy Event Management endpoints
+"""
+
+import frappe
+
+JOB_KEY_PREFIX = "event_management:job"
+JOB_RESULT_TTL = 24 * 60 * 60
+
+# job kind -> function run in the worker; it receives a `progress(done, total)` callback
+JOB_RUNNERS = {
+    "create_bulk_attendees": "event_management.event_management.bulk.import_attendees",
+    "export_attendees_csv": "event_management.event_management.exports.write_attendees_export_file",
+    "ticket_sales_report": "event_management.event_management.reports.build_ticket_sales_report",
+    "box_office_import": "event_management.event_management.box_office.import_sales_file",
+    "analytics_export": "event_management.event_management.analytics.write_analytics_export",
+}
+
+
+def enqueue_job(kind, **kwargs):
+    """Queue a job on the long queue and return its id straight away"""
+    if kind not in JOB_RUNNERS:
+        frappe.throw(f"Unknown job type {kind}")
+
+    job_id = frappe.generate_hash(length=16)
+    _save_status(job_id, {
+        "job_id": job_id,
+        "kind": kind,
+        "status": "queued",
+        "progress": 0,
+        "total": None,
+        "user": frappe.session.user
+    })
+    frappe.enqueue(
+        "event_management.event_management.jobs.run_job",
+        queue="long",
+        timeout=60 * 60,
+        enqueue_after_commit=True,
+        job_id=job_id,
+        # `job_id` is consumed by frappe.enqueue itself, so the worker gets
+        # the id to report progress under as `tracking_id`
+        tracking_id=job_id,
+        kind=kind,
+        job_kwargs=kwargs
+    )
+    return {"job_id": job_id, "status": "queued"}
+
+
+def run_job(tracking_id, kind, job_kwargs):
+    """Worker entry point: run the job and record its progress and result"""
+    job_id = tracking_id
+    status = _load_status(job_id) or {"job_id": job_id, "kind": kind}
+    status["status"] = "started"
+    _save_status(job_id, status)
+
+    def progress(done, total=None):
+        status["progress"] = done
+        if total is not None:
+            status["total"] = total
+        _save_status(job_id, status)
+
+    try:
+        result = frappe.get_attr(JOB_RUNNERS[kind])(progress=progress, **job_kwargs)
+        frappe.db.commit()
+    except Exception as e:
+        frappe.db.rollback()
+        status.update({"status": "failed", "error": str(e)})
+        _save_status(job_id, status)
+        frappe.log_error(title=f"Event Management job {kind} failed")
+        raise
+
+    status["status"] = "finished"
+    if status.get("total") is not None:
+        status["progress"] = status["total"]
+    if isinstance(result, str) and result.startswith(("/files/", "/private/files/")):
+        status["file_url"] = result
+    else:
+        status["result"] = result
+    _save_status(job_id, status)
+
+
+@frappe.whitelist()
+def get_job_status(job_id):
+    """Get the status, progress and result of a background job"""
+    status = _load_status(job_id)
+    if not status:
+        frappe.throw(f"Job {job_id} does not exist or has expired")
+    if status.get("user") != frappe.session.user and "System Manager" not in frappe.get_roles():
+        frappe.throw("Not permitted", frappe.PermissionError)
+    return status
+
+
+def _save_status(job_id, status):
+    frappe.cache().set_value(f"{JOB_KEY_PREFIX}:{job_id}", status, expires_in_sec=JOB_RESULT_TTL)
+
+
+def _load_status(job_id):
+    return frappe.cache().get_value(f"{JOB_KEY_PREFIX}:{job_id}")
@@ -0,0 +1,146 @@
+"""
+Keyset pagination helpers for list endpoints
+"""
+
+import base64
+import json
+
+import frappe
+from frappe.utils import add_days, cint, getdate
+
+DEFAULT_PAGE_LENGTH = 50
+MAX_PAGE_LENGTH = 500
+
+
+def encode_cursor(row, sort_field):
+    """Build an opaque cursor pointing just after `row`"""
+    payload = json.dumps([row.get(sort_field), row.get("name")], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the (sort value, name) pair stored in a cursor"""
+    try:
+        sort_value, name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError, UnicodeError):
+        frappe.throw("Invalid pagination cursor")
+    return sort_value, name
+
+
+def get_page_length(page_length):
+    """Clamp a requested page length to the allowed range"""
+    page_length = cint(page_length) or DEFAULT_PAGE_LENGTH
+    return max(1, min(page_length, MAX_PAGE_LENGTH))
+
+
+def select_fields(fields, allowed, default=None):
+    """Validate a sparse field selection against the fields an endpoint exposes"""
+    if not fields:
+        return list(default or allowed)
+    if isinstance(fields, str):
+        fields = frappe.parse_json(fields) if fields.startswith("[") else fields.split(",")
+
+    fields = [field.strip() for field in fields if field and field.strip()]
+    invalid = [field for field in fields if field not in allowed]
+    if invalid:
+        frappe.throw(f"Invalid fields: {', '.join(invalid)}")
+    return fields
+
+
+def date_range_filters(fieldname, from_date=None, to_date=None, is_datetime=False):
+    """Filters for an optional inclusive date range"""
+    filters = []
+    if from_date:
+        filters.append([fieldname, ">=", from_date])
+    if to_date:
+        if is_datetime:
+            # include the whole of the last day
+            filters.append([fieldname, "<", add_days(getdate(to_date), 1)])
+        else:
+            filters.append([fieldname, "<=", to_date])
+    return filters
+
+
+def keyset_filters(sort_field, sort_value, name, descending=False):
+    """Filters selecting rows strictly after (sort_value, name) in sort order.
+
+    (a, name) > (x, y) is written as a >= x AND (a > x OR name > y) so it can
+    be expressed with get_all filters and or_filters and still use an index
+    on the sort field.
+    """
+    op, strict = ("<=", "<") if descending else (">=", ">")
+    return (
+        [[sort_field, op, sort_value]],
+        [[sort_field, strict, sort_value], ["name", strict, name]]
+    )
+
+
+def paginate(doctype, filters, fields, sort_field, descending=False, page_length=None, cursor=None):
+    """Return one page of a DocType list and the cursor for the next page"""
+    page_length = get_page_length(page_length)
+    filters = list(filters or [])
+    or_filters = None
+    if cursor:
+        sort_value, name = decode_cursor(cursor)
+        cursor_filters, or_filters = keyset_filters(sort_field, sort_value, name, descending)
+        filters.extend(cursor_filters)
+
+    query_fields = list(dict.fromkeys(list(fields) + [sort_field, "name"]))
+    order = "desc" if descending else "asc"
+    rows = frappe.get_all(
+        doctype,
+        filters=filters,
+        or_filters=or_filters,
+        fields=query_fields,
+        order_by=f"{sort_field} {order}, name {order}",
+        limit=page_length + 1
+    )
+    return build_page(rows, page_length, sort_field, fields)
+
+
+def build_page(rows, page_length, sort_field, fields):
+    """Trim the look-ahead row, emit the next cursor and drop helper columns"""
+    has_more = len(rows) > page_length
+    rows = rows[:page_length]
+    next_cursor = encode_cursor(rows[-1], sort_field) if has_more else None
+
+    extra = {sort_field, "name"} - set(fields)
+    if extra:
+        for row in rows:
+            for field in extra:
+                row.pop(field, None)
+
+    return {"data": rows, "next_cursor": next_cursor}
+
+
+def iter_keyset_pages(doctype, filters, fields, page_size, sort_field="creation", descending=True):
+    """Yield every page of rows in (sort_field, name) order.
+
+    Each page continues strictly after the last row of the previous one, so
+    every page costs an index range read instead of an ever growing OFFSET.
+    """
+    order = "desc" if descending else "asc"
+    last = None
+    while True:
+        page_filters = list(filters)
+        or_filters = None
+        if last:
+            cursor_filters, or_filters = keyset_filters(
+                sort_field, last[sort_field], last.name, descending
+            )
+            page_filters.extend(cursor_filters)
+
+        rows = frappe.get_all(
+            doctype,
+            filters=page_filters,
+            or_filters=or_filters,
+            fields=fields,
+            order_by=f"{sort_field} {order}, name {order}",
+            limit=page_size
+        )
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
@@ -0,0 +1,10 @@
+import frappe
+from event_management.event_management.doctype.ticket_sales_rollup.ticket_sales_rollup import (
+    rebuild_rollup
+)
+
+
+def execute():
+    """Build Ticket Sales Rollup rows for sales recorded before the rollup existed"""
+    frappe.reload_doc("event_management", "doctype", "ticket_sales_rollup")
+    rebuild_rollup()
@@ -0,0 +1,30 @@
+import frappe
+from event_management.event_management.checkin import generate_checkin_token
+
+BATCH_SIZE = 1000
+
+
+def execute():
+    """Give attendees registered before check-in existed a check-in token"""
+    frappe.reload_doc("event_management", "doctype", "attendee")
+    while True:
+        names = frappe.get_all(
+            "Attendee",
+            filters={"checkin_token": ("is", "not set")},
+            pluck="name",
+            limit=BATCH_SIZE
+        )
+        if not names:
+            break
+
+        tokens = {name: generate_checkin_token() for name in names}
+        cases = " ".join(["WHEN %s THEN %s"] * len(tokens))
+        frappe.db.sql(
+            f"""
+            UPDATE `tabAttendee`
+            SET checkin_token = (CASE name {cases} END)
+            WHERE name IN ({", ".join(["%s"] * len(tokens))})
+            """,
+            [value for item in tokens.items() for value in item] + list(tokens)
+        )
+        frappe.db.commit()
@@ -0,0 +1,29 @@
+import frappe
+
+
+def execute():
+    """Fill Attendee.email_normalized and drop the old case-sensitive constraint"""
+    frappe.reload_doc("event_management", "doctype", "attendee")
+
+    # IGNORE leaves rows that would collide with the new unique constraint
+    # (case or whitespace variants of an email already registered) unset
+    frappe.db.sql(
+        """
+        UPDATE IGNORE `tabAttendee`
+        SET email_normalized = LOWER(TRIM(email))
+        WHERE email_normalized IS NULL
+        """
+    )
+    conflicts = frappe.get_all(
+        "Attendee",
+        filters={"email_normalized": ("is", "not set")},
+        fields=["name", "event", "email"]
+    )
+    if conflicts:
+        frappe.log_error(
+            title="Attendees with duplicate normalized emails",
+            message=frappe.as_json(conflicts)
+        )
+
+    if frappe.db.has_index("tabAttendee", "unique_event_email"):
+        frappe.db.sql_ddl("ALTER TABLE `tabAttendee` DROP INDEX `unique_event_email`")
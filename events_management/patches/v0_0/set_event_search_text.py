@@ -0,0 +1,29 @@
+import frappe
+from event_management.event_management.pagination import iter_keyset_pages
+from event_management.event_management.search import add_search_index, build_search_text
+
+BATCH_SIZE = 1000
+
+
+def execute():
+    """Fill Event.search_text for events created before search existed"""
+    frappe.reload_doc("event_management", "doctype", "event")
+    add_search_index()
+
+    for events in iter_keyset_pages(
+        "Event",
+        [],
+        ["name", "creation", "event_title", "location", "description"],
+        BATCH_SIZE
+    ):
+        texts = {event.name: build_search_text(event) for event in events}
+        cases = " ".join(["WHEN %s THEN %s"] * len(texts))
+        frappe.db.sql(
+            f"""
+            UPDATE `tabEvent`
+            SET search_text = (CASE name {cases} END)
+            WHERE name IN ({", ".join(["%s"] * len(texts))})
+            """,
+            [value for item in texts.items() for value in item] + list(texts)
+        )
+        frappe.db.commit()
@@ -0,0 +1,13 @@
+import frappe
+
+
+def execute():
+    """Fill Waitlist Entry.email_normalized for entries created before it existed"""
+    frappe.reload_doc("event_management", "doctype", "waitlist_entry")
+    frappe.db.sql(
+        """
+        UPDATE `tabWaitlist Entry`
+        SET email_normalized = LOWER(TRIM(email))
+        WHERE email_normalized IS NULL
+        """
+    )
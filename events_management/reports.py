@@ -0,0 +1,273 @@
+"""
+Ticket sales reports for Event Management System
+"""
+
+import frappe
+from frappe.utils import add_days, add_to_date, cint, flt, getdate, now_datetime
+from event_management.event_management.archive import table_for
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.jobs import enqueue_job
+from event_management.event_management.pagination import (
+    decode_cursor,
+    encode_cursor,
+    get_page_length,
+    select_fields
+)
+
+BUCKET_FORMATS = {
+    "minute": "%Y-%m-%d %H:%i:00",
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d",
+}
+MAX_DELTA_ROWS = 5000
+REPORT_PAGE_SIZE = 1000
+SALES_REPORT_COLUMNS = {
+    "sales_id": "ts.name",
+    "ticket": "ts.ticket",
+    "ticket_type": "t.ticket_type",
+    "price": "t.price",
+    "quantity": "ts.quantity",
+    "total_amount": "ts.total_amount",
+    "creation": "ts.creation"
+}
+# Sales stamped within the last few seconds may belong to transactions that
+# have not committed yet; leaving them for the next poll keeps the watermark
+# from skipping over them
+SETTLE_SECONDS = 5
+
+
+@frappe.whitelist()
+@profiled()
+def get_ticket_sales_report(event_name, page_length=None, cursor=None, fields=None,
+                            ticket_type=None, from_date=None, to_date=None, as_job=False):
+    """Get ticket sales report for an event
+
+    Pass `page_length` or `cursor` to get one page as
+    {"data": [...], "next_cursor": ...} instead of the full report, or
+    `as_job=1` to build the full report in a background job.
+    """
+    if cint(as_job):
+        return enqueue_job(
+            "ticket_sales_report",
+            event_name=event_name,
+            fields=fields,
+            ticket_type=ticket_type,
+            from_date=from_date,
+            to_date=to_date
+        )
+
+    fields = select_fields(
+        fields,
+        SALES_REPORT_COLUMNS,
+        default=["sales_id", "ticket_type", "price", "quantity", "total_amount", "creation"]
+    )
+    paginated = bool(page_length or cursor)
+    columns = list(fields)
+    if paginated:
+        columns += [column for column in ("creation", "sales_id") if column not in columns]
+
+    conditions = ["ts.event = %(event)s"]
+    values = {"event": event_name}
+    if ticket_type:
+        conditions.append("t.ticket_type = %(ticket_type)s")
+        values["ticket_type"] = ticket_type
+    if from_date:
+        conditions.append("ts.creation >= %(from_date)s")
+        values["from_date"] = from_date
+    if to_date:
+        conditions.append("ts.creation < %(to_date)s")
+        values["to_date"] = add_days(getdate(to_date), 1)
+    if cursor:
+        values["cursor_creation"], values["cursor_name"] = decode_cursor(cursor)
+        conditions.append(
+            "(ts.creation < %(cursor_creation)s"
+            " OR (ts.creation = %(cursor_creation)s AND ts.name < %(cursor_name)s))"
+        )
+
+    limit = ""
+    if paginated:
+        page_length = get_page_length(page_length)
+        limit = "LIMIT %(limit)s"
+        values["limit"] = page_length + 1
+
+    ticket_sales = frappe.db.sql(
+        f"""
+        SELECT {", ".join(f"{SALES_REPORT_COLUMNS[column]} as {column}" for column in columns)}
+        FROM `{table_for("Ticket Sales", event_name)}` ts
+        JOIN `tabTicket` t ON ts.ticket = t.name
+        WHERE {" AND ".join(conditions)}
+        ORDER BY ts.creation DESC, ts.name DESC
+        {limit}
+        """,
+        values,
+        as_dict=True
+    )
+    if not paginated:
+        return ticket_sales
+
+    has_more = len(ticket_sales) > page_length
+    ticket_sales = ticket_sales[:page_length]
+    next_cursor = None
+    if has_more:
+        last = ticket_sales[-1]
+        next_cursor = encode_cursor({"creation": last.creation, "name": last.sales_id}, "creation")
+    for row in ticket_sales:
+        for column in set(columns) - set(fields):
+            row.pop(column, None)
+    return {"data": ticket_sales, "next_cursor": next_cursor}
+
+
+def build_ticket_sales_report(event_name, progress=None, page_length=REPORT_PAGE_SIZE, **filters):
+    """Collect the full sales report page by page, reporting progress per page"""
+    rows = []
+    cursor = None
+    while True:
+        page = get_ticket_sales_report(
+            event_name, page_length=page_length, cursor=cursor, **filters
+        )
+        rows.extend(page["data"])
+        if progress:
+            progress(len(rows))
+        cursor = page["next_cursor"]
+        if not cursor:
+            return rows
+
+
+@frappe.whitelist()
+@profiled()
+def get_ticket_sales_changes(event_name, since=None, bucket=None, by_ticket_type=1, limit=None):
+    """Get the ticket sales recorded after a watermark, as columns
+
+    Without `bucket` the new sales rows are returned column by column. With
+    `bucket` set to minute, hour or day, quantity and revenue of the new
+    sales are summed per bucket (and per ticket type unless
+    `by_ticket_type=0`), so clients add the deltas to the buckets they
+    already hold. Pass the returned `watermark` as `since` on the next call.
+
+    Deltas only cover inserted sales: deleted or cancelled sales and edited
+    quantities are not replayed. `totals` carries the event's current
+    quantity and revenue from the sales rollup, so clients can tell when
+    their summed buckets have drifted and reload them.
+    """
+    if bucket and bucket not in BUCKET_FORMATS:
+        frappe.throw(f"Bucket must be one of {', '.join(BUCKET_FORMATS)}")
+
+    limit = max(1, min(cint(limit) or MAX_DELTA_ROWS, MAX_DELTA_ROWS))
+    table = table_for("Ticket Sales", event_name)
+    conditions = ["ts.event = %(event)s", "ts.creation <= %(settled)s"]
+    values = {
+        "event": event_name,
+        "settled": add_to_date(now_datetime(), seconds=-SETTLE_SECONDS),
+        "limit": limit
+    }
+    if since:
+        values["since_creation"], values["since_name"] = decode_cursor(since)
+        conditions.append(
+            "(ts.creation > %(since_creation)s"
+            " OR (ts.creation = %(since_creation)s AND ts.name > %(since_name)s))"
+        )
+
+    # The newest row of this batch becomes the next watermark; aggregates
+    # are taken over exactly the rows up to it
+    upper = frappe.db.sql(
+        f"""
+        SELECT creation, name FROM (
+            SELECT ts.creation, ts.name
+            FROM `{table}` ts
+            WHERE {" AND ".join(conditions)}
+            ORDER BY ts.creation ASC, ts.name ASC
+            LIMIT %(limit)s
+        ) batch
+        ORDER BY creation DESC, name DESC
+        LIMIT 1
+        """,
+        values,
+        as_dict=True
+    )
+    if not upper:
+        return {
+            "watermark": since,
+            "has_more": False,
+            "bucket": bucket,
+            "columns": {},
+            "totals": _rollup_totals(event_name)
+        }
+
+    values["upper_creation"], values["upper_name"] = upper[0].creation, upper[0].name
+    conditions.append(
+        "(ts.creation < %(upper_creation)s"
+        " OR (ts.creation = %(upper_creation)s AND ts.name <= %(upper_name)s))"
+    )
+    where = " AND ".join(conditions)
+
+    if bucket:
+        values["bucket_format"] = BUCKET_FORMATS[bucket]
+        group_by_type = cint(by_ticket_type)
+        rows = frappe.db.sql(
+            f"""
+            SELECT
+                DATE_FORMAT(ts.creation, %(bucket_format)s) as bucket,
+                {"t.ticket_type" if group_by_type else "NULL"} as ticket_type,
+                SUM(ts.quantity) as quantity,
+                SUM(ts.total_amount) as revenue
+            FROM `{table}` ts
+            JOIN `tabTicket` t ON ts.ticket = t.name
+            WHERE {where}
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+            """,
+            values,
+            as_list=True
+        )
+        columns = ["bucket", "ticket_type", "quantity", "revenue"]
+        if not group_by_type:
+            rows = [[row[0], row[2], row[3]] for row in rows]
+            columns.remove("ticket_type")
+    else:
+        rows = frappe.db.sql(
+            f"""
+            SELECT ts.name, t.ticket_type, t.price, ts.quantity, ts.total_amount, ts.creation
+            FROM `{table}` ts
+            JOIN `tabTicket` t ON ts.ticket = t.name
+            WHERE {where}
+            ORDER BY ts.creation ASC, ts.name ASC
+            """,
+            values,
+            as_list=True
+        )
+        columns = ["sales_id", "ticket_type", "price", "quantity", "total_amount", "creation"]
+
+    return {
+        "watermark": encode_cursor(upper[0], "creation"),
+        "has_more": _has_more(table, event_name, upper[0], values["settled"]),
+        "bucket": bucket,
+        "columns": {column: [row[i] for row in rows] for i, column in enumerate(columns)},
+        "totals": _rollup_totals(event_name)
+    }
+
+
+def _rollup_totals(event_name):
+    """Current quantity and revenue of an event's sales, deletions included"""
+    quantity, revenue = frappe.db.sql(
+        """
+        SELECT IFNULL(SUM(quantity_sold), 0), IFNULL(SUM(revenue), 0)
+        FROM `tabTicket Sales Rollup`
+        WHERE event = %s
+        """,
+        (event_name,)
+    )[0]
+    return {"quantity": cint(quantity), "revenue": flt(revenue)}
+
+
+def _has_more(table, event_name, upper, settled):
+    """Whether settled sales exist beyond the batch just returned"""
+    return bool(frappe.db.sql(
+        f"""
+        SELECT 1 FROM `{table}`
+        WHERE event = %(event)s
+            AND creation <= %(settled)s
+            AND (creation > %(creation)s OR (creation = %(creation)s AND name > %(name)s))
+        LIMIT 1
+        """,
+        {"event": event_name, "settled": settled, "creation": upper.creation, "name": upper.name}
+    ))
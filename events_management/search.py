@@ -0,0 +1,175 @@
+"""
+Full-text event search for Event Management System
+"""
+
+import re
+
+import frappe
+from frappe.utils import cint, strip_html_tags
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.pagination import get_page_length
+
+SEARCH_INDEX = "event_search_text"
+# InnoDB ignores shorter words unless innodb_ft_min_token_size is lowered
+MIN_TOKEN_SIZE = 3
+MAX_SEARCH_START = 1000
+MAX_FACETS = 20
+SEARCH_FIELDS = ("name", "event_title", "event_date", "location", "tickets_available")
+
+
+def build_search_text(event):
+    """Plain text the FULLTEXT index is built on"""
+    return " ".join(
+        part for part in (
+            event.event_title,
+            event.location,
+            strip_html_tags(event.description or "")
+        )
+        if part
+    )
+
+
+def add_search_index():
+    """Create the FULLTEXT index on Event.search_text if it is missing"""
+    if not frappe.db.has_index("tabEvent", SEARCH_INDEX):
+        frappe.db.sql_ddl(
+            f"ALTER TABLE `tabEvent` ADD FULLTEXT INDEX `{SEARCH_INDEX}` (`search_text`)"
+        )
+
+
+def boolean_query(text, prefix_last=True):
+    """Turn user input into a BOOLEAN MODE query requiring every word.
+
+    The last word also matches as a prefix, so results follow the user's
+    typing. Returns None when no word is long enough to be indexed.
+    """
+    words = [word for word in re.findall(r"\w+", text or "") if len(word) >= MIN_TOKEN_SIZE]
+    if not words:
+        return None
+    terms = [f"+{word}" for word in words]
+    if prefix_last:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _filters(from_date, to_date, location=None):
+    conditions = []
+    values = {}
+    if from_date:
+        conditions.append("event_date >= %(from_date)s")
+        values["from_date"] = from_date
+    if to_date:
+        conditions.append("event_date <= %(to_date)s")
+        values["to_date"] = to_date
+    if location:
+        conditions.append("location = %(location)s")
+        values["location"] = location
+    return conditions, values
+
+
+@frappe.whitelist()
+@profiled()
+def search_events(query, from_date=None, to_date=None, location=None, page_length=None,
+                  start=0, facets=1):
+    """Search events by title, location and description, best matches first
+
+    Returns {"data": [...], "facets": {"location": [...]}}; location facets
+    count the matches per location before the `location` filter is applied.
+    """
+    match_query = boolean_query(query)
+    if not match_query:
+        frappe.throw(f"Search terms must be at least {MIN_TOKEN_SIZE} characters long")
+
+    page_length = get_page_length(page_length)
+    start = max(0, min(cint(start), MAX_SEARCH_START))
+    conditions, values = _filters(from_date, to_date, location)
+    conditions.insert(0, "MATCH(search_text) AGAINST (%(query)s IN BOOLEAN MODE)")
+    values.update({"query": match_query, "limit": page_length, "start": start})
+
+    events = frappe.db.sql(
+        f"""
+        SELECT {", ".join(SEARCH_FIELDS)},
+            MATCH(search_text) AGAINST (%(query)s IN BOOLEAN MODE) as score
+        FROM `tabEvent`
+        WHERE {" AND ".join(conditions)}
+        ORDER BY score DESC, event_date ASC, name ASC
+        LIMIT %(limit)s OFFSET %(start)s
+        """,
+        values,
+        as_dict=True
+    )
+
+    result = {"data": events, "start": start, "page_length": page_length}
+    if cint(facets):
+        result["facets"] = {"location": get_location_facets(match_query, from_date, to_date)}
+    return result
+
+
+def get_location_facets(match_query, from_date=None, to_date=None):
+    """Count matching events per location"""
+    conditions, values = _filters(from_date, to_date)
+    conditions.insert(0, "MATCH(search_text) AGAINST (%(query)s IN BOOLEAN MODE)")
+    values.update({"query": match_query, "limit": MAX_FACETS})
+    return frappe.db.sql(
+        f"""
+        SELECT location, COUNT(*) as count
+        FROM `tabEvent`
+        WHERE {" AND ".join(conditions)}
+        GROUP BY location
+        ORDER BY count DESC, location ASC
+        LIMIT %(limit)s
+        """,
+        values,
+        as_dict=True
+    )
+
+
+def escape_like(text):
+    """Escape LIKE wildcards so user input only matches literally"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@frappe.whitelist()
+@profiled()
+def autocomplete_events(prefix, limit=10):
+    """Suggest events for a partly typed search.
+
+    Titles starting with the prefix come first, read from the unique index
+    on event_title; the rest are prefix matches anywhere in the search text.
+    """
+    prefix = (prefix or "").strip()
+    limit = max(1, min(cint(limit) or 10, 50))
+    if not prefix:
+        return []
+
+    suggestions = frappe.db.sql(
+        """
+        SELECT name, event_title, event_date, location
+        FROM `tabEvent`
+        WHERE event_title LIKE %(prefix)s
+        ORDER BY event_title ASC
+        LIMIT %(limit)s
+        """,
+        {"prefix": f"{escape_like(prefix)}%", "limit": limit},
+        as_dict=True
+    )
+
+    match_query = boolean_query(prefix)
+    if len(suggestions) < limit and match_query:
+        suggestions += frappe.db.sql(
+            """
+            SELECT name, event_title, event_date, location
+            FROM `tabEvent`
+            WHERE MATCH(search_text) AGAINST (%(query)s IN BOOLEAN MODE)
+                AND name NOT IN %(seen)s
+            ORDER BY MATCH(search_text) AGAINST (%(query)s IN BOOLEAN MODE) DESC, event_date ASC
+            LIMIT %(limit)s
+            """,
+            {
+                "query": match_query,
+                "seen": tuple(suggestion.name for suggestion in suggestions) or ("",),
+                "limit": limit - len(suggestions)
+            },
+            as_dict=True
+        )
+    return suggestions
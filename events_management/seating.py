@@ -0,0 +1,122 @@
+"""
+Reserved seating on top of Seat Map Section bitmaps and Ticket Holds
+
+Every path that touches both locks the Seat Map Section row before the
+Ticket row, so holds, releases and sales of one section cannot deadlock.
+"""
+
+import frappe
+from frappe.utils import cint
+from event_management.event_management.doctype.seat_map_section.seat_map_section import (
+    decode_bitmap,
+    find_best_block,
+    hold_section_seats,
+    lock_section,
+    parse_seats,
+    release_held_seats
+)
+from event_management.event_management.doctype.ticket.ticket import release_stock
+from event_management.event_management.doctype.ticket_hold.ticket_hold import create_hold
+from event_management.event_management.instrumentation import profiled
+
+
+@frappe.whitelist()
+@profiled()
+def hold_seats(section_name, seats=None, count=None):
+    """Hold specific seats, or the best available block of `count` seats
+
+    The seats are marked held under a lock on the section row and a Ticket
+    Hold takes the same quantity from the section's ticket, in the same
+    transaction, so either both happen or neither does. Complete the sale
+    with `create_ticket_sale(..., hold_id=...)`; unused holds expire like
+    any other Ticket Hold.
+    """
+    labels = parse_seats(seats)
+    if not labels:
+        count = cint(count)
+        section = lock_section(section_name)
+        labels = find_best_block(section, count)
+        if not labels:
+            frappe.throw(f"No block of {count} adjacent seats is available in {section_name}")
+
+    section = hold_section_seats(section_name, labels)
+    hold = create_hold(
+        section.ticket,
+        len(labels),
+        seat_map_section=section_name,
+        seats=",".join(labels)
+    )
+    frappe.db.commit()
+    return {"hold_id": hold.name, "seats": labels, "expires_at": hold.expires_at}
+
+
+@frappe.whitelist()
+@profiled()
+def release_seat_hold(hold_id):
+    """Give up a seat hold before it expires"""
+    hold = frappe.db.get_value(
+        "Ticket Hold", hold_id, ["ticket", "quantity", "seat_map_section", "seats"], as_dict=True
+    )
+    if not hold:
+        return {"released": False}
+
+    frappe.db.sql("DELETE FROM `tabTicket Hold` WHERE name = %s", (hold_id,))
+    # a concurrent sale or the expiry job may have used the hold meanwhile
+    if not frappe.db._cursor.rowcount:
+        return {"released": False}
+
+    if hold.seat_map_section:
+        release_held_seats(hold.seat_map_section, parse_seats(hold.seats))
+    release_stock(hold.ticket, hold.quantity)
+    frappe.db.commit()
+    return {"released": True}
+
+
+@frappe.whitelist()
+@profiled()
+def get_best_available(section_name, count):
+    """Suggest the best free block of `count` adjacent seats without holding it"""
+    section = frappe.db.get_value(
+        "Seat Map Section",
+        section_name,
+        ["name", "row_count", "seats_per_row", "held_bitmap", "sold_bitmap"],
+        as_dict=True
+    )
+    if not section:
+        frappe.throw(f"Seat Map Section {section_name} does not exist")
+    section.held = decode_bitmap(section.held_bitmap)
+    section.sold = decode_bitmap(section.sold_bitmap)
+    return {"seats": find_best_block(section, cint(count))}
+
+
+@frappe.whitelist()
+@profiled()
+def get_seat_summary(event_name):
+    """Held, sold and available seats per section of an event, read from the
+    counters kept with each section's bitmaps"""
+    sections = frappe.get_all(
+        "Seat Map Section",
+        filters={"event": event_name},
+        fields=[
+            "name", "section_name", "ticket", "seat_count",
+            "held_seats", "sold_seats", "available_seats"
+        ],
+        order_by="section_name asc"
+    )
+    return {
+        "sections": sections,
+        "seat_count": sum(section.seat_count or 0 for section in sections),
+        "available_seats": sum(section.available_seats or 0 for section in sections)
+    }
+
+
+@frappe.whitelist()
+@profiled()
+def get_seat_map(section_name):
+    """Layout and base64 bitmaps of a section, for drawing the seat map"""
+    return frappe.db.get_value(
+        "Seat Map Section",
+        section_name,
+        ["name", "row_count", "seats_per_row", "held_bitmap", "sold_bitmap", "available_seats"],
+        as_dict=True
+    )
@@ -0,0 +1,91 @@
+import frappe
+import unittest
+from unittest.mock import patch
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management import admission, api
+
+# Runs against the site's Redis, like the rest of the cache tests
+TEST_LIMITS = {"user": (0.001, 3), "event": (1000, 1000)}
+
+
+class TestAdmission(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Admission",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        self.ticket = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "General",
+            "price": 20.00,
+            "quantity": 50
+        })
+        self.ticket.insert(ignore_if_duplicate=True)
+        self.clear_keys()
+
+    def clear_keys(self):
+        frappe.cache().delete(
+            admission._key(f"bucket:user:{frappe.session.user}"),
+            admission._key(f"bucket:event:{self.event.name}"),
+            admission._sold_out_key("event", self.event.name),
+            admission._sold_out_key("ticket", self.ticket.name)
+        )
+
+    @patch.object(admission, "DEFAULT_RATE_LIMITS", TEST_LIMITS)
+    def test_user_bucket(self):
+        """Test that a user gets the burst and is then rate limited"""
+        before = admission.get_admission_stats()
+        for _ in range(3):
+            self.assertTrue(admission.admit(self.event.name))
+
+        with self.assertRaises(frappe.TooManyRequestsError):
+            admission.admit(self.event.name)
+
+        after = admission.get_admission_stats()
+        self.assertEqual(after["admitted"] - before["admitted"], 3)
+        self.assertEqual(after["limited_user"] - before["limited_user"], 1)
+
+    @patch.object(admission, "DEFAULT_RATE_LIMITS", TEST_LIMITS)
+    def test_sold_out_takes_no_token(self):
+        """Test that a sold-out flag answers first and leaves the bucket alone"""
+        admission.mark_sold_out("event", self.event.name)
+        for _ in range(5):
+            self.assertFalse(admission.admit(self.event.name, sold_out=("event", self.event.name)))
+
+        admission.clear_sold_out("event", self.event.name)
+        self.assertTrue(admission.admit(self.event.name, sold_out=("event", self.event.name)))
+
+    def test_sold_out_fast_path(self):
+        """Test that flagged events waitlist registrations and flagged tickets refuse sales"""
+        admission.mark_sold_out("event", self.event.name)
+        result = api.register_attendee(self.event.name, "Late Registrant", "late@example.com")
+        self.assertEqual(result["status"], "waitlisted")
+
+        admission.mark_sold_out("ticket", self.ticket.name)
+        with self.assertRaises(frappe.ValidationError):
+            api.create_ticket_sale(self.ticket.name, self.event.name, 1)
+
+    def test_released_stock_clears_flag(self):
+        """Test that returning stock drops the ticket's sold-out flag"""
+        from event_management.event_management.doctype.ticket.ticket import release_stock
+
+        admission.mark_sold_out("ticket", self.ticket.name)
+        release_stock(self.ticket.name, 0)
+        self.assertFalse(frappe.cache().exists(admission._sold_out_key("ticket", self.ticket.name)))
+
+    def tearDown(self):
+        """Clean up test data"""
+        self.clear_keys()
+        frappe.db.delete("Waitlist Entry", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Admission"})
+        frappe.db.commit()
@@ -0,0 +1,75 @@
+import importlib.util
+
+import frappe
+import unittest
+from unittest.mock import patch
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management import analytics
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+class TestAnalyticsExport(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Analytics",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        self.ticket = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "General",
+            "price": 20.00,
+            "quantity": 50
+        })
+        self.ticket.insert(ignore_if_duplicate=True)
+
+        for quantity in (1, 3):
+            frappe.get_doc({
+                "doctype": "Ticket Sales",
+                "ticket": self.ticket.name,
+                "event": self.event.name,
+                "quantity": quantity
+            }).insert()
+
+    def read_rows(self, file_urls):
+        import pyarrow.parquet
+
+        rows = []
+        for file_url in file_urls:
+            path = frappe.get_site_path("private", "files", file_url.split("/private/files/", 1)[1])
+            rows += pyarrow.parquet.read_table(path).to_pylist()
+        return [row for row in rows if row["event"] == self.event.name]
+
+    @patch.object(analytics, "SETTLE_SECONDS", 0)
+    def test_export_partitions_and_watermark(self):
+        """Test that sales land in their event month and a watermark skips them next time"""
+        result = analytics.write_analytics_export("sales", batch_size=1)
+
+        month = f"event_month={self.event.event_date:%Y-%m}"
+        self.assertTrue(any(month in file_url for file_url in result["files"]))
+        rows = self.read_rows(result["files"])
+        self.assertEqual(sorted(row["quantity"] for row in rows), [1, 3])
+        self.assertEqual({row["ticket_type"] for row in rows}, {"General"})
+
+        again = analytics.write_analytics_export("sales", since=result["watermark"])
+        self.assertEqual(self.read_rows(again["files"]), [])
+
+    def test_invalid_dataset(self):
+        """Test that unknown datasets are rejected"""
+        with self.assertRaises(frappe.ValidationError):
+            analytics.write_analytics_export("payments")
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Sales Rollup", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Analytics"})
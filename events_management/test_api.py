@@ -0,0 +1,112 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management.api import get_event_dashboard
+from event_management.event_management.instrumentation import count_queries
+
+
+class TestEventDashboard(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Dashboard",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        for ticket_type, price, sold in (("VIP", 100.00, 2), ("General", 20.00, 5)):
+            ticket = frappe.get_doc({
+                "doctype": "Ticket",
+                "event": self.event.name,
+                "ticket_type": ticket_type,
+                "price": price,
+                "quantity": 50
+            })
+            ticket.insert(ignore_if_duplicate=True)
+            frappe.get_doc({
+                "doctype": "Ticket Sales",
+                "ticket": ticket.name,
+                "event": self.event.name,
+                "quantity": sold
+            }).insert()
+
+        frappe.get_doc({
+            "doctype": "Attendee",
+            "attendee_name": "Dashboard Guest",
+            "email": "dashboard@example.com",
+            "event": self.event.name
+        }).insert()
+
+    def test_dashboard_totals(self):
+        """Test that the dashboard aggregates sales per ticket type"""
+        dashboard = get_event_dashboard(self.event.name)
+        self.assertEqual(dashboard["event_title"], "Test Event for Dashboard")
+        self.assertEqual(dashboard["summary"]["attendees"], 1)
+        self.assertEqual(dashboard["summary"]["total_tickets_sold"], 7)
+        self.assertEqual(dashboard["summary"]["total_revenue"], 300.00)
+        self.assertEqual(dashboard["total_records"], 2)
+
+    def test_dashboard_query_budget(self):
+        """Test that the dashboard stays at a single query"""
+        with count_queries() as counter:
+            get_event_dashboard(self.event.name)
+        self.assertEqual(counter.count, 1, msg="\n\n".join(counter.queries))
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Attendee", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Dashboard"})
+
+
+class TestListPagination(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.events = []
+        for i in range(3):
+            event = frappe.get_doc({
+                "doctype": "Event",
+                "event_title": f"Test Event for Pagination {i}",
+                "description": "Test event",
+                "event_date": (datetime.now() + timedelta(days=400 + i)).date(),
+                "location": "Pagination Hall",
+                "capacity": 10
+            })
+            event.insert(ignore_if_duplicate=True)
+            self.events.append(event.name)
+
+    def test_cursor_walks_every_event_once(self):
+        """Test that following next_cursor visits each event exactly once"""
+        from event_management.event_management.api import list_events
+
+        seen = []
+        cursor = None
+        while True:
+            page = list_events(
+                page_length=2, cursor=cursor, location="Pagination Hall", fields="name"
+            )
+            self.assertLessEqual(len(page["data"]), 2)
+            self.assertEqual(set(page["data"][0]), {"name"})
+            seen.extend(row.name for row in page["data"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(seen, self.events)
+
+    def test_invalid_field_selection(self):
+        """Test that unknown fields are rejected"""
+        from event_management.event_management.api import list_events
+
+        with self.assertRaises(frappe.ValidationError):
+            list_events(fields="name,description")
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Event", filters={"location": "Pagination Hall"})
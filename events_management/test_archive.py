@@ -0,0 +1,127 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management import archive, reports, utils
+
+
+class TestEventArchive(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # DDL commits implicitly, so create the tables before any test data
+        archive.ensure_archive_tables()
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Archive",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        self.ticket = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "General",
+            "price": 20.00,
+            "quantity": 50
+        })
+        self.ticket.insert(ignore_if_duplicate=True)
+
+        for i in range(3):
+            frappe.get_doc({
+                "doctype": "Attendee",
+                "attendee_name": f"Archived Attendee {i}",
+                "email": f"archived{i}@example.com",
+                "phone": "1234567890",
+                "event": self.event.name
+            }).insert()
+        frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": self.ticket.name,
+            "event": self.event.name,
+            "quantity": 2
+        }).insert()
+
+    def test_archive_event(self):
+        """Test that rows move to the archive and reads follow them"""
+        self.assertTrue(archive.archive_event(self.event.name))
+
+        self.assertEqual(frappe.db.count("Attendee", {"event": self.event.name}), 0)
+        self.assertEqual(frappe.db.count("Ticket Sales", {"event": self.event.name}), 0)
+
+        event = frappe.db.get_value(
+            "Event", self.event.name,
+            ["is_archived", "archived_attendees", "archived_tickets_sold", "archived_revenue"],
+            as_dict=True
+        )
+        self.assertEqual(event.is_archived, 1)
+        self.assertEqual(event.archived_attendees, 3)
+        self.assertEqual(event.archived_tickets_sold, 2)
+        self.assertEqual(event.archived_revenue, 40.0)
+
+        self.assertEqual(utils.get_event_summary(self.event.name)["attendees"], 3)
+        self.assertEqual(len(utils.get_event_attendees(self.event.name)), 3)
+
+        first = utils.get_event_attendees(self.event.name, page_length=2)
+        second = utils.get_event_attendees(self.event.name, cursor=first["next_cursor"])
+        self.assertEqual(len(first["data"]) + len(second["data"]), 3)
+        self.assertIsNone(second["next_cursor"])
+
+        sales = reports.get_ticket_sales_report(self.event.name)
+        self.assertEqual([row.quantity for row in sales], [2])
+
+    def test_archived_event_rejects_attendees(self):
+        """Test that an archived event takes no new registrations"""
+        archive.archive_event(self.event.name)
+        self.assertFalse(archive.archive_event(self.event.name))
+
+        with self.assertRaises(frappe.ValidationError):
+            frappe.get_doc({
+                "doctype": "Attendee",
+                "attendee_name": "Late Attendee",
+                "email": "late@example.com",
+                "event": self.event.name
+            }).insert()
+
+    def test_archived_event_rejects_sales(self):
+        """Test that sales, checkouts, bulk imports and counter increments stop at archiving"""
+        from event_management.event_management.bulk import bulk_import_attendees
+        from event_management.event_management.checkout import checkout
+        from event_management.event_management.doctype.event.event import adjust_ticket_counters
+        from event_management.event_management.doctype.ticket.ticket import reserve_stock
+
+        archive.archive_event(self.event.name)
+
+        with self.assertRaises(frappe.ValidationError):
+            frappe.get_doc({
+                "doctype": "Ticket Sales",
+                "ticket": self.ticket.name,
+                "event": self.event.name,
+                "quantity": 1
+            }).insert()
+        with self.assertRaises(frappe.ValidationError):
+            checkout(self.event.name, [{"ticket": self.ticket.name, "quantity": 1}])
+        with self.assertRaises(frappe.ValidationError):
+            bulk_import_attendees(self.event.name, [{"name": "Late", "email": "late@example.com"}])
+
+        self.assertFalse(reserve_stock(self.ticket.name, 1))
+        self.assertFalse(adjust_ticket_counters(self.event.name, 1))
+        self.assertEqual(frappe.db.count("Ticket Sales", {"event": self.event.name}), 0)
+
+    def tearDown(self):
+        """Clean up test data"""
+        for doctype in archive.ARCHIVED_DOCTYPES:
+            frappe.db.sql(
+                f"DELETE FROM `{archive.archive_table(doctype)}` WHERE event = %s", (self.event.name,)
+            )
+        frappe.db.delete("Attendee", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Sales Rollup", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Archive"})
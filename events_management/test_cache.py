@@ -0,0 +1,88 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from event_management.event_management.cache import EventCache
+
+
+class InMemoryRedis:
+    """In-process stand-in for the RedisWrapper methods EventCache uses"""
+
+    def __init__(self):
+        self.values = {}
+        self.sorted_sets = {}
+
+    def make_key(self, key):
+        return f"test|{key}"
+
+    def get_value(self, key):
+        return self.values.get(self.make_key(key))
+
+    def set_value(self, key, value, expires_in_sec=None):
+        self.values[self.make_key(key)] = value
+
+    def delete_value(self, keys):
+        for key in keys:
+            self.values.pop(self.make_key(key), None)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def incrby(self, key, amount):
+        self.values[key] = self.values.get(key, 0) + amount
+        return self.values[key]
+
+    def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    def zcard(self, key):
+        return len(self.sorted_sets.get(key, {}))
+
+    def zrange(self, key, start, end):
+        members = sorted(self.sorted_sets.get(key, {}).items(), key=lambda item: item[1])
+        return [member for member, _ in members[start:end + 1]]
+
+    def zrem(self, key, member):
+        self.sorted_sets.get(key, {}).pop(member, None)
+
+
+class TestEventCache(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.cache = EventCache(backend=InMemoryRedis(), ttl=60, max_events=2)
+        self.loads = []
+
+    def load(self, value):
+        self.loads.append(value)
+        return value
+
+    def test_read_through(self):
+        """Test that a second read is served from the cache"""
+        self.assertEqual(self.cache.get("EV-1", "summary", lambda: self.load("a")), "a")
+        self.assertEqual(self.cache.get("EV-1", "summary", lambda: self.load("b")), "a")
+        self.assertEqual(self.loads, ["a"])
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "evictions": 0})
+
+    def test_invalidation(self):
+        """Test that invalidating a kind forces a reload of only that kind"""
+        self.cache.get("EV-1", "summary", lambda: self.load("summary"))
+        self.cache.get("EV-1", "available_tickets", lambda: self.load("tickets"))
+
+        self.cache.invalidate("EV-1", ("summary",))
+        self.cache.get("EV-1", "summary", lambda: self.load("summary"))
+        self.cache.get("EV-1", "available_tickets", lambda: self.load("tickets"))
+        self.assertEqual(self.loads, ["summary", "tickets", "summary"])
+
+    def test_lru_eviction(self):
+        """Test that the least recently read event is evicted"""
+        self.cache.get("EV-1", "summary", lambda: self.load(1))
+        self.cache.get("EV-2", "summary", lambda: self.load(2))
+        self.cache.get("EV-1", "summary", lambda: self.load(1))
+        self.cache.get("EV-3", "summary", lambda: self.load(3))
+
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.cache.get("EV-2", "summary", lambda: self.load(2))
+        self.assertEqual(self.loads, [1, 2, 3, 2])
@@ -0,0 +1,65 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management import checkin
+
+
+class TestCheckin(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Check-in",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        self.attendee = frappe.get_doc({
+            "doctype": "Attendee",
+            "attendee_name": "Door Guest",
+            "email": "door@example.com",
+            "event": self.event.name
+        }).insert()
+
+    def test_token_generated(self):
+        """Test that every attendee gets a check-in token"""
+        self.assertTrue(self.attendee.checkin_token)
+        self.assertFalse(self.attendee.checked_in)
+
+    def test_batch_checkin_with_duplicates(self):
+        """Test that repeated and unknown scans are reported, not written"""
+        token = self.attendee.checkin_token
+        result = checkin.checkin_scans(self.event.name, [token, token, "not-a-token"])
+
+        self.assertEqual(
+            [row["status"] for row in result["results"]],
+            ["checked_in", "duplicate", "invalid"]
+        )
+        self.assertEqual(frappe.db.get_value("Attendee", self.attendee.name, "checked_in"), 1)
+
+        again = checkin.checkin_scans(self.event.name, [{"token": token}])
+        self.assertEqual(again["duplicates"], 1)
+        self.assertEqual(
+            checkin.validate_checkin_token(self.event.name, token)["status"], "checked_in"
+        )
+
+    def test_unknown_token_is_remembered(self):
+        """Test that a repeated unknown token is answered without a query"""
+        from event_management.event_management.instrumentation import count_queries
+
+        self.assertEqual(checkin.lookup_tokens(self.event.name, ["forged-token"]), {})
+        with count_queries() as counter:
+            self.assertEqual(checkin.lookup_tokens(self.event.name, ["forged-token"]), {})
+        self.assertEqual(counter.count, 0)
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.cache().delete(
+            *checkin._keys(self.event.name), checkin._miss_key(self.event.name, "forged-token")
+        )
+        frappe.db.delete("Attendee", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Check-in"})
@@ -0,0 +1,66 @@
+import frappe
+import unittest
+from unittest.mock import patch
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management import dedupe
+from event_management.event_management.instrumentation import count_queries
+from event_management.event_management.bulk import bulk_import_attendees
+
+
+class TestDuplicateDetection(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Dedupe",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+        frappe.get_doc({
+            "doctype": "Attendee",
+            "attendee_name": "Known Guest",
+            "email": "Known@Example.com",
+            "event": self.event.name
+        }).insert()
+
+    def test_case_and_whitespace_variants(self):
+        """Test that email variants count as the same registration"""
+        duplicate = frappe.get_doc({
+            "doctype": "Attendee",
+            "attendee_name": "Known Guest",
+            "email": "  known@example.COM ",
+            "event": self.event.name
+        })
+        self.assertRaises(frappe.ValidationError, duplicate.insert)
+
+    def test_bulk_duplicates_need_one_lookup(self):
+        """Test that a duplicate-heavy import reads registered emails once"""
+        rows = [{"name": f"Guest {i}", "email": " KNOWN@example.com"} for i in range(50)]
+        with count_queries() as counter:
+            result = bulk_import_attendees(self.event.name, rows)
+
+        self.assertEqual(result["failed"], 50)
+        self.assertEqual(counter.count, 2)
+
+    @patch.object(dedupe, "BLOOM_THRESHOLD", 0)
+    def test_bloom_filter_prefilter(self):
+        """Test that large events confirm only the possible matches"""
+        registered = dedupe.find_registered_emails(
+            self.event.name, ["known@example.com", "new@example.com"], 1
+        )
+        self.assertEqual(registered, {"known@example.com"})
+
+        bloom = dedupe.EmailBloomFilter(self.event.name)
+        self.assertEqual(
+            bloom.might_contain(["known@example.com"]), [True]
+        )
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.cache().delete(dedupe.EmailBloomFilter(self.event.name).key)
+        frappe.db.delete("Attendee", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Dedupe"})
@@ -0,0 +1,95 @@
+import json
+import subprocess
+import sys
+
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+
+# Modules that calls to the everyday endpoints must not load
+LAZY_MODULES = (
+    "event_management.event_management.exports",
+    "event_management.event_management.reports",
+    "event_management.event_management.bulk",
+    "event_management.event_management.box_office",
+    "event_management.event_management.analytics",
+)
+# Self time of the app's own modules when importing the API, in microseconds.
+# Timing depends on the machine, so the budgets are only enforced on sites
+# with `event_management_timing_budgets` set in their config
+IMPORT_BUDGET_US = 150_000
+FIRST_REQUEST_BUDGET_SECONDS = 1.5
+
+FIRST_REQUEST_SCRIPT = """
+import json
+import sys
+import time
+
+import frappe
+
+frappe.init(site=sys.argv[1], sites_path=sys.argv[2])
+frappe.connect()
+frappe.set_user("Administrator")
+started = time.perf_counter()
+frappe.get_attr("event_management.event_management.api.list_events")(page_length=1)
+seconds = time.perf_counter() - started
+print(json.dumps({
+    "seconds": seconds,
+    "modules": sorted(name for name in sys.modules if name.startswith("event_management"))
+}))
+frappe.destroy()
+"""
+
+
+def timing_budgets_enabled():
+    return bool(frappe.conf.get("event_management_timing_budgets"))
+
+
+def import_profile(module):
+    """Import `module` in a fresh interpreter under `-X importtime` and return
+    {module: (self microseconds, cumulative microseconds)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = (
+            part.strip() for part in line[len("import time:"):].split("|")
+        )
+        if self_us.isdigit():
+            profile[name] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+class TestImportTime(FrappeTestCase):
+    def test_api_import_cost(self):
+        """Test that importing the API skips rarely used modules and, if enabled, stays within budget"""
+        profile = import_profile("event_management.event_management.api")
+
+        self.assertEqual([name for name in LAZY_MODULES if name in profile], [])
+        if timing_budgets_enabled():
+            app_self_us = sum(
+                self_us for name, (self_us, _) in profile.items() if name.startswith("event_management")
+            )
+            self.assertLess(app_self_us, IMPORT_BUDGET_US)
+
+    def test_first_request_latency(self):
+        """Test the first list_events call in a freshly started process"""
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_REQUEST_SCRIPT, frappe.local.site, frappe.local.sites_path],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        first_request = json.loads(result.stdout.strip().splitlines()[-1])
+
+        if timing_budgets_enabled():
+            self.assertLess(first_request["seconds"], FIRST_REQUEST_BUDGET_SECONDS)
+        self.assertEqual(
+            [name for name in LAZY_MODULES if name in first_request["modules"]], []
+        )
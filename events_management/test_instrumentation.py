@@ -0,0 +1,27 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from event_management.event_management.instrumentation import count_queries, render_prometheus
+
+
+class TestInstrumentation(FrappeTestCase):
+    def test_nested_counters(self):
+        """Test that an inner counter does not hide queries from the outer one"""
+        with count_queries() as outer:
+            frappe.db.sql("SELECT 1")
+            with count_queries() as inner:
+                frappe.db.sql("SELECT 2")
+            frappe.db.sql("SELECT 3")
+
+        self.assertEqual(inner.count, 1)
+        self.assertEqual(outer.count, 3)
+
+    def test_prometheus_format(self):
+        """Test the Prometheus text rendering of a metrics snapshot"""
+        text = render_prometheus({
+            "api.list_events": {"calls": 3, "seconds": 0.25, "sql_queries": 3, "sql_seconds": 0.1, "rows": 30}
+        })
+        self.assertIn("# TYPE event_management_calls_total counter", text)
+        self.assertIn('event_management_calls_total{name="api.list_events"} 3', text)
+        self.assertIn('event_management_rows_total{name="api.list_events"} 30', text)
+        self.assertTrue(text.endswith("\n"))
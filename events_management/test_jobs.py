@@ -0,0 +1,29 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from event_management.event_management import jobs
+
+
+class TestBackgroundJobs(FrappeTestCase):
+    def test_run_job_through_enqueue(self):
+        """Test that a job enqueued the way enqueue_job does it runs and reports its result"""
+        job = jobs.enqueue_job("ticket_sales_report", event_name="Test Event for Jobs")
+        self.assertEqual(jobs.get_job_status(job["job_id"])["status"], "queued")
+
+        frappe.enqueue(
+            "event_management.event_management.jobs.run_job",
+            now=True,
+            job_id=job["job_id"],
+            tracking_id=job["job_id"],
+            kind="ticket_sales_report",
+            job_kwargs={"event_name": "Test Event for Jobs"}
+        )
+
+        status = jobs.get_job_status(job["job_id"])
+        self.assertEqual(status["status"], "finished")
+        self.assertEqual(status["result"], [])
+
+    def test_unknown_job(self):
+        """Test that unknown job kinds are rejected"""
+        with self.assertRaises(frappe.ValidationError):
+            jobs.enqueue_job("drop_everything")
@@ -0,0 +1,90 @@
+import frappe
+import unittest
+from unittest.mock import patch
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management import reports
+
+
+class TestIncrementalSalesReport(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Incremental Report",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        self.ticket = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "General",
+            "price": 20.00,
+            "quantity": 50
+        })
+        self.ticket.insert(ignore_if_duplicate=True)
+
+    def sell(self, quantity):
+        frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": self.ticket.name,
+            "event": self.event.name,
+            "quantity": quantity
+        }).insert()
+
+    @patch.object(reports, "SETTLE_SECONDS", 0)
+    def test_watermark_returns_only_new_rows(self):
+        """Test that a watermark skips the sales already reported"""
+        self.sell(1)
+        self.sell(2)
+        first = reports.get_ticket_sales_changes(self.event.name)
+        self.assertEqual(first["columns"]["quantity"], [1, 2])
+
+        self.sell(3)
+        second = reports.get_ticket_sales_changes(self.event.name, since=first["watermark"])
+        self.assertEqual(second["columns"]["quantity"], [3])
+        self.assertFalse(second["has_more"])
+
+        third = reports.get_ticket_sales_changes(self.event.name, since=second["watermark"])
+        self.assertEqual(third["columns"], {})
+        self.assertEqual(third["watermark"], second["watermark"])
+
+    @patch.object(reports, "SETTLE_SECONDS", 0)
+    def test_bucketed_totals(self):
+        """Test per-day totals by ticket type"""
+        self.sell(1)
+        self.sell(4)
+        result = reports.get_ticket_sales_changes(self.event.name, bucket="day")
+
+        self.assertEqual(result["columns"]["ticket_type"], ["General"])
+        self.assertEqual(result["columns"]["quantity"], [5])
+        self.assertEqual(result["columns"]["revenue"], [100.0])
+
+    @patch.object(reports, "SETTLE_SECONDS", 0)
+    def test_totals_include_deleted_sales(self):
+        """Test that a deleted sale shows in the totals though no delta replays it"""
+        self.sell(2)
+        sale = frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": self.ticket.name,
+            "event": self.event.name,
+            "quantity": 3
+        }).insert()
+        first = reports.get_ticket_sales_changes(self.event.name, bucket="day")
+        self.assertEqual(first["totals"], {"quantity": 5, "revenue": 100.0})
+
+        frappe.delete_doc("Ticket Sales", sale.name)
+        second = reports.get_ticket_sales_changes(self.event.name, since=first["watermark"], bucket="day")
+        self.assertEqual(second["columns"], {})
+        self.assertEqual(second["totals"], {"quantity": 2, "revenue": 40.0})
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Sales Rollup", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Incremental Report"})
@@ -0,0 +1,51 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management import search
+
+
+class TestEventSearch(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Search Quokka",
+            "description": "<p>An evening of <b>marsupial</b> trivia</p>",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Rottnest Island",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+        # InnoDB only adds committed rows to FULLTEXT indexes
+        frappe.db.commit()
+
+    def test_search_text_strips_html(self):
+        """Test that the indexed text has no markup"""
+        self.assertIn("marsupial trivia", self.event.search_text)
+        self.assertNotIn("<b>", self.event.search_text)
+
+    def test_boolean_query(self):
+        """Test that every word is required and the last one matches as a prefix"""
+        self.assertEqual(search.boolean_query("quokka triv"), "+quokka +triv*")
+        self.assertIsNone(search.boolean_query("a b"))
+
+    def test_ranked_search_with_facets(self):
+        """Test that a description match is found and counted per location"""
+        result = search.search_events("marsupial triv")
+
+        self.assertIn(self.event.name, [event.name for event in result["data"]])
+        self.assertIn(
+            {"location": "Rottnest Island", "count": 1},
+            [dict(facet) for facet in result["facets"]["location"]]
+        )
+
+    def test_autocomplete(self):
+        """Test title prefix suggestions"""
+        suggestions = search.autocomplete_events("Test Event for Search Q")
+        self.assertEqual([event.name for event in suggestions], [self.event.name])
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Search Quokka"})
+        frappe.db.commit()
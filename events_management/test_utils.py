@@ -0,0 +1,64 @@
+import frappe
+import unittest
+from frappe.tests.utils import FrappeTestCase
+from datetime import datetime, timedelta
+from event_management.event_management import utils
+from event_management.event_management.instrumentation import count_queries, find_full_scans
+
+
+class TestQueryPlans(FrappeTestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.event = frappe.get_doc({
+            "doctype": "Event",
+            "event_title": "Test Event for Query Plans",
+            "description": "Test event",
+            "event_date": (datetime.now() + timedelta(days=30)).date(),
+            "location": "Test Location",
+            "capacity": 100
+        })
+        self.event.insert(ignore_if_duplicate=True)
+
+        ticket = frappe.get_doc({
+            "doctype": "Ticket",
+            "event": self.event.name,
+            "ticket_type": "General",
+            "price": 20.00,
+            "quantity": 50
+        })
+        ticket.insert(ignore_if_duplicate=True)
+        frappe.get_doc({
+            "doctype": "Ticket Sales",
+            "ticket": ticket.name,
+            "event": self.event.name,
+            "quantity": 2
+        }).insert()
+        frappe.get_doc({
+            "doctype": "Attendee",
+            "attendee_name": "Plan Guest",
+            "email": "plans@example.com",
+            "event": self.event.name
+        }).insert()
+
+    def test_no_full_table_scans(self):
+        """Test that no utils query scans a whole table"""
+        with count_queries() as counter:
+            utils.get_event_dashboard_data(self.event.name)
+            utils.get_event_attendees(self.event.name)
+            utils.get_event_attendees(self.event.name, page_length=10)
+            utils.export_attendees_csv(self.event.name)
+            utils.get_ticket_sales_report(self.event.name)
+            utils.get_ticket_sales_report(self.event.name, page_length=10)
+            utils.get_available_tickets(self.event.name, page_length=10)
+            utils.get_event_revenue_by_ticket_type.__wrapped__(self.event.name)
+            utils.get_event_summary.__wrapped__(self.event.name)
+
+        full_scans = find_full_scans(counter.statements)
+        self.assertEqual(full_scans, [], msg=frappe.as_json(full_scans))
+
+    def tearDown(self):
+        """Clean up test data"""
+        frappe.db.delete("Attendee", filters={"event": self.event.name})
+        frappe.db.delete("Ticket Sales", filters={"event": self.event.name})
+        frappe.db.delete("Ticket", filters={"event": self.event.name})
+        frappe.db.delete("Event", filters={"event_title": "Test Event for Query Plans"})
@@ -1,24 +1,76 @@
 """
 Utility functions for Event Management System
+
+CSV export, the sales report and bulk import live in `exports`, `reports`
+and `bulk` and are only imported the first time one of them is used; their
+old paths in this module keep working.
 """
 
+import importlib
+
 import frappe
-import csv
-from io import StringIO
-from datetime import datetime
+from frappe.model.naming import parse_naming_series
+from frappe.utils import cint, now
+from event_management.event_management.archive import get_archived_rows, is_archived
+from event_management.event_management.cache import cached_event_read
+from event_management.event_management.instrumentation import profiled
+from event_management.event_management.pagination import (
+    build_page,
+    date_range_filters,
+    decode_cursor,
+    get_page_length,
+    paginate,
+    select_fields
+)
+
+# name -> module it moved to
+LAZY_ATTRIBUTES = {
+    "EXPORT_PAGE_SIZE": "event_management.event_management.exports",
+    "export_attendees_csv": "event_management.event_management.exports",
+    "download_attendees_csv": "event_management.event_management.exports",
+    "enqueue_attendees_export": "event_management.event_management.exports",
+    "write_attendees_export_file": "event_management.event_management.exports",
+    "iter_attendees_csv": "event_management.event_management.exports",
+    "SALES_REPORT_COLUMNS": "event_management.event_management.reports",
+    "get_ticket_sales_report": "event_management.event_management.reports",
+    "build_ticket_sales_report": "event_management.event_management.reports",
+    "BULK_INSERT_CHUNK_SIZE": "event_management.event_management.bulk",
+    "create_bulk_attendees": "event_management.event_management.bulk",
+    "bulk_import_attendees": "event_management.event_management.bulk",
+}
+
+
+def __getattr__(name):
+    return lazy_attribute(__name__, name)
+
+
+def lazy_attribute(module_name, name):
+    """Resolve a name listed in LAZY_ATTRIBUTES by importing its module"""
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(LAZY_ATTRIBUTES[name]), name)
+
+
+ATTENDEE_LIST_FIELDS = ("name", "attendee_name", "email", "phone", "creation")
+TICKET_LIST_FIELDS = ("name", "ticket_type", "price", "quantity", "available_quantity", "creation")
 
 
 @frappe.whitelist()
+@profiled()
+@cached_event_read("summary")
 def get_event_summary(event_name):
     """Get summary of an event including attendee and revenue info"""
     event = frappe.get_doc("Event", event_name)
     
-    attendees = frappe.db.count("Attendee", filters={"event": event_name})
+    if event.is_archived:
+        attendees = event.archived_attendees
+    else:
+        attendees = frappe.db.count("Attendee", filters={"event": event_name})
     
     ticket_sales = frappe.db.sql(
         """
-        SELECT SUM(quantity) as total_quantity, SUM(total_amount) as total_revenue
-        FROM `tabTicket Sales`
+        SELECT SUM(quantity_sold) as total_quantity, SUM(revenue) as total_revenue
+        FROM `tabTicket Sales Rollup`
         WHERE event = %s
         """,
         (event_name,),
@@ -38,107 +90,208 @@ def get_event_summary(event_name):
     }
 
 
+def get_event_dashboard_data(event_name):
+    """Load event header, attendee count, sales totals and revenue by ticket type in one query"""
+    rows = frappe.db.sql(
+        """
+        SELECT
+            e.name,
+            e.event_title,
+            e.description,
+            e.event_date,
+            e.location,
+            e.capacity,
+            e.tickets_sold,
+            e.tickets_available,
+            IF(e.is_archived, e.archived_attendees,
+                (SELECT COUNT(*) FROM `tabAttendee` a WHERE a.event = e.name)) as attendees,
+            t.ticket_type,
+            t.price,
+            s.quantity_sold as type_tickets_sold,
+            s.revenue as type_revenue
+        FROM `tabEvent` e
+        LEFT JOIN `tabTicket Sales Rollup` s ON s.event = e.name
+        LEFT JOIN `tabTicket` t ON t.name = s.ticket
+        WHERE e.name = %(event)s
+        """,
+        {"event": event_name},
+        as_dict=True
+    )
+    if not rows:
+        return None
+
+    header = rows[0]
+    revenue_by_type = {}
+    total_quantity = total_revenue = None
+    for row in rows:
+        if row.type_tickets_sold is None:
+            continue
+        total_quantity = (total_quantity or 0) + row.type_tickets_sold
+        total_revenue = (total_revenue or 0) + row.type_revenue
+        key = (row.ticket_type, row.price)
+        breakdown = revenue_by_type.setdefault(key, frappe._dict(
+            ticket_type=row.ticket_type, price=row.price, tickets_sold=0, revenue=0
+        ))
+        breakdown.tickets_sold += row.type_tickets_sold
+        breakdown.revenue += row.type_revenue
+
+    return {
+        "name": header.name,
+        "event_title": header.event_title,
+        "description": header.description,
+        "event_date": header.event_date,
+        "location": header.location,
+        "capacity": header.capacity,
+        "tickets_sold": header.tickets_sold,
+        "tickets_available": header.tickets_available,
+        "summary": {
+            "event_name": header.event_title,
+            "event_date": header.event_date,
+            "location": header.location,
+            "capacity": header.capacity,
+            "tickets_sold": header.tickets_sold,
+            "tickets_available": header.tickets_available,
+            "attendees": header.attendees,
+            "total_tickets_sold": total_quantity,
+            "total_revenue": total_revenue
+        },
+        "revenue_breakdown": list(revenue_by_type.values())
+    }
+
+
 @frappe.whitelist()
-def get_event_attendees(event_name):
-    """Get list of attendees for an event"""
+@profiled()
+def get_event_attendees(event_name, page_length=None, cursor=None, fields=None, from_date=None, to_date=None):
+    """Get list of attendees for an event
+
+    Pass `page_length` or `cursor` to get one page as
+    {"data": [...], "next_cursor": ...} instead of the full list.
+    """
+    fields = select_fields(fields, ATTENDEE_LIST_FIELDS, default=ATTENDEE_LIST_FIELDS[:4])
+    if is_archived(event_name):
+        return get_archived_attendees(event_name, page_length, cursor, fields, from_date, to_date)
+
+    filters = [["event", "=", event_name]]
+    filters += date_range_filters("creation", from_date, to_date, is_datetime=True)
+
+    if page_length or cursor:
+        return paginate(
+            "Attendee", filters, fields, "creation",
+            descending=True, page_length=page_length, cursor=cursor
+        )
+
     attendees = frappe.get_all(
         "Attendee",
-        filters={"event": event_name},
-        fields=["name", "attendee_name", "email", "phone"],
+        filters=filters,
+        fields=fields,
         order_by="creation desc"
     )
     return attendees
 
 
-@frappe.whitelist()
-def export_attendees_csv(event_name):
-    """Export attendees for an event as CSV"""
-    attendees = get_event_attendees(event_name)
-    
-    output = StringIO()
-    writer = csv.DictWriter(output, fieldnames=["Name", "Email", "Phone"])
-    writer.writeheader()
-    
-    for attendee in attendees:
-        writer.writerow({
-            "Name": attendee.get("attendee_name"),
-            "Email": attendee.get("email"),
-            "Phone": attendee.get("phone")
-        })
-    
-    return output.getvalue()
-
+def get_archived_attendees(event_name, page_length, cursor, fields, from_date=None, to_date=None):
+    """`get_event_attendees` for an archived event, read from the archive table"""
+    if not (page_length or cursor):
+        return get_archived_rows("Attendee", event_name, fields, from_date=from_date, to_date=to_date)
 
-@frappe.whitelist()
-def get_ticket_sales_report(event_name):
-    """Get ticket sales report for an event"""
-    ticket_sales = frappe.db.sql(
-        """
-        SELECT 
-            ts.name as sales_id,
-            t.ticket_type,
-            t.price,
-            ts.quantity,
-            ts.total_amount,
-            ts.creation
-        FROM `tabTicket Sales` ts
-        JOIN `tabTicket` t ON ts.ticket = t.name
-        WHERE ts.event = %s
-        ORDER BY ts.creation DESC
-        """,
-        (event_name,),
-        as_dict=True
+    page_length = get_page_length(page_length)
+    rows = get_archived_rows(
+        "Attendee", event_name, list(dict.fromkeys(list(fields) + ["creation", "name"])),
+        after=decode_cursor(cursor) if cursor else None,
+        limit=page_length + 1,
+        from_date=from_date,
+        to_date=to_date
     )
-    return ticket_sales
+    return build_page(rows, page_length, "creation", fields)
 
 
 @frappe.whitelist()
-def get_available_tickets(event_name):
-    """Get available tickets for an event"""
+@profiled()
+@cached_event_read("available_tickets")
+def get_available_tickets(event_name, page_length=None, cursor=None, fields=None, ticket_type=None):
+    """Get available tickets for an event
+
+    Pass `page_length` or `cursor` to get one page as
+    {"data": [...], "next_cursor": ...} instead of the full list.
+    """
+    fields = select_fields(fields, TICKET_LIST_FIELDS, default=TICKET_LIST_FIELDS[:5])
+    filters = [["event", "=", event_name]]
+    if ticket_type:
+        filters.append(["ticket_type", "=", ticket_type])
+
+    if page_length or cursor:
+        return paginate(
+            "Ticket", filters, fields, "creation",
+            page_length=page_length, cursor=cursor
+        )
+
     tickets = frappe.get_all(
         "Ticket",
-        filters={"event": event_name},
-        fields=["name", "ticket_type", "price", "quantity", "available_quantity"],
+        filters=filters,
+        fields=fields,
         order_by="creation asc"
     )
     return tickets
 
 
-@frappe.whitelist()
-def create_bulk_attendees(event_name, attendees_list):
-    """Create multiple attendees at once"""
-    if isinstance(attendees_list, str):
-        attendees_list = frappe.parse_json(attendees_list)
-    
-    created_attendees = []
-    errors = []
-    
-    for attendee_data in attendees_list:
-        try:
-            attendee = frappe.get_doc({
-                "doctype": "Attendee",
-                "attendee_name": attendee_data.get("name"),
-                "email": attendee_data.get("email"),
-                "phone": attendee_data.get("phone"),
-                "event": event_name
-            })
-            attendee.insert(ignore_permissions=True)
-            created_attendees.append(attendee.name)
-        except frappe.ValidationError as e:
-            errors.append({
-                "name": attendee_data.get("name"),
-                "error": str(e)
-            })
-    
-    return {
-        "created": created_attendees,
-        "errors": errors,
-        "total": len(created_attendees),
-        "failed": len(errors)
-    }
+def get_default_naming_series(doctype):
+    """Return the first naming series option configured for a DocType"""
+    options = frappe.get_meta(doctype).get_field("naming_series").options or ""
+    return options.split("\n")[0]
+
+
+def reserve_names(naming_series, count, digits=5):
+    """Reserve `count` consecutive names from a naming series in one update.
+
+    Mirrors `frappe.model.naming.getseries`, which only advances the series
+    by one per call.
+    """
+    prefix = parse_naming_series(naming_series)
+    current = frappe.db.sql(
+        "SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE",
+        (prefix,)
+    )
+    if current and current[0][0] is not None:
+        start = cint(current[0][0])
+        frappe.db.sql(
+            "UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name` = %s",
+            (count, prefix)
+        )
+    else:
+        start = 0
+        frappe.db.sql(
+            "INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)",
+            (prefix, count)
+        )
+
+    return [f"{prefix}{number:0{digits}d}" for number in range(start + 1, start + count + 1)]
+
+
+def stamp_rows(doctype, names, chunk_size=500):
+    """Set creation and modified of rows written by a long import to now.
+
+    Incremental readers (`reports.get_ticket_sales_changes`, analytics
+    exports) only hold back rows from the last few seconds, so rows stamped
+    when their chunk was written, minutes before the import commits, could
+    land behind a watermark that has already moved past them. Call this
+    last, right before the commit.
+    """
+    timestamp = now()
+    for start in range(0, len(names), chunk_size):
+        chunk = names[start:start + chunk_size]
+        frappe.db.sql(
+            f"""
+            UPDATE `tab{doctype}`
+            SET creation = %s, modified = %s
+            WHERE name IN ({", ".join(["%s"] * len(chunk))})
+            """,
+            [timestamp, timestamp] + chunk
+        )
 
 
 @frappe.whitelist()
+@profiled()
+@cached_event_read("revenue_by_ticket_type")
 def get_event_revenue_by_ticket_type(event_name):
     """Get revenue breakdown by ticket type"""
     revenue = frappe.db.sql(
@@ -146,11 +299,11 @@ def get_event_revenue_by_ticket_type(event_name):
         SELECT 
             t.ticket_type,
             t.price,
-            SUM(ts.quantity) as tickets_sold,
-            SUM(ts.total_amount) as revenue
-        FROM `tabTicket Sales` ts
-        JOIN `tabTicket` t ON ts.ticket = t.name
-        WHERE ts.event = %s
+            SUM(r.quantity_sold) as tickets_sold,
+            SUM(r.revenue) as revenue
+        FROM `tabTicket Sales Rollup` r
+        JOIN `tabTicket` t ON r.ticket = t.name
+        WHERE r.event = %s
         GROUP BY t.ticket_type, t.price
         """,
         (event_name,),
@@ -17,30 +17,75 @@ app_modules = {
 }
 
 # Document Events
+# Controller methods run without being listed here; only shared handlers are wired
 doc_events = {
     "Event": {
-        "validate": "event_management.event_management.doctype.event.event.Event.validate",
-        "on_update": "event_management.event_management.doctype.event.event.Event.on_update",
+        "on_update": [
+            "event_management.event_management.cache.invalidate_for_doc",
+            "event_management.event_management.doc_cache.invalidate_for_doc",
+            "event_management.event_management.admission.clear_for_doc",
+        ],
+        "on_trash": [
+            "event_management.event_management.cache.invalidate_for_doc",
+            "event_management.event_management.doc_cache.invalidate_for_doc",
+        ],
     },
     "Attendee": {
-        "validate": "event_management.event_management.doctype.attendee.attendee.Attendee.validate",
-        "on_insert": "event_management.event_management.doctype.attendee.attendee.Attendee.on_insert",
-        "on_update": "event_management.event_management.doctype.attendee.attendee.Attendee.on_update",
-        "before_delete": "event_management.event_management.doctype.attendee.attendee.Attendee.before_delete",
+        "on_update": [
+            "event_management.event_management.cache.invalidate_for_doc",
+            "event_management.event_management.checkin.update_index_for_doc",
+            "event_management.event_management.dedupe.add_for_doc",
+        ],
+        "on_trash": [
+            "event_management.event_management.cache.invalidate_for_doc",
+            "event_management.event_management.checkin.update_index_for_doc",
+        ],
     },
     "Ticket": {
-        "validate": "event_management.event_management.doctype.ticket.ticket.Ticket.validate",
-        "on_update": "event_management.event_management.doctype.ticket.ticket.Ticket.on_update",
-        "on_submit": "event_management.event_management.doctype.ticket.ticket.Ticket.on_submit",
-        "before_cancel": "event_management.event_management.doctype.ticket.ticket.Ticket.before_cancel",
+        "on_update": [
+            "event_management.event_management.cache.invalidate_for_doc",
+            "event_management.event_management.doc_cache.invalidate_for_doc",
+            "event_management.event_management.admission.clear_for_doc",
+        ],
+        "on_trash": [
+            "event_management.event_management.cache.invalidate_for_doc",
+            "event_management.event_management.doc_cache.invalidate_for_doc",
+        ],
+    },
+    "Ticket Hold": {
+        "after_insert": "event_management.event_management.cache.invalidate_for_doc",
+        "on_trash": "event_management.event_management.cache.invalidate_for_doc",
     },
     "Ticket Sales": {
-        "validate": "event_management.event_management.doctype.ticket_sales.ticket_sales.TicketSales.validate",
-        "on_submit": "event_management.event_management.doctype.ticket_sales.ticket_sales.TicketSales.on_submit",
-        "before_cancel": "event_management.event_management.doctype.ticket_sales.ticket_sales.TicketSales.before_cancel",
+        "on_update": "event_management.event_management.cache.invalidate_for_doc",
+        "on_cancel": "event_management.event_management.cache.invalidate_for_doc",
+        "on_trash": "event_management.event_management.cache.invalidate_for_doc",
     }
 }
 
+# Request Hooks
+before_request = ["event_management.event_management.instrumentation.start_request_query_counter"]
+after_request = ["event_management.event_management.instrumentation.stop_request_query_counter"]
+
+# Keep the archive tables in step with Attendee and Ticket Sales columns
+after_migrate = ["event_management.event_management.archive.ensure_archive_tables"]
+
+# Scheduled Tasks
+scheduler_events = {
+    "daily": [
+        "event_management.event_management.archive.archive_completed_events",
+    ],
+    "hourly": [
+        "event_management.event_management.doctype.event.event.reconcile_ticket_counters",
+        "event_management.event_management.doctype.waitlist_entry.waitlist_entry.promote_all_waitlists",
+    ],
+    "cron": {
+        "* * * * *": [
+            "event_management.event_management.doctype.ticket_hold.ticket_hold.release_expired_holds",
+        ],
+    },
+}
+
 # Desk Sidebar
 sidebar_items = "Event Management"
 